@@ -0,0 +1,68 @@
+"""
+测量命令行入口和常用模块的导入耗时，超出预算时以非零状态退出。
+
+每个模块在新的解释器中导入若干次，取 ``-X importtime`` 报告的累计耗时的中位数
+（不含解释器自身启动）。
+
+用法（在仓库根目录）:
+    PYTHONPATH=. python benchmarks/bench_import.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 模块 -> 导入耗时预算（秒）
+BUDGETS = {
+    "biorange": 0.1,
+    "biorange.cli.main": 0.3,
+    "biorange.workflows.network_pharmacology.strategy": 1.0,
+}
+
+
+def import_time(module: str) -> float:
+    """在新的解释器中导入模块，返回其累计导入耗时（秒）。"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (os.getcwd(), env.get("PYTHONPATH")) if p
+    )
+    with tempfile.TemporaryDirectory() as cwd:  # 顺便避免在仓库中留下文件
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'module':<52}{'median':>10}{'budget':>10}")
+    for module, budget in BUDGETS.items():
+        median = statistics.median(import_time(module) for _ in range(args.repeat))
+        flag = "" if median <= budget else "  OVER"
+        print(f"{module:<52}{median:>9.3f}s{budget:>9.2f}s{flag}")
+        if median > budget:
+            over_budget.append(module)
+
+    if over_budget:
+        sys.exit(f"Import time over budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
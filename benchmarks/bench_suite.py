@@ -0,0 +1,493 @@
+"""
+性能基准套件：在包内数据和合成负载上测量各个热点，结果写成 JSON，并与保存的
+基线比较，出现回退时以非零状态退出。
+
+覆盖的场景:
+    load.*          包内数据表的加载（TCMSP、OMIM、TTD）
+    tcmsp.search_*  TCMSPTargetScraper.search_smiles，1/100/10k 次查询
+    omim/ttd.search OMIM、TTD 的疾病检索
+    cache.*         各缓存后端（memory/file/redis）在真实大小结果上的 get/save
+    analyzer.*      分析器对多个模拟延迟的策略扇出
+    e2e.*           run_analysis 在本地替身服务上的完整运行
+    import.*        命令行入口等模块的导入耗时（bench_import）
+    accumulator.*   靶点结果的列式汇总（bench_accumulator）
+
+每项重复运行若干次，取中位数。与基线相比中位数变慢超过 `--tolerance`（且绝对
+差值超过 `--min-delta`）记为回退。基线与机器相关，更换机器后先用
+``--update-baseline`` 重新生成。Redis 不可用时相应的项记为跳过。
+
+用法（在仓库根目录）:
+    PYTHONPATH=. python benchmarks/bench_suite.py
+    PYTHONPATH=. python benchmarks/bench_suite.py --filter cache. --quick
+    PYTHONPATH=. python benchmarks/bench_suite.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import pandas as pd
+
+import bench_accumulator
+import bench_import
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# 名称 -> (准备函数, 重复次数)。准备函数返回被计时的无参函数，不计入耗时。
+BENCHMARKS: Dict[str, Tuple[Callable[[argparse.Namespace], Callable], int]] = {}
+
+
+class Skip(Exception):
+    """当前环境无法运行该项（例如 Redis 不可用）。"""
+
+
+def benchmark(name: str, repeat: int = 5):
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+
+    return register
+
+
+# --- 数据加载与本地检索 ---
+
+
+@benchmark("load.tcmsp_tables", repeat=3)
+def load_tcmsp(options):
+    from biorange.workflows.network_pharmacology.script import (
+        target_from_smiles_tcmsp,
+    )
+
+    return target_from_smiles_tcmsp.TCMSPTargetScraper
+
+
+@benchmark("load.omim", repeat=3)
+def load_omim(options):
+    from biorange.workflows.network_pharmacology.script.disease_omim import (
+        OmimDiseaseScraper,
+    )
+
+    return OmimDiseaseScraper
+
+
+@benchmark("load.ttd", repeat=3)
+def load_ttd(options):
+    from biorange.workflows.network_pharmacology.script.disease_ttd import (
+        TTDDiseaseScraper,
+    )
+
+    return TTDDiseaseScraper
+
+
+def _search_smiles(queries: int):
+    def setup(options):
+        from biorange.workflows.network_pharmacology.script import (
+            target_from_smiles_tcmsp,
+        )
+
+        if options.quick and queries > 100:
+            raise Skip("--quick")
+        scraper = target_from_smiles_tcmsp.TCMSPTargetScraper()
+        known = scraper.merged_df["smiles"].dropna().unique().tolist()
+        # 约十分之一的查询没有匹配，覆盖未命中分支
+        smiles = [
+            f"UNKNOWN{i}" if i % 10 == 9 else known[i % len(known)]
+            for i in range(queries)
+        ]
+        return lambda: [scraper.search_smiles(s) for s in smiles]
+
+    return setup
+
+
+for _queries, _repeat in ((1, 20), (100, 5), (10_000, 1)):
+    benchmark(f"tcmsp.search_smiles_{_queries}", repeat=_repeat)(
+        _search_smiles(_queries)
+    )
+
+
+@benchmark("omim.search")
+def omim_search(options):
+    from biorange.workflows.network_pharmacology.script.disease_omim import (
+        OmimDiseaseScraper,
+    )
+
+    scraper = OmimDiseaseScraper()
+    return lambda: scraper.search(["Lung cancer", "diabetes", "asthma"])
+
+
+@benchmark("ttd.search")
+def ttd_search(options):
+    from biorange.workflows.network_pharmacology.script.disease_ttd import (
+        TTDDiseaseScraper,
+    )
+
+    scraper = TTDDiseaseScraper()
+    return lambda: scraper.search(["Lung cancer", "diabetes", "asthma"])
+
+
+# --- 缓存后端 ---
+
+
+def _targets_payload(rows: int) -> pd.DataFrame:
+    # 与一个成分的靶点预测结果相当：数百行 (smiles, targets, source)
+    smiles = "C1=CC(=C(C=C1C2=C(C(=O)C3=C(C=C(C=C3O2)O)O)O)O)O"
+    return pd.DataFrame(
+        {
+            "smiles": [smiles] * rows,
+            "targets": [f"GENE{i}" for i in range(rows)],
+            "source": ["chembal"] * rows,
+        }
+    )
+
+
+def _cache_backend(kind: str, directory: str):
+    from biorange.core.cache.cache_manager import (
+        CacheManagerFactory,
+        GeneralCacheManager,
+    )
+
+    cache = CacheManagerFactory.create_cache_manager(kind, cache_dir=directory)
+    if kind == "redis":
+        try:
+            cache.client.ping()
+        except Exception as e:
+            raise Skip(f"redis unavailable: {e}") from e
+    return GeneralCacheManager(cache)
+
+
+def _cache_bench(kind: str, op: str, operations: int = 200, rows: int = 300):
+    def setup(options):
+        directory = tempfile.mkdtemp(prefix=f"bench-{kind}-", dir=options.workdir)
+        cache = _cache_backend(kind, directory)
+        payload = _targets_payload(rows)
+        keys = [f"bench_targets_{i}" for i in range(operations)]
+        if op == "get":
+            for key in keys:
+                cache.save(key, payload)
+            return lambda: [cache.get(key) for key in keys]
+        return lambda: [cache.save(key, payload) for key in keys]
+
+    return setup
+
+
+for _kind in ("memory", "file", "redis"):
+    for _op in ("get", "save"):
+        benchmark(f"cache.{_kind}.{_op}")(_cache_bench(_kind, _op))
+
+
+# --- 分析器扇出与端到端 ---
+
+
+def _stub_strategies(latency: float):
+    from biorange.workflows.network_pharmacology.abstract import (
+        ComponentTargetPredictor,
+    )
+
+    class LatencyStub(ComponentTargetPredictor):
+        def __init__(self, source):
+            super().__init__()
+            self.source = source
+
+        def query(self, name, *args, **kwargs):
+            time.sleep(latency)
+            return pd.DataFrame(
+                {"smiles": [name] * 5, "targets": list("ABCDE"), "source": "stub"}
+            )
+
+    return [LatencyStub(f"stub{i}") for i in range(3)]
+
+
+@benchmark("analyzer.fanout_200x3", repeat=3)
+def analyzer_fanout(options):
+    from biorange.core.cache.cache_manager import (
+        GeneralCacheManager,
+        InMemoryCacheManager,
+    )
+    from biorange.workflows.network_pharmacology.analyzers import (
+        SmilesTargetPredictor,
+    )
+    from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+    from biorange.workflows.network_pharmacology.store import (
+        configure_intermediate_store,
+    )
+
+    strategies = _stub_strategies(latency=0.005)
+    scheduler = TaskScheduler(max_workers=16)
+
+    def run():
+        # 每次使用新的缓存和存储，测量的是实际扇出而不是缓存命中
+        configure_intermediate_store(tempfile.mkdtemp(dir=options.workdir))
+        predictor = SmilesTargetPredictor(
+            strategies, GeneralCacheManager(InMemoryCacheManager()), scheduler
+        )
+        frame = pd.DataFrame({"smiles": [f"C{i}" for i in range(200)]})
+        predictor.execute(frame)
+
+    return run
+
+
+@benchmark("e2e.run_analysis_standin", repeat=3)
+def e2e_run_analysis(options):
+    from biorange.cli import dependence
+    from biorange.cli.container import Container
+    from biorange.core.cache.cache_manager import (
+        GeneralCacheManager,
+        InMemoryCacheManager,
+    )
+    from biorange.core.config.config_model import (
+        HostLimitSettings,
+        Settings,
+        SourceSettings,
+    )
+    from biorange.core.network import get_source_url
+    from biorange.core.network.standin import StandInServer
+    from biorange.workflows.network_pharmacology.registry import create_strategy
+    from biorange.workflows.network_pharmacology.script import (
+        component_tcmsp_local,
+        target_from_smiles_chembal,
+    )
+    from biorange.workflows.network_pharmacology.strategy import (
+        TCMSPDrugComponentFinder,
+    )
+
+    class StandInHerbScraper(component_tcmsp_local.TCMSPComponentLocalScraper):
+        # 替身服务直接提供药材页面，不需要浏览器查找搜索结果地址
+        def get_search_result_url(self, search_term):
+            return f"{get_source_url('tcmsp')}/tcmspsearch.php?qr={search_term}"
+
+    class StandInComponents(TCMSPDrugComponentFinder):
+        uses_browser = False
+
+        def query(self, name, *args, **kwargs):
+            return StandInHerbScraper().search_herb(name)
+
+    target_from_smiles_chembal.POLLING_INTERVAL = 0
+    server = StandInServer(latency=0.002, job_polls=1).start()
+    workdir = Path(tempfile.mkdtemp(prefix="bench-e2e-", dir=options.workdir))
+
+    def run():
+        settings = Settings(
+            drug_name=["大枣", "人参"],
+            disease_name="Lung cancer",
+            results_dir=str(workdir / "results"),
+        )
+        settings.network.sources = SourceSettings(**server.source_urls())
+        # 替身服务不需要限流保护，测量的是流程本身的开销
+        settings.network.hosts[urlparse(server.url).netloc] = HostLimitSettings(
+            rate=10_000, burst=10_000, initial_concurrency=16, max_concurrency=16
+        )
+        settings.network.http_cache = False
+        settings.pipeline.store_dir = tempfile.mkdtemp(dir=workdir)
+        settings.pipeline.telemetry.trace = False
+        container = Container(settings)
+        container.cache_manager = GeneralCacheManager(InMemoryCacheManager())
+        strategies = {
+            "components": lambda: [StandInComponents()],
+            "targets": lambda: [
+                create_strategy(name) for name in ("chembl", "stitch", "tcmsp_local")
+            ],
+            "disease_targets": lambda: [
+                create_strategy(name) for name in ("omim", "ttd")
+            ],
+        }
+        container.strategies = lambda step: strategies[step]()
+        with contextlib.redirect_stdout(io.StringIO()):  # 运行摘要不混入结果表
+            dependence.run_analysis(
+                SimpleNamespace(settings=settings), container=container
+            )
+
+    return run
+
+
+# --- 已有的独立基准 ---
+
+
+def _import_bench(module: str):
+    def setup(options):
+        return lambda: bench_import.import_time(module)
+
+    return setup
+
+
+for _module in bench_import.BUDGETS:
+    benchmark(f"import.{_module}", repeat=3)(_import_bench(_module))
+
+
+@benchmark("accumulator.targets_3000x3", repeat=3)
+def accumulator_targets(options):
+    chunks = list(
+        bench_accumulator.make_chunks(
+            components=3000, sources=3, targets_per_call=10, seed=0
+        )
+    )
+    return lambda: bench_accumulator.accumulator_path(chunks)
+
+
+# --- 运行与比较 ---
+
+
+def run_benchmark(
+    name: str, options: argparse.Namespace, stream=sys.stdout
+) -> Dict[str, Any]:
+    """运行一项基准，返回中位数/最小耗时（秒），或跳过原因。"""
+    setup, repeat = BENCHMARKS[name]
+    if options.quick:
+        repeat = max(1, repeat // 3)
+    try:
+        fn = setup(options)
+    except Skip as e:
+        return {"skipped": str(e)}
+    timings = []
+    for _ in range(repeat):
+        if name.startswith("import."):
+            # 子进程中测得的导入耗时，不含解释器启动
+            timings.append(fn())
+            continue
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "runs": len(timings),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    min_delta: float,
+) -> List[Dict[str, Any]]:
+    """与基线比较，返回回退的项（中位数变慢超过比例和绝对阈值）。"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference or "median" not in reference or "median" not in result:
+            continue
+        delta = result["median"] - reference["median"]
+        ratio = result["median"] / reference["median"] if reference["median"] else 0
+        if delta > min_delta and ratio > 1 + tolerance:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline": reference["median"],
+                    "median": result["median"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def _print_result(
+    name: str, result: Dict[str, Any], reference: Optional[float]
+) -> None:
+    if "skipped" in result:
+        print(f"{name:<56}  skipped: {result['skipped']}")
+        return
+    ratio = f"{result['median'] / reference:7.2f}x" if reference else ""
+    reference_text = f"{reference:10.4f}s" if reference else ""
+    median = result["median"]
+    print(f"{name:<56}{median:10.4f}s{reference_text:>11}{ratio:>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--filter", action="append", default=[], help="名称前缀")
+    parser.add_argument("--output", default="results/benchmarks.json")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.005)
+    parser.add_argument("--quick", action="store_true", help="少重复，跳过 10k 规模")
+    parser.add_argument("--list", action="store_true")
+    options = parser.parse_args(argv)
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not options.filter or any(name.startswith(f) for f in options.filter)
+    ]
+    if options.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = load_baseline(Path(options.baseline))
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'benchmark':<56}{'median':>11}{'baseline':>11}{'ratio':>8}")
+    # 逐项日志本身有开销，也会淹没结果表
+    logging.disable(logging.WARNING)
+    try:
+        # 各项的缓存文件、中间结果存储等都放在临时目录中，结束后删除
+        with tempfile.TemporaryDirectory(prefix="biorange-bench-") as workdir:
+            options.workdir = workdir
+            for name in names:
+                result = results[name] = run_benchmark(name, options)
+                _print_result(name, result, baseline.get(name, {}).get("median"))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    output = Path(options.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {"environment": environment(), "results": results}
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {output}")
+
+    if options.update_baseline:
+        merged = {**baseline, **{n: r for n, r in results.items() if "median" in r}}
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": environment(), "results": merged}, f, indent=2
+            )
+            f.write("\n")
+        print(f"Baseline updated: {options.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, options.tolerance, options.min_delta)
+    if regressions:
+        print("\nPERFORMANCE REGRESSIONS:", file=sys.stderr)
+        for regression in regressions:
+            print(
+                f"  {regression['name']}: {regression['median']:.4f}s vs "
+                f"{regression['baseline']:.4f}s ({regression['ratio']:.2f}x)",
+                file=sys.stderr,
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
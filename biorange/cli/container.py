@@ -0,0 +1,89 @@
+"""
+netparam 流程的依赖容器。
+
+缓存、策略和分析器都按 `Settings` 在首次访问时创建：与流程无关的命令（如
+``biorange run``、``--help``）不会连接 Redis 或加载任何数据源，流程只为配置中
+实际使用的策略付出初始化代价。
+
+测试或嵌入使用时，可以在首次访问前直接给属性赋值以替换某个依赖::
+
+    container = Container(settings)
+    container.cache_manager = GeneralCacheManager(InMemoryCacheManager())
+
+类:
+    Container: 按配置延迟创建依赖的容器。
+"""
+
+from functools import cached_property
+from typing import List, Tuple
+
+from biorange.core.cache.cache_manager import (
+    CacheManager,
+    CacheManagerFactory,
+    GeneralCacheManager,
+)
+from biorange.core.config.config_model import Settings
+from biorange.workflows.network_pharmacology.abstract import BaseDataFetcher
+from biorange.workflows.network_pharmacology.analyzers import (
+    ComponentFinder,
+    DiseaseTargetFinder,
+    SmilesTargetPredictor,
+    StrategyAnalyzer,
+)
+from biorange.workflows.network_pharmacology.registry import create_strategy
+
+
+class Container:
+    """按配置延迟创建依赖的容器。
+
+    Attributes:
+        settings (Settings): 配置。
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    @cached_property
+    def cache_manager(self) -> CacheManager:
+        cache = self.settings.pipeline.cache
+        return GeneralCacheManager(
+            CacheManagerFactory.create_cache_manager(
+                cache.cache_type,
+                cache_dir=cache.cache_dir,
+                redis_config={
+                    "host": cache.redis_host,
+                    "port": cache.redis_port,
+                    "db": cache.redis_db,
+                },
+            )
+        )
+
+    def strategies(self, step: str) -> List[BaseDataFetcher]:
+        """创建某个分析步骤配置的所有策略。"""
+        return [
+            create_strategy(name)
+            for name in self.settings.pipeline.strategies.get(step, [])
+        ]
+
+    @cached_property
+    def component_finder(self) -> ComponentFinder:
+        return ComponentFinder(self.strategies("components"), self.cache_manager)
+
+    @cached_property
+    def target_predictor(self) -> SmilesTargetPredictor:
+        return SmilesTargetPredictor(self.strategies("targets"), self.cache_manager)
+
+    @cached_property
+    def disease_target_finder(self) -> DiseaseTargetFinder:
+        return DiseaseTargetFinder(
+            self.strategies("disease_targets"), self.cache_manager
+        )
+
+    @property
+    def analyzers(self) -> Tuple[StrategyAnalyzer, ...]:
+        """流程的三个分析器（访问即创建）。"""
+        return (
+            self.component_finder,
+            self.target_predictor,
+            self.disease_target_finder,
+        )
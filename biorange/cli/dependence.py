@@ -1,50 +1,184 @@
-"""尝试分析流，记得使用依赖注入，考虑celery等"""
+"""netparam 与 batch 命令的流程编排，依赖由 `Container` 按配置延迟创建。"""
 
+import os
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+import pandas as pd
 import yaml
 
-from biorange.core.cache.cache_manager import CacheManagerFactory, GeneralCacheManager
-from biorange.workflows.network_pharmacology.analyzers import (
-    ComponentFinder,
-    DiseaseTargetFinder,
-    SmilesTargetPredictor,
+from biorange.cli.container import Container
+from biorange.core.config.config_model import BatchManifest, TelemetrySettings
+from biorange.core.network import configure_network, get_circuit_breaker_registry
+from biorange.core.telemetry import get_metrics_registry, get_tracer, serve_metrics
+from biorange.core.telemetry.manifest import build_manifest, write_manifest
+from biorange.workflows.executor import TaskExecutor
+from biorange.workflows.network_pharmacology.batch import BatchRunner
+from biorange.workflows.network_pharmacology.dag import PipelineGraph
+from biorange.workflows.network_pharmacology.deadlines import (
+    DeadlinePolicy,
+    LatencyRecorder,
 )
-from biorange.workflows.network_pharmacology.strategy import (
-    CheMBLTargetPredictor,
-    GenecardsTargetPredictor,
-    OMIMTargetPredictor,
-    STITCHTargetPredictor,
-    TCMSPDrugComponentFinder,
-    TCMSPTargetPredictor,
-    TTDTargetPredictor,
+from biorange.workflows.network_pharmacology.journal import RunJournal
+from biorange.workflows.network_pharmacology.progress import (
+    ProgressDisplay,
+    StepProgress,
 )
-
-cache_manager = GeneralCacheManager(CacheManagerFactory.create_cache_manager("redis"))
-
-component_finder = ComponentFinder([TCMSPDrugComponentFinder()], cache_manager)
-target_predictor = SmilesTargetPredictor(
-    [CheMBLTargetPredictor(), STITCHTargetPredictor(), TCMSPTargetPredictor()],
-    cache_manager,
+from biorange.workflows.network_pharmacology.scheduler import configure_scheduler
+from biorange.workflows.network_pharmacology.store import (
+    configure_intermediate_store,
 )
-disease_target_finder = DiseaseTargetFinder(
-    [GenecardsTargetPredictor(), OMIMTargetPredictor(), TTDTargetPredictor()],
-    cache_manager,
+from biorange.workflows.network_pharmacology.writers import (
+    IncrementalCsvWriter,
+    deduplicate_csv,
 )
 
 
-def run_analysis(config_manager):
+def configure_worker(network_settings, store_dir: str) -> None:
+    """
+    进程池 worker 的初始化函数：使用与主进程相同的数据源地址、响应缓存、限流、
+    熔断设置和中间结果存储。限流器和熔断器仍是每个进程各自一份。
+    """
+    configure_network(network_settings)
+    configure_intermediate_store(store_dir)
+
+
+def configure_pipeline(container: Container) -> Optional[TaskExecutor]:
+    """
+    按配置设置网络限流、中间结果存储、共享调度器和各分析器的截止时间。
+
+    Args:
+        container (Container): 依赖容器，其中的分析器在这里创建。
+
+    Returns:
+        Optional[TaskExecutor]: 使用 Celery 时返回分析器共用的执行器，用完后需要
+        调用 `shutdown`；否则为 None，分析器使用本地共享调度器。
+    """
+    settings = container.settings
+    # 所有远程策略共享按主机的限流配置
+    configure_network(settings.network)
+    # 三个分析器共享同一个有界调度器
+    pipeline = settings.pipeline
+    source_limits = dict(pipeline.source_concurrency)
+    analyzers = container.analyzers
+    # 每个使用浏览器的查询占用一个浏览器实例，并发数受浏览器池约束
+    for analyzer in analyzers:
+        for strategy in analyzer.strategies:
+            if strategy.uses_browser:
+                source = strategy.source_name
+                source_limits[source] = min(
+                    source_limits.get(source, pipeline.browser_pool_size),
+                    pipeline.browser_pool_size,
+                )
+    # 默认放在结果目录下，与 results_dir 一起移动
+    store_dir = os.path.abspath(
+        pipeline.store_dir or Path(settings.results_dir) / ".store"
+    )
+    configure_intermediate_store(store_dir)
+    configure_scheduler(
+        pipeline.max_workers,
+        source_limits,
+        process_workers=pipeline.process_workers,
+        chunk_size=pipeline.cpu_chunk_size,
+        initializer=configure_worker,
+        initargs=(settings.network, store_dir),
+    )
+    # 使用 Celery 时，各分析器的任务分发到 worker，结果通过共享缓存取回
+    executor = None
+    if pipeline.executor == "celery":
+        from biorange.workflows.celery_task_executor import CeleryTaskExecutor
+
+        executor = CeleryTaskExecutor(
+            cache_manager=container.cache_manager,
+            broker_url=pipeline.celery.broker_url,
+            result_backend=pipeline.celery.result_backend,
+            eager=pipeline.celery.eager,
+            queues=pipeline.celery.queues,
+        )
+
+    # 按数据源的软/硬截止时间
+    deadlines = {
+        source: DeadlinePolicy(**deadline.model_dump())
+        for source, deadline in pipeline.deadlines.items()
+    }
+    for analyzer in analyzers:
+        analyzer.scheduler = executor
+        analyzer.deadlines = deadlines
+        analyzer.clear_missing()
+        analyzer.latency = LatencyRecorder()
+        analyzer.progress = StepProgress()
+    return executor
+
+
+class Telemetry:
+    """一次运行的指标与区间记录：开始时清空，结束时写入结果目录。"""
+
+    def __init__(self, settings: TelemetrySettings):
+        self.settings = settings
+        self._server = None
+        self._start = 0.0
+
+    def __enter__(self) -> "Telemetry":
+        get_tracer().configure(self.settings.trace, self.settings.max_trace_events)
+        get_metrics_registry().reset()
+        self._start = time.perf_counter()
+        if self.settings.metrics_port is not None:
+            self._server = serve_metrics(self.settings.metrics_port)
+            print(f"Serving metrics on :{self._server.server_port}/metrics")
+        return self
+
+    def export(self, results_dir: Path) -> None:
+        """把指标、性能清单和区间写入结果目录（运行失败时也写出，便于定位）。"""
+        results_dir.mkdir(parents=True, exist_ok=True)
+        get_metrics_registry().write_prometheus(
+            str(results_dir / self.settings.metrics_file)
+        )
+        manifest = build_manifest(
+            breakers=get_circuit_breaker_registry().summary(),
+            elapsed=time.perf_counter() - self._start,
+        )
+        write_manifest(results_dir / self.settings.manifest_file, manifest)
+        if self.settings.trace:
+            trace_path = results_dir / self.settings.trace_file
+            get_tracer().write_chrome_trace(str(trace_path))
+
+    def __exit__(self, *exc_info) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def run_analysis(
+    config_manager, resume: bool = False, container: Optional[Container] = None
+):
     """
     运行分析过程，包括查找成分、预测靶点和查找疾病靶点。
 
     Args:
         config_manager (ConfigManager): 配置管理器对象，包含所有配置和参数。
+        resume (bool): 是否根据结果目录中的运行日志续跑，跳过已完成的项。
+        container (Optional[Container]): 依赖容器，默认按配置新建。
     """
+    results_dir = Path(config_manager.settings.results_dir)
+    container = container or Container(config_manager.settings)
+    with Telemetry(config_manager.settings.pipeline.telemetry) as telemetry:
+        try:
+            _run_analysis(config_manager, resume, container, results_dir)
+        finally:
+            telemetry.export(results_dir)
+
+
+def _run_analysis(
+    config_manager, resume: bool, container: Container, results_dir: Path
+):
     # 从配置中获取参数
     drug_name: List[str] = config_manager.settings.drug_name
     disease_name: str = config_manager.settings.disease_name
-    results_dir: Path = Path(config_manager.settings.results_dir)
+    executor = configure_pipeline(container)
+    analyzers = container.analyzers
+    component_finder, target_predictor, disease_target_finder = analyzers
 
     # 确保结果目录存在
     results_dir.mkdir(parents=True, exist_ok=True)
@@ -58,16 +192,149 @@ def run_analysis(config_manager):
     with open(results_dir / "config.yaml", "wt", encoding="utf-8") as config_file:
         yaml.dump(config_data, config_file, allow_unicode=True)
 
-    # Step 1: Find Components
-    components = component_finder.execute(drug_name)
-    components.to_csv(results_dir / "components_.csv", index=False)
+    max_in_flight = config_manager.settings.pipeline.max_in_flight
+    journal = RunJournal(results_dir, resume=resume, params=config_data)
+    components_path = results_dir / "components_.csv"
+    targets_path = results_dir / "targets_.csv"
+    disease_path = results_dir / "disease_targets_.csv"
+
+    # 续跑时，已完成药物的成分直接从上次的结果中取出 SMILES
+    previous_smiles = []
+    if resume and journal.completed("components") and components_path.exists():
+        previous = pd.read_csv(components_path, usecols=["smiles"])
+        previous_smiles = list(previous["smiles"])
+
+    components_writer = IncrementalCsvWriter(components_path, append=resume)
+    targets_writer = IncrementalCsvWriter(targets_path, append=resume)
+    disease_writer = IncrementalCsvWriter(disease_path, append=resume)
+
+    def checkpoint(step, writer, analyzer):
+        # 先落盘再记入日志，日志中的项一定已经写出；只有所有数据源都给出
+        # 结果的项才记为完成，超过硬截止、熔断或查询失败的项续跑时重新查询
+        def on_output(chunk):
+            item, data = chunk
+            writer.write(data)
+            if not analyzer.has_missing(item):
+                journal.record(step, item, len(data))
+
+        return on_output
+
+    def component_smiles(component_chunks):
+        # 每味药的成分一完成，其中的 SMILES 就进入靶点预测
+        yield from previous_smiles
+        for _, components in component_chunks:
+            if "smiles" in components:
+                yield from components["smiles"]
+
+    # 疾病靶点与成分、靶点两步互不依赖，并发运行；靶点预测按成分流水线推进
+    graph = PipelineGraph(channel_size=max_in_flight)
+    graph.add_node(
+        "components",
+        lambda: component_finder.execute_stream(
+            journal.pending("components", drug_name), max_in_flight, ordered=True
+        ),
+        on_output=checkpoint("components", components_writer, component_finder),
+    )
+    graph.add_node(
+        "targets",
+        lambda chunks: target_predictor.execute_stream(
+            journal.pending("targets", component_smiles(chunks)), max_in_flight
+        ),
+        inputs=["components"],
+        on_output=checkpoint("targets", targets_writer, target_predictor),
+    )
+    graph.add_node(
+        "disease_targets",
+        lambda: disease_target_finder.execute_stream(
+            journal.pending("disease_targets", [disease_name])
+        ),
+        on_output=checkpoint(
+            "disease_targets", disease_writer, disease_target_finder
+        ),
+    )
+    progress = ProgressDisplay(
+        analyzers, enabled=config_manager.settings.pipeline.progress
+    )
+    try:
+        with progress:
+            nodes = graph.run()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    for node in nodes.values():
+        print(f"Step {node.name}: {node.items} items in {node.elapsed:.1f}s")
+    for analyzer in analyzers:
+        latency = analyzer.latency.summary()
+        if latency["count"]:
+            print(
+                f"Latency {analyzer.cache_prefix}: p50={latency['p50']:.1f}s, "
+                f"p99={latency['p99']:.1f}s"
+            )
 
-    # Step 2: Predict Targets
-    targets = target_predictor.execute(components)
-    targets.to_csv(results_dir / "targets_.csv", index=False)
+    # 缺失的结果及原因：超过硬截止、数据源熔断或查询失败
+    # 未完成的项都会在续跑时重新查询，上次运行留下的记录以本次为准
+    missing = [m for analyzer in analyzers for m in analyzer.missing]
+    missing_path = results_dir / "missing.csv"
+    if missing:
+        pd.DataFrame([vars(m) for m in missing]).to_csv(missing_path, index=False)
+        print(f"{len(missing)} results missing, see {missing_path}")
+    else:
+        missing_path.unlink(missing_ok=True)
 
-    # Step 3: Find Disease Targets
-    disease_targets = disease_target_finder.execute(disease_name)
-    disease_targets.to_csv(results_dir / "disease_targets_.csv", index=False)
+    if resume:
+        print(journal.report())
+        for path in (components_path, targets_path, disease_path):
+            deduplicate_csv(path)
+
+    # 运行摘要：数据源熔断情况
+    for breaker in get_circuit_breaker_registry().summary():
+        if breaker["trips"] or breaker["rejected"]:
+            print(
+                f"Source {breaker['source']}: state={breaker['state']}, "
+                f"trips={breaker['trips']}, skipped={breaker['rejected']}"
+            )
 
     print("Analysis completed successfully.")
+
+
+def run_batch(
+    config_manager, manifest_path: str, container: Optional[Container] = None
+):
+    """
+    批量运行清单中的多个项目，跨项目去重后每个唯一实体只查询一次。
+
+    共享的流程配置（并发、截止时间、执行器等）来自 `config_manager`，
+    每个项目的药物、疾病和结果目录来自清单。
+
+    Args:
+        config_manager (ConfigManager): 配置管理器对象。
+        manifest_path (str): 批量运行清单（YAML）路径。
+        container (Optional[Container]): 依赖容器，默认按配置新建。
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = BatchManifest(**(yaml.safe_load(f) or {}))
+
+    settings = config_manager.settings
+    container = container or Container(settings)
+    with Telemetry(settings.pipeline.telemetry) as telemetry:
+        executor = configure_pipeline(container)
+        runner = BatchRunner(
+            *container.analyzers, max_in_flight=settings.pipeline.max_in_flight
+        )
+        progress = ProgressDisplay(
+            container.analyzers, enabled=settings.pipeline.progress
+        )
+        try:
+            with progress:
+                nodes = runner.run(manifest.projects)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            telemetry.export(Path(settings.results_dir))
+
+    for node in nodes.values():
+        print(
+            f"Step {node.name}: {runner.unique_counts[node.name]} unique of "
+            f"{runner.requested[node.name]} requested in {node.elapsed:.1f}s"
+        )
+    print(f"Batch completed: {len(manifest.projects)} projects.")
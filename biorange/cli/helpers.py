@@ -1,10 +1,9 @@
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
-import pandas as pd
 import typer
 
-from biorange.core.config.config_loader import ConfigLoader
-from biorange.core.config.config_manager import ConfigManager
+if TYPE_CHECKING:
+    from biorange.core.config.config_manager import ConfigManager
 
 
 def common_read(file_path):
@@ -23,6 +22,8 @@ def common_read(file_path):
     Raises:
         IOError: 如果文件无法读取或格式不支持。
     """
+    import pandas as pd
+
     try:
         # 尝试读取Excel文件
         data = pd.read_excel(file_path, header=None)
@@ -39,7 +40,7 @@ def common_read(file_path):
 
 def process_parameters(
     ctx: typer.Context, env: Optional[str], config: Optional[str]
-) -> ConfigManager:
+) -> "ConfigManager":
     """
     处理命令行参数并返回配置管理器。
 
@@ -69,6 +70,12 @@ def process_parameters(
             typer.echo(f"Invalid argument format: {arg}")
             raise typer.Exit(code=1)
 
+    from biorange.core.config.config_loader import ConfigLoader
+    from biorange.core.config.config_manager import ConfigManager
+    from biorange.core.utils.package_fileload import copy_config_if_not_exists
+
+    # 当前目录没有 config.yaml 时，复制一份默认配置
+    copy_config_if_not_exists()
     config_loader = ConfigLoader(env_file=env, config_file=config)
     config_manager = ConfigManager(cli_args=cli_args, config_loader=config_loader)
 
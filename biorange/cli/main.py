@@ -1,15 +1,16 @@
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 
 from biorange import __version__
-from biorange.core.config.config_manager import (
-    ConfigManager,
-)  # TODO 记得使用依赖注入代替实例化，解耦
 
 from .command import analyze, prepare
 from .helpers import process_parameters  # 导入参数处理函数
 
+if TYPE_CHECKING:
+    from biorange.core.config.config_manager import ConfigManager
+
 # 初始化 Typer 应用，设置无参数时自动显示帮助信息
 app = typer.Typer(
     add_completion=True,  # add_completion=True 表示启用自动补全
@@ -24,6 +25,7 @@ app.add_typer(analyze.app, name="analyze")
 # 回调函数，用于处理全局选项和显示帮助信息
 @app.callback(invoke_without_command=True, help="BioRange 命令行工具 made in china")
 def callback(
+    ctx: typer.Context,
     version: Optional[bool] = typer.Option(
         None, "--version", "-v", help="显示版本号并退出"
     ),
@@ -31,6 +33,16 @@ def callback(
     if version:
         typer.echo(f"BioRange version: {__version__}")
         raise typer.Exit()
+    # profile 会再次调用本应用运行子命令，横幅由内层调用打印
+    if ctx.invoked_subcommand not in (None, "profile") and not ctx.resilient_parsing:
+        print_banner()
+
+
+def print_banner():
+    """打印斜体的 "BioRange" ASCII 艺术字。"""
+    from pyfiglet import figlet_format
+
+    typer.echo(figlet_format("BioRange", font="slant"))
 
 
 @app.command(
@@ -45,22 +57,185 @@ def run(
     progress(config_manager)
 
 
-from biorange.cli.dependence import run_analysis
+@app.command(
+    context_settings={"allow_extra_args": True, "ignore_unknown_options": True}
+)
+def netparam(
+    ctx: typer.Context,
+    env: Optional[str] = typer.Option(None, help="环境配置文件路径"),
+    config: Optional[str] = typer.Option(None, help="配置文件路径"),
+    resume: bool = typer.Option(
+        False, "--resume", help="根据结果目录中的运行日志续跑，跳过已完成的项"
+    ),
+):
+    from biorange.cli.dependence import run_analysis
+
+    config_manager = process_parameters(ctx, env, config)
+    run_analysis(config_manager, resume=resume)
 
 
 @app.command(
     context_settings={"allow_extra_args": True, "ignore_unknown_options": True}
 )
-def netparam(
+def batch(
     ctx: typer.Context,
+    manifest: str = typer.Argument(..., help="批量运行清单（YAML）路径"),
     env: Optional[str] = typer.Option(None, help="环境配置文件路径"),
     config: Optional[str] = typer.Option(None, help="配置文件路径"),
 ):
+    """批量运行多个项目，跨项目去重后每个药物、成分和疾病只查询一次。"""
+    from biorange.cli.dependence import run_batch
+
     config_manager = process_parameters(ctx, env, config)
-    run_analysis(config_manager)
+    run_batch(config_manager, manifest)
 
 
-def progress(config_manager: ConfigManager):
+@app.command(
+    context_settings={
+        "allow_extra_args": True,
+        "ignore_unknown_options": True,
+        "allow_interspersed_args": False,
+    }
+)
+def profile(
+    ctx: typer.Context,
+    output: Optional[str] = typer.Option(
+        None, help="报告目录，默认为被分析命令的 results_dir 下的 profile 目录"
+    ),
+    interval: float = typer.Option(0.005, help="采样间隔（秒）"),
+    top: int = typer.Option(25, help="内存报告中的分配位置数"),
+    frames: int = typer.Option(10, help="tracemalloc 记录的调用栈深度"),
+):
+    """在采样分析器和 tracemalloc 下运行任意子命令，例如
+    ``biorange profile netparam --drug_name 人参``。
+
+    报告目录中写出火焰图可用的折叠调用栈（profile.collapsed）、内存分配
+    报告（allocations.txt）和按步骤/数据源的耗时汇总（stages.json）。
+    """
+    from biorange.core.telemetry.profiling import profile_call
+
+    args = list(ctx.args)
+    if not args:
+        typer.echo("Usage: biorange profile [OPTIONS] COMMAND [ARGS]...")
+        raise typer.Exit(code=1)
+    if output is None:
+        output = str(Path(_option_value(args, "results_dir") or "results") / "profile")
+
+    exit_codes = []
+
+    def invoke():
+        # standalone_mode=False：子命令的异常和退出码交给这里处理
+        exit_codes.append(app(args=args, prog_name="biorange", standalone_mode=False))
+
+    summary = profile_call(
+        invoke, Path(output), interval=interval, top=top, frames=frames
+    )
+    typer.echo(
+        f"Profiled {' '.join(args)}: {summary['elapsed']:.1f}s, "
+        f"{summary['samples']} samples, "
+        f"peak memory {summary['peak_memory'] / 2**20:.1f} MiB"
+    )
+    for stage in summary["stages"][:10]:
+        typer.echo(
+            f"  {stage['cat']:<20}{stage['name']:<20}{stage['count']:>8}"
+            f"{stage['total']:>10.2f}s{stage['max']:>10.2f}s"
+        )
+    for name, path in summary["paths"].items():
+        typer.echo(f"{name}: {path}")
+    if exit_codes and isinstance(exit_codes[0], int) and exit_codes[0]:
+        raise typer.Exit(code=exit_codes[0])
+
+
+def _option_value(args: List[str], name: str) -> Optional[str]:
+    """从透传给子命令的参数中取出 ``--name value`` 的值。"""
+    for flag, value in zip(args, args[1:]):
+        if flag == f"--{name}":
+            return value
+    return None
+
+
+@app.command("compare-runs")
+def compare_runs(
+    before: str = typer.Argument(..., help="基准运行的结果目录或性能清单路径"),
+    after: str = typer.Argument(..., help="对比运行的结果目录或性能清单路径"),
+    limit: int = typer.Option(20, help="每一部分最多显示的行数，0 表示不限制"),
+    show_all: bool = typer.Option(False, "--all", help="同时显示没有变化的项"),
+):
+    """对比两次运行的性能清单（performance.json），耗时按变化量从大到小列出。"""
+    from biorange.core.telemetry.manifest import compare_manifests, load_manifest
+
+    try:
+        manifests = [load_manifest(before), load_manifest(after)]
+    except (OSError, ValueError) as e:
+        typer.echo(f"Cannot read performance manifest: {e}")
+        raise typer.Exit(code=1)
+    rows = compare_manifests(*manifests)
+    if not show_all:
+        rows = [row for row in rows if row["delta"]]
+    sections = (("time", "Time (s)"), ("count", "Counts"), ("bytes", "Memory (MiB)"))
+    for kind, title in sections:
+        section = [row for row in rows if row["kind"] == kind]
+        if not section:
+            continue
+        typer.echo(
+            f"{title:<56}{'before':>11}{'after':>11}{'delta':>11}{'ratio':>8}"
+        )
+        for row in section[:limit] if limit else section:
+            ratio = f"{row['ratio']:7.2f}x" if row["ratio"] else ""
+            typer.echo(
+                f"  {row['metric']:<54}"
+                f"{_format_number(row['before'], kind):>11}"
+                f"{_format_number(row['after'], kind):>11}"
+                f"{_format_number(row['delta'], kind, sign=True):>11}{ratio:>8}"
+            )
+        if limit and len(section) > limit:
+            typer.echo(f"  ... {len(section) - limit} more")
+    if not rows:
+        typer.echo("No differences.")
+
+
+def _format_number(value: Optional[float], kind: str, sign: bool = False) -> str:
+    if value is None:
+        return "-"
+    flag = "+" if sign else ""
+    if kind == "bytes":
+        return f"{value / 2**20:{flag}.1f}"
+    if kind == "time":
+        return f"{value:{flag}.3f}"
+    return f"{value:{flag}g}"
+
+
+@app.command()
+def standin(
+    host: str = typer.Option("127.0.0.1", help="监听地址"),
+    port: int = typer.Option(8765, help="监听端口"),
+    latency: float = typer.Option(0.0, help="每个请求的附加延迟（秒）"),
+    error_rate: float = typer.Option(0.0, help="错误注入概率"),
+    error_status: int = typer.Option(503, help="注入错误时返回的状态码"),
+    fixtures: Optional[str] = typer.Option(None, help="录制响应所在目录"),
+):
+    """启动远程数据源的本地替身服务，用于离线运行和压测。"""
+    from biorange.core.network.standin import StandInServer
+
+    server = StandInServer(
+        host=host,
+        port=port,
+        fixtures_dir=fixtures,
+        latency=latency,
+        error_rate=error_rate,
+        error_status=error_status,
+    )
+    typer.echo("将以下配置写入 config.yaml 以使用替身服务：")
+    typer.echo("network:\n  sources:")
+    for source, url in server.source_urls().items():
+        typer.echo(f"    {source}: {url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("Stand-in server stopped.")
+
+
+def progress(config_manager: "ConfigManager"):
     """打印参数"""
     for key, value in config_manager.settings.model_dump().items():
         typer.echo(f"{key}: {value}")
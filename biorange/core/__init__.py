@@ -1,5 +1,5 @@
-"""# 当pwd没有config.yaml的时候，复制一份"""
+"""核心模块：配置、缓存、日志和网络访问。
 
-from biorange.core.utils.package_fileload import copy_config_if_not_exists
-
-copy_config_if_not_exists()
+当前目录没有 config.yaml 时，由 `biorange.cli.helpers.process_parameters`
+复制一份默认配置，导入本包不会修改文件系统。
+"""
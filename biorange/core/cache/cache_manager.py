@@ -5,9 +5,27 @@ import time
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 
-import redis
-
 from biorange.core.logger import get_logger
+from biorange.core.telemetry import get_metrics_registry
+
+_metrics = get_metrics_registry()
+_CACHE_REQUESTS = _metrics.counter(
+    "biorange_cache_requests",
+    "Analysis cache operations by backend, operation and result",
+    ("backend", "op", "result"),
+)
+_CACHE_SECONDS = _metrics.histogram(
+    "biorange_cache_seconds",
+    "Analysis cache operation time in seconds",
+    ("backend", "op"),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+
+
+def _redis():
+    import redis  # 延迟导入，不使用 Redis 缓存时不加载
+
+    return redis
 
 
 # CacheManager 接口
@@ -74,7 +92,7 @@ class FileCacheManager(CacheManager):
                     else:
                         self.delete(key)
             except (OSError, pickle.PickleError) as e_file:
-                self.logger.error(f"Failed to read cache for key {key}: {e_file}")
+                self.logger.error("Failed to read cache for key %s: %s", key, e_file)
         return None
 
     def save(self, key: str, value: Any, ttl: Optional[int] = None):
@@ -92,12 +110,12 @@ class FileCacheManager(CacheManager):
             try:
                 os.remove(cache_path)
             except OSError as e:
-                self.logger.error(f"Failed to delete cache for key {key}: {e}")
+                self.logger.error("Failed to delete cache for key %s: %s", key, e)
 
 
 class RedisCacheManager(CacheManager):
     def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0):
-        self.client = redis.StrictRedis(host=host, port=port, db=db)
+        self.client = _redis().StrictRedis(host=host, port=port, db=db)
         self.logger = get_logger(__name__)
 
     def get(self, key: str) -> Optional[Any]:
@@ -105,9 +123,9 @@ class RedisCacheManager(CacheManager):
             data = self.client.get(key)
             if data and isinstance(data, bytes):
                 return pickle.loads(data)
-        except (redis.RedisError, pickle.PickleError) as e_redis:
+        except (_redis().RedisError, pickle.PickleError) as e_redis:
             self.logger.error(
-                f"Failed to get cache for key {key} from Redis: {e_redis}"
+                "Failed to get cache for key %s from Redis: %s", key, e_redis
             )
         return None
 
@@ -118,26 +136,43 @@ class RedisCacheManager(CacheManager):
                 self.client.setex(key, ttl, data)
             else:
                 self.client.set(key, data)
-        except (redis.RedisError, pickle.PickleError) as e:
-            self.logger.error(f"Failed to save cache for key {key} to Redis: {e}")
+        except (_redis().RedisError, pickle.PickleError) as e:
+            self.logger.error("Failed to save cache for key %s to Redis: %s", key, e)
 
     def delete(self, key: str) -> None:
         try:
             self.client.delete(key)
-        except redis.RedisError as e:
-            self.logger.error(f"Failed to delete cache for key {key} from Redis: {e}")
+        except _redis().RedisError as e:
+            self.logger.error(
+                "Failed to delete cache for key %s from Redis: %s", key, e
+            )
 
 
 # 通用缓存管理器
 class GeneralCacheManager(CacheManager):
+    """委托给具体缓存实现，并按后端记录命中率和耗时指标。"""
+
     def __init__(self, cache_manager: CacheManager):
         self.cache_manager = cache_manager
+        self.backend = type(cache_manager).__name__
 
     def get(self, key: str) -> Optional[Any]:
-        return self.cache_manager.get(key)
+        start = time.perf_counter()
+        value = self.cache_manager.get(key)
+        _CACHE_SECONDS.observe(
+            time.perf_counter() - start, backend=self.backend, op="get"
+        )
+        result = "miss" if value is None else "hit"
+        _CACHE_REQUESTS.inc(backend=self.backend, op="get", result=result)
+        return value
 
     def save(self, key: str, value: Any, ttl: Optional[int] = None):
+        start = time.perf_counter()
         self.cache_manager.save(key, value, ttl)
+        _CACHE_SECONDS.observe(
+            time.perf_counter() - start, backend=self.backend, op="save"
+        )
+        _CACHE_REQUESTS.inc(backend=self.backend, op="save", result="ok")
 
     def delete(self, key: str):
         self.cache_manager.delete(key)
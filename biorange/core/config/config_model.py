@@ -1,5 +1,7 @@
 """定义参数字段，需要用到的参数都放这里"""
 
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -29,6 +31,233 @@ class DatabaseSettings(BaseModel):
     pool_size: int = Field(default=5, description="数据库连接池大小")
 
 
+class HostLimitSettings(BaseModel):
+    """
+    单个主机的限流设置。
+
+    Args:
+        rate (float): 每秒请求数上限。
+        burst (int): 令牌桶容量，即允许的突发请求数。
+        initial_concurrency (int): 初始并发数。
+        min_concurrency (int): 并发下限。
+        max_concurrency (int): 并发上限。
+        latency_target (float): 延迟目标（秒），低于该值时才增加并发。
+    """
+
+    rate: float = Field(default=5.0, description="每秒请求数上限")
+    burst: int = Field(default=5, description="突发请求数")
+    initial_concurrency: int = Field(default=2, description="初始并发数")
+    min_concurrency: int = Field(default=1, description="并发下限")
+    max_concurrency: int = Field(default=8, description="并发上限")
+    latency_target: float = Field(default=5.0, description="延迟目标（秒）")
+
+
+def _default_host_limits() -> dict[str, HostLimitSettings]:
+    return {
+        "www.ebi.ac.uk": HostLimitSettings(rate=2.0, burst=2, max_concurrency=4),
+        "rest.uniprot.org": HostLimitSettings(rate=5.0, burst=5),
+        "pubchem.ncbi.nlm.nih.gov": HostLimitSettings(rate=5.0, burst=5),
+    }
+
+
+class SourceSettings(BaseModel):
+    """
+    远程数据源地址设置类。指向本地替身服务即可离线运行和压测。
+
+    Args:
+        tcmsp (str): TCMSP 网站地址。
+        chembl (str): ChEMBL 靶点预测服务地址。
+        uniprot (str): UniProt REST 接口地址。
+        pubchem (str): PubChem PUG REST 接口地址。
+        genecards (str): GeneCards 网站地址。
+    """
+
+    tcmsp: str = Field(default="https://old.tcmsp-e.com", description="TCMSP 地址")
+    chembl: str = Field(default="https://www.ebi.ac.uk/chembl", description="ChEMBL 地址")
+    uniprot: str = Field(default="https://rest.uniprot.org", description="UniProt 地址")
+    pubchem: str = Field(
+        default="https://pubchem.ncbi.nlm.nih.gov/rest/pug", description="PubChem 地址"
+    )
+    genecards: str = Field(default="https://www.genecards.org", description="GeneCards 地址")
+
+
+class NetworkSettings(BaseModel):
+    """
+    远程访问设置类，定义了访问远程数据源时的限流参数。
+
+    Args:
+        rate_limit (HostLimitSettings): 未单独配置的主机使用的限流参数。
+        hosts (dict[str, HostLimitSettings]): 按主机名配置的限流参数。
+        breaker_failure_threshold (int): 数据源熔断所需的连续失败次数。
+        breaker_recovery_timeout (float): 熔断后的冷却时间（秒）。
+        sources (SourceSettings): 远程数据源地址。
+        http_cache (bool): 是否在磁盘上缓存原始 HTTP 响应。
+        http_cache_dir (str): HTTP 响应缓存目录。
+        http_cache_max_age (Optional[float]): 响应缓存的新鲜期（秒），为空表示永不过期，
+            过期后使用条件请求重新验证。
+    """
+
+    rate_limit: HostLimitSettings = Field(default_factory=HostLimitSettings)
+    hosts: dict[str, HostLimitSettings] = Field(default_factory=_default_host_limits)
+    breaker_failure_threshold: int = Field(default=5, description="熔断失败阈值")
+    breaker_recovery_timeout: float = Field(default=60.0, description="熔断冷却时间")
+    sources: SourceSettings = Field(default_factory=SourceSettings)
+    http_cache: bool = Field(default=True, description="是否缓存 HTTP 响应")
+    http_cache_dir: str = Field(default="./.cache/http", description="HTTP 缓存目录")
+    http_cache_max_age: Optional[float] = Field(
+        default=None, description="HTTP 缓存新鲜期（秒）"
+    )
+
+
+def _default_source_concurrency() -> dict[str, int]:
+    return {"chembl": 4, "genecards": 1}
+
+
+class DeadlineSettings(BaseModel):
+    """
+    单个数据源的截止时间设置。
+
+    Args:
+        soft (Optional[float]): 软截止（秒），超过后可发出对冲请求。
+        hard (Optional[float]): 硬截止（秒），超过后结果记为缺失。
+        hedge (bool): 超过软截止时是否发出对冲请求。
+    """
+
+    soft: Optional[float] = Field(default=None, description="软截止（秒）")
+    hard: Optional[float] = Field(default=None, description="硬截止（秒）")
+    hedge: bool = Field(default=False, description="是否发出对冲请求")
+
+
+def _default_deadlines() -> dict[str, DeadlineSettings]:
+    return {
+        "tcmsp": DeadlineSettings(soft=60, hard=180),
+        "chembl": DeadlineSettings(soft=120, hard=600, hedge=True),
+        "genecards": DeadlineSettings(hard=300),
+    }
+
+
+class CacheSettings(BaseModel):
+    """
+    分析结果缓存设置类。
+
+    Args:
+        cache_type (Literal["redis", "file", "memory"]): 缓存类型。
+        cache_dir (str): 文件缓存的目录。
+        redis_host (str): Redis 主机。
+        redis_port (int): Redis 端口。
+        redis_db (int): Redis 数据库编号。
+    """
+
+    cache_type: Literal["redis", "file", "memory"] = Field(
+        default="redis", description="缓存类型"
+    )
+    cache_dir: str = Field(default="./.cache", description="文件缓存目录")
+    redis_host: str = Field(default="localhost", description="Redis 主机")
+    redis_port: int = Field(default=6379, description="Redis 端口")
+    redis_db: int = Field(default=0, description="Redis 数据库编号")
+
+
+def _default_strategies() -> dict[str, list[str]]:
+    return {
+        "components": ["tcmsp"],
+        "targets": ["chembl", "stitch", "tcmsp_local"],
+        "disease_targets": ["genecards", "omim", "ttd"],
+    }
+
+
+class CelerySettings(BaseModel):
+    """
+    Celery 执行器设置类。
+
+    Args:
+        broker_url (str): broker 地址。
+        result_backend (str): 结果后端地址。
+        eager (bool): 是否在本进程内同步执行任务（用于调试和测试）。
+        queues (dict[str, str]): 数据源到队列的路由，未配置的数据源进入默认队列。
+    """
+
+    broker_url: str = Field(default="redis://localhost:6379/0", description="broker 地址")
+    result_backend: str = Field(
+        default="redis://localhost:6379/1", description="结果后端地址"
+    )
+    eager: bool = Field(default=False, description="是否同步执行任务")
+    queues: dict[str, str] = Field(default_factory=dict, description="数据源到队列的路由")
+
+
+class TelemetrySettings(BaseModel):
+    """
+    指标与区间记录设置类。
+
+    Args:
+        trace (bool): 是否记录耗时区间（Chrome trace）。
+        max_trace_events (int): 最多保留的区间事件数。
+        metrics_port (Optional[int]): 运行期间提供 Prometheus 抓取端点的端口，
+            为空时不启动端点。
+        metrics_file (str): 运行结束后写入结果目录的指标文件名（Prometheus 文本格式）。
+        trace_file (str): 运行结束后写入结果目录的 Chrome trace 文件名。
+        manifest_file (str): 运行结束后写入结果目录的性能清单文件名，可用
+            ``biorange compare-runs`` 对比两次运行。
+    """
+
+    trace: bool = Field(default=True, description="是否记录耗时区间")
+    max_trace_events: int = Field(default=500_000, description="区间事件数上限")
+    metrics_port: Optional[int] = Field(default=None, description="指标端点端口")
+    metrics_file: str = Field(default="metrics.prom", description="指标文件名")
+    trace_file: str = Field(default="trace.json", description="Chrome trace 文件名")
+    manifest_file: str = Field(
+        default="performance.json", description="性能清单文件名"
+    )
+
+
+class PipelineSettings(BaseModel):
+    """
+    分析流程设置类，定义了共享调度器的并发参数。
+
+    Args:
+        max_workers (int): 全局并发上限（工作线程数）。
+        source_concurrency (dict[str, int]): 按数据源的并发上限，未配置的数据源
+            只受全局上限约束。
+        max_in_flight (int): 流式执行时每个分析器同时在途的输入项上限。
+        browser_pool_size (int): 可同时使用的浏览器（Playwright）实例数，
+            使用浏览器的数据源并发数不超过该值。
+        process_workers (Optional[int]): 计算密集型策略的进程池大小，为空时
+            使用 CPU 核数。
+        cpu_chunk_size (int): 计算密集型策略每批提交给进程池的输入数。
+        deadlines (dict[str, DeadlineSettings]): 按数据源的软/硬截止时间。
+        executor (Literal["local", "celery"]): 任务执行器，``local`` 使用本机
+            线程池/进程池，``celery`` 把任务分发到 Celery worker。
+        celery (CelerySettings): Celery 执行器的设置。
+        store_dir (Optional[str]): 策略中间结果存储的目录，为空时使用结果目录下的
+            ``.store``。
+        cache (CacheSettings): 分析结果缓存的设置。
+        strategies (dict[str, list[str]]): 每个分析步骤使用的策略名称，名称见
+            `biorange.workflows.network_pharmacology.registry.STRATEGIES`。
+        telemetry (TelemetrySettings): 指标与区间记录的设置。
+        progress (bool): 运行时是否在控制台显示各步骤的实时进度。
+    """
+
+    max_workers: int = Field(default=16, description="全局并发上限")
+    source_concurrency: dict[str, int] = Field(
+        default_factory=_default_source_concurrency, description="按数据源的并发上限"
+    )
+    max_in_flight: int = Field(default=64, description="流式执行的在途项上限")
+    browser_pool_size: int = Field(default=4, description="浏览器实例数上限")
+    process_workers: Optional[int] = Field(default=None, description="进程池大小")
+    cpu_chunk_size: int = Field(default=32, description="计算任务每批的输入数")
+    deadlines: dict[str, DeadlineSettings] = Field(
+        default_factory=_default_deadlines, description="按数据源的截止时间"
+    )
+    executor: Literal["local", "celery"] = Field(default="local", description="任务执行器")
+    celery: CelerySettings = Field(default_factory=CelerySettings)
+    store_dir: Optional[str] = Field(default=None, description="中间结果存储目录")
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    strategies: dict[str, list[str]] = Field(
+        default_factory=_default_strategies, description="每个分析步骤使用的策略"
+    )
+    telemetry: TelemetrySettings = Field(default_factory=TelemetrySettings)
+    progress: bool = Field(default=True, description="是否显示实时进度")
+
+
 class Settings(BaseModel):
     """
     配置设置类，定义了应用程序的各种配置参数。
@@ -36,15 +265,50 @@ class Settings(BaseModel):
     Args:
         api (APISettings): API 相关的配置参数。
         database (DatabaseSettings): 数据库相关的配置参数。
+        network (NetworkSettings): 远程访问相关的配置参数。
+        pipeline (PipelineSettings): 分析流程相关的配置参数。
     """
 
     api: APISettings = Field(default_factory=APISettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    network: NetworkSettings = Field(default_factory=NetworkSettings)
+    pipeline: PipelineSettings = Field(default_factory=PipelineSettings)
     drug_name: list[str] = Field(default=[], description="药物名称列表")
     disease_name: str = Field(default="", description="疾病名称")
     results_dir: str = Field(default="results", description="结果目录")
 
 
+class BatchProject(BaseModel):
+    """
+    批量运行中的一个项目。
+
+    Args:
+        drug_name (list[str]): 药物名称列表。
+        disease_name (str): 疾病名称。
+        results_dir (str): 该项目的结果目录。
+    """
+
+    drug_name: list[str] = Field(default=[], description="药物名称列表")
+    disease_name: str = Field(default="", description="疾病名称")
+    results_dir: str = Field(description="结果目录")
+
+
+class BatchManifest(BaseModel):
+    """
+    批量运行清单，对应 `biorange batch` 的 YAML 文件::
+
+        projects:
+          - drug_name: [柴胡, 黄芩]
+            disease_name: 肝炎
+            results_dir: results/xiaochaihu
+
+    Args:
+        projects (list[BatchProject]): 项目列表。
+    """
+
+    projects: list[BatchProject] = Field(default=[], description="项目列表")
+
+
 # 示例用法
 if __name__ == "__main__":
     settings = Settings()
@@ -1,17 +1,12 @@
 # biorange/core/logger/__init__.py
 
-"""导入时就初始化日志配置"""
+"""日志配置在首次获取 logger 时初始化，日志目录在首次写文件时创建"""
 
-from pathlib import Path
+import logging
 
-from .logging_config import LogManager
+from .logging_config import LogManager, forward_worker_logs
 
-# 定义日志目录
-logs_dir = Path(".logs")
-logs_dir.mkdir(parents=True, exist_ok=True)
 
-# 初始化日志配置
-log_manager = LogManager()
-
-# 提供一个全局的 get_logger 函数
-get_logger = log_manager.get_logger
+def get_logger(name: str) -> logging.Logger:
+    """返回指定名称的 logger，首次调用时按配置文件初始化日志。"""
+    return LogManager().get_logger(name)
@@ -0,0 +1,121 @@
+"""
+按模块对逐项日志采样和限流的过滤器。
+
+分析器和抓取器对每个输入项都会记录几行日志（"Searching for SMILES"、
+"Cache hit" 等），大规模运行时这些日志本身就是开销。过滤器挂在队列处理器上，
+在调用线程中、格式化之前丢弃记录，被丢弃的记录不会被格式化，也不会进入队列。
+
+两种过滤器都只作用于名称匹配 `loggers` 前缀、级别不高于 `max_level` 的记录，
+警告和错误总是保留。计数按 (logger, 消息模板) 分组，因此使用 %-style 的
+日志调用才能正确归为一组。
+
+类:
+    SamplingFilter: 每 N 条同类记录保留一条。
+    RateLimitFilter: 按令牌桶限制同类记录的速率。
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+_Key = Tuple[str, str]
+
+
+class _ItemFilter(logging.Filter):
+    """按 logger 名称前缀和级别选择受控记录的基类。"""
+
+    def __init__(
+        self,
+        loggers: Optional[Iterable[str]] = None,
+        max_level: Union[int, str] = logging.INFO,
+    ):
+        super().__init__()
+        self.loggers = tuple(loggers or ())
+        self.max_level = (
+            logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+        )
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def _applies(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return False
+        if not self.loggers:
+            return True
+        return any(
+            record.name == prefix or record.name.startswith(prefix + ".")
+            for prefix in self.loggers
+        )
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> _Key:
+        return record.name, str(record.msg)
+
+
+class SamplingFilter(_ItemFilter):
+    """每 `every` 条同类记录保留一条（保留第 1、every+1、... 条）。
+
+    Attributes:
+        every (int): 采样间隔。
+        suppressed (int): 已丢弃的记录数。
+    """
+
+    def __init__(self, every: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.every = max(1, int(every))
+        self._counts: Dict[_Key, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self._applies(record):
+            return True
+        key = self._key(record)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count % self.every == 0:
+                return True
+            self.suppressed += 1
+            return False
+
+
+class RateLimitFilter(_ItemFilter):
+    """按令牌桶限制同类记录的速率。
+
+    被限流丢弃的条数附加在下一条保留的同类记录末尾。
+
+    Attributes:
+        rate (float): 每秒补充的令牌数（每秒保留的记录数）。
+        burst (int): 令牌桶容量。
+        suppressed (int): 已丢弃的记录数。
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        # key -> [令牌数, 上次补充时间, 自上次保留以来丢弃的条数]
+        self._buckets: Dict[_Key, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self._applies(record):
+            return True
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            # 后缀中没有 %，不影响延迟格式化
+            record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+        return True
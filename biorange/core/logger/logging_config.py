@@ -1,14 +1,53 @@
-"""日志配置管理"""
+"""日志配置管理
 
+配置文件中 ``queue.enabled`` 为真时，各 logger 的处理器改由后台线程执行：
+调用线程只把记录放入队列（先经过 ``queue.filters`` 中的采样/限流过滤器），
+格式化和文件、控制台 I/O 都在 `QueueListener` 的线程中完成。
+
+进程池的 worker 不自行写日志：`worker_log_queue` 返回一个跨进程队列，worker 的
+初始化函数 `forward_worker_logs` 把该进程的所有记录发送到这个队列，由父进程中
+同名的 logger 处理，与父进程自己的记录经过相同的过滤器和处理器。
+"""
+
+import atexit
 import logging
 import logging.config
+import multiprocessing
 import os
-from importlib import resources
+import queue
+from importlib import import_module, resources
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from threading import Lock
 
 import yaml
 
 
+class LazyTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """首次写入时才创建日志目录和文件的按时间轮转处理器。"""
+
+    def __init__(self, filename, *args, **kwargs):
+        kwargs["delay"] = True
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LocalQueueHandler(QueueHandler):
+    """同一进程内的队列处理器：记录原样入队，格式化留给后台线程。"""
+
+    def prepare(self, record):
+        return record
+
+
+class _ForwardHandler(logging.Handler):
+    """把 worker 进程的记录交给本进程中同名的 logger 处理。"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
 class ConfigLoader:
     """负责加载和验证日志配置的类。"""
 
@@ -82,7 +121,117 @@ class LogManager:
         使用提供的配置路径初始化日志配置。
         """
         config = ConfigLoader.load_config(config_path)
+        queue_config = config.pop("queue", None) or {}
         logging.config.dictConfig(config)
+        self.loggers = [logging.getLogger()] + [
+            logging.getLogger(name) for name in config.get("loggers", {})
+        ]
+        self.listeners = []
+        self.filters = {}
+        self._direct_handlers = []
+        self._worker_queue = None
+        if queue_config.get("enabled", False):
+            self._start_queue(config, queue_config)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def _start_queue(self, config, queue_config):
+        """
+        把各 logger 的处理器移到后台线程，处理器相同的 logger 共用一个队列。
+        """
+        for name in queue_config.get("filters", []):
+            self.filters[name] = self._build_filter(config["filters"][name])
+
+        queue_handlers = {}
+        for logger in self.loggers:
+            if not logger.handlers:
+                continue
+            self._direct_handlers.append((logger, logger.handlers))
+            key = tuple(id(handler) for handler in logger.handlers)
+            if key not in queue_handlers:
+                records = queue.SimpleQueue()
+                handler = LocalQueueHandler(records)
+                for log_filter in self.filters.values():
+                    handler.addFilter(log_filter)
+                listener = QueueListener(
+                    records, *logger.handlers, respect_handler_level=True
+                )
+                listener.start()
+                self.listeners.append(listener)
+                queue_handlers[key] = handler
+            logger.handlers = [queue_handlers[key]]
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def _build_filter(spec):
+        spec = dict(spec)
+        module_name, _, attr = spec.pop("()").rpartition(".")
+        return getattr(import_module(module_name), attr)(**spec)
+
+    def _after_fork_in_child(self):
+        """
+        fork 出的子进程中没有后台线程，队列里的记录不会被处理：处理器改回在
+        调用线程中执行。
+        """
+        for logger, handlers in self._direct_handlers:
+            logger.handlers = handlers
+        self._direct_handlers = []
+        self.listeners = []
+        self._worker_queue = None
+
+    def worker_log_queue(self, context=None):
+        """
+        返回 worker 进程转发日志记录的跨进程队列，首次调用时启动在本进程中
+        处理这些记录的后台线程。
+
+        Args:
+            context (optional): 进程池使用的 multiprocessing 上下文。
+
+        Returns:
+            multiprocessing.Queue: 传给 `forward_worker_logs` 的队列。
+        """
+        with self._lock:
+            if self._worker_queue is None:
+                records = (context or multiprocessing).Queue()
+                listener = QueueListener(records, _ForwardHandler())
+                listener.start()
+                self.listeners.append(listener)
+                self._worker_queue = records
+                atexit.register(self.shutdown)
+            return self._worker_queue
+
+    def forward_to(self, records):
+        """
+        把本进程的所有日志记录发送到 `records`，由创建队列的父进程处理。
+        """
+        self.shutdown()
+        handler = QueueHandler(records)
+        # 每条记录只入队一次，父进程再按原来的传播关系分发
+        for logger in self.loggers[1:]:
+            logger.handlers = []
+            logger.propagate = True
+        logging.getLogger().handlers = [handler]
+        self._direct_handlers = []
+
+    def console_handlers(self):
+        """
+        返回输出到控制台的处理器（不含文件处理器），包括队列后台线程中的。
+        """
+        handlers = [h for logger in self.loggers for h in logger.handlers]
+        handlers += [h for listener in self.listeners for h in listener.handlers]
+        return [
+            handler
+            for handler in dict.fromkeys(handlers)
+            if isinstance(handler, logging.StreamHandler)
+            and not isinstance(handler, logging.FileHandler)
+        ]
+
+    def shutdown(self):
+        """
+        处理完队列中剩余的记录并停止后台线程。
+        """
+        while self.listeners:
+            self.listeners.pop().stop()
 
     @staticmethod
     def get_logger(name):
@@ -92,6 +241,16 @@ class LogManager:
         return logging.getLogger(name)
 
 
+def forward_worker_logs(records):
+    """
+    进程池 worker 的初始化函数：把 worker 的日志记录发送到父进程。
+
+    Args:
+        records: 父进程 `LogManager.worker_log_queue` 返回的队列。
+    """
+    LogManager().forward_to(records)
+
+
 # 示例用法
 if __name__ == "__main__":
     log_manager = LogManager()
@@ -0,0 +1,81 @@
+"""远程访问基础设施：共享 HTTP 客户端、响应缓存、数据源地址、按主机限流与按数据源熔断。
+
+HTTP 客户端和响应缓存依赖 requests，在首次访问时才导入。
+"""
+
+from importlib import import_module
+
+from biorange.core.network.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    get_circuit_breaker_registry,
+)
+from biorange.core.network.rate_limiter import (
+    AIMDController,
+    HostLimiter,
+    RateLimiterRegistry,
+    TokenBucket,
+    get_rate_limiter_registry,
+)
+from biorange.core.network.sources import configure_sources, get_source_url
+
+_LAZY = {
+    "HttpResponseCache": "biorange.core.network.http_cache",
+    "HttpClient": "biorange.core.network.http_client",
+    "get_http_client": "biorange.core.network.http_client",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def configure_network(network_settings) -> None:
+    """根据 `NetworkSettings` 配置进程级的数据源地址、响应缓存、限流器和熔断器。
+
+    Args:
+        network_settings (NetworkSettings): 远程访问相关的配置参数。
+    """
+    from biorange.core.network.http_client import get_http_client
+
+    configure_sources(network_settings.sources.model_dump())
+    get_http_client().configure_cache(
+        enabled=network_settings.http_cache,
+        cache_dir=network_settings.http_cache_dir,
+        max_age=network_settings.http_cache_max_age,
+    )
+    get_rate_limiter_registry().configure(
+        defaults=network_settings.rate_limit.model_dump(),
+        overrides={
+            host: limits.model_dump()
+            for host, limits in network_settings.hosts.items()
+        },
+    )
+    get_circuit_breaker_registry().configure(
+        failure_threshold=network_settings.breaker_failure_threshold,
+        recovery_timeout=network_settings.breaker_recovery_timeout,
+    )
+
+
+__all__ = [
+    "AIMDController",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "HostLimiter",
+    "HttpClient",
+    "HttpResponseCache",
+    "RateLimiterRegistry",
+    "TokenBucket",
+    "configure_network",
+    "configure_sources",
+    "get_circuit_breaker_registry",
+    "get_http_client",
+    "get_rate_limiter_registry",
+    "get_source_url",
+]
@@ -0,0 +1,168 @@
+"""
+按数据源划分的熔断器。
+
+连续失败达到阈值后熔断器打开，在冷却期内对该数据源的调用直接失败，
+运行继续使用其他数据源；冷却期结束后放行一次试探调用（半开），
+成功则关闭熔断器，失败则重新打开。
+
+类:
+    CircuitOpenError: 熔断器打开时抛出的异常。
+    CircuitBreaker: 单个数据源的熔断器。
+    CircuitBreakerRegistry: 以数据源名称为键的熔断器注册表。
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，调用被直接拒绝。"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"数据源 {name} 已熔断，{retry_in:.0f}s 后重试")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """单个数据源的熔断器。
+
+    Attributes:
+        name (str): 数据源名称。
+        failure_threshold (int): 打开熔断器所需的连续失败次数。
+        recovery_timeout (float): 打开后的冷却时间（秒）。
+        trips (int): 熔断器累计打开次数。
+        rejected (int): 熔断期间被直接拒绝的调用次数。
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """在调用前检查熔断器状态。
+
+        Raises:
+            CircuitOpenError: 熔断器打开且仍在冷却期内，或半开状态下已有试探调用。
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if self.state is CircuitState.OPEN and remaining <= 0:
+                self._set_state(CircuitState.HALF_OPEN)
+            if self.state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state is not CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state is CircuitState.HALF_OPEN or (
+                self.state is CircuitState.CLOSED
+                and self.failures >= self.failure_threshold
+            ):
+                self.trips += 1
+                self._opened_at = time.monotonic()
+                self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        logger.warning(
+            "熔断器 %s: %s -> %s (连续失败 %d 次)",
+            self.name,
+            self.state.value,
+            state.value,
+            self.failures,
+        )
+        self.state = state
+
+    def snapshot(self) -> dict:
+        """返回熔断器当前状态，用于日志和运行摘要。"""
+        with self._lock:
+            return {
+                "source": self.name,
+                "state": self.state.value,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakerRegistry:
+    """以数据源名称为键的熔断器注册表。"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+    ) -> None:
+        """更新阈值与冷却时间，并重置所有熔断器。"""
+        with self._lock:
+            if failure_threshold is not None:
+                self.failure_threshold = failure_threshold
+            if recovery_timeout is not None:
+                self.recovery_timeout = recovery_timeout
+            self._breakers.clear()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """获取（必要时创建）指定数据源的熔断器。"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name, self.failure_threshold, self.recovery_timeout
+                )
+            return breaker
+
+    def summary(self) -> List[dict]:
+        """返回所有熔断器的状态快照。"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+
+# 进程级共享的熔断器注册表
+_registry = CircuitBreakerRegistry()
+
+
+def get_circuit_breaker_registry() -> CircuitBreakerRegistry:
+    """返回进程级共享的熔断器注册表。"""
+    return _registry
@@ -0,0 +1,144 @@
+"""
+传输层的磁盘 HTTP 响应缓存。
+
+与 DataFrame 级别的 `CacheManager` 相互独立：这里缓存的是原始响应体，
+因此修改规范化或过滤逻辑后重新处理时，不需要再次访问网络。
+
+- 键：方法 + URL + 请求体 的 SHA-256。
+- 值：zlib 压缩的响应体及状态码、响应头、写入时间。
+- 新鲜度：`max_age` 秒内直接使用缓存；过期后携带 If-None-Match /
+  If-Modified-Since 进行条件请求，304 时继续使用缓存。
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def request_body_key(kwargs: Dict[str, Any]) -> bytes:
+    """把 `requests` 的 data/json 参数规范化为用于计算缓存键的字节串。"""
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True).encode("utf-8")
+    data = kwargs.get("data")
+    if data is None:
+        return b""
+    if isinstance(data, dict):
+        return urlencode(sorted(data.items())).encode("utf-8")
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return bytes(data)
+
+
+class HttpResponseCache:
+    """磁盘 HTTP 响应缓存。
+
+    Attributes:
+        cache_dir (Path): 缓存目录（绝对路径）。
+        max_age (Optional[float]): 缓存的新鲜期（秒），None 表示永不过期。
+    """
+
+    def __init__(self, cache_dir: str = "./.cache/http", max_age: Optional[float] = None):
+        # 相对路径在配置时按当前工作目录解析，之后切换目录不会改变缓存位置
+        self.cache_dir = Path(cache_dir).resolve()
+        self.max_age = max_age
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(method: str, url: str, body: bytes = b"") -> str:
+        digest = hashlib.sha256()
+        for part in (method.upper().encode("utf-8"), url.encode("utf-8"), body):
+            digest.update(part)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[dict]:
+        """读取缓存条目，不存在或损坏时返回 None。"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.PickleError, EOFError) as e:
+            logger.error("Failed to read HTTP cache entry %s: %s", key, e)
+            return None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return self.max_age is None or time.time() - entry["stored_at"] < self.max_age
+
+    def _write(self, key: str, entry: dict) -> None:
+        """写入临时文件后原子替换，避免并发读到半个文件。"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                pickle.dump(entry, f)
+            os.replace(f.name, path)
+        except (OSError, pickle.PickleError) as e:
+            logger.error("Failed to write HTTP cache entry %s: %s", key, e)
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """保存成功的响应。"""
+        self._write(
+            key,
+            {
+                "status": response.status_code,
+                "url": response.url,
+                "headers": dict(response.headers),
+                "content": zlib.compress(response.content),
+                "stored_at": time.time(),
+            },
+        )
+
+    def touch(self, key: str, entry: dict) -> None:
+        """条件请求返回 304 后刷新写入时间。"""
+        entry["stored_at"] = time.time()
+        self._write(key, entry)
+
+    @staticmethod
+    def validators(entry: dict) -> Dict[str, str]:
+        """根据缓存条目生成条件请求头。"""
+        headers = CaseInsensitiveDict(entry["headers"])
+        conditional = {}
+        if "ETag" in headers:
+            conditional["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    @staticmethod
+    def to_response(entry: dict) -> Optional[requests.Response]:
+        """把缓存条目还原为 `requests.Response`，并标记 `from_cache=True`。
+
+        响应体无法解压（条目损坏）时返回 None，调用方按未命中处理。
+        """
+        try:
+            content = zlib.decompress(entry["content"])
+        except zlib.error as e:
+            logger.error("Corrupt HTTP cache entry for %s: %s", entry.get("url"), e)
+            return None
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
@@ -0,0 +1,231 @@
+"""
+共享 HTTP 客户端。
+
+所有远程策略通过 `get_http_client()` 获取同一个 `HttpClient`，
+每个请求都会先经过对应主机的 `HostLimiter`，请求结束后把延迟和状态码
+反馈给 AIMD 控制器，从而在不触发封禁的前提下获得最高的持续吞吐。
+429/503 等限流响应不交给 urllib3 重试，而是由限流器处理：并发上限减半、
+按 Retry-After 暂停发放令牌，再重新排队发送。
+启用响应缓存后，命中新鲜缓存的请求不会占用限流名额，也不会访问网络。
+每个请求按主机记录次数、结果、重试次数和耗时指标。
+"""
+
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from biorange.core.logger import get_logger
+from biorange.core.network.http_cache import HttpResponseCache, request_body_key
+from biorange.core.network.rate_limiter import (
+    BACKOFF_STATUS_CODES,
+    HostLimiter,
+    RateLimiterRegistry,
+    get_rate_limiter_registry,
+)
+from biorange.core.telemetry import get_metrics_registry
+
+logger = get_logger(__name__)
+
+_metrics = get_metrics_registry()
+_REQUESTS = _metrics.counter(
+    "biorange_http_requests",
+    "HTTP requests by host and outcome (cache, status class or error)",
+    ("host", "outcome"),
+)
+_RETRIES = _metrics.counter(
+    "biorange_http_retries",
+    "HTTP retries performed by the adapter or after throttling",
+    ("host",),
+)
+_REQUEST_SECONDS = _metrics.histogram(
+    "biorange_http_request_seconds",
+    "Network time of HTTP requests in seconds, retries included",
+    ("host",),
+)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """解析 Retry-After 头（仅支持秒数形式）。"""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class HttpClient:
+    """带按主机限流和自适应并发的 HTTP 客户端。
+
+    接口与 `requests.Session` 的 `get`/`post`/`request` 保持一致，
+    可以直接替换原有的 session。
+
+    Attributes:
+        session (requests.Session): 底层会话，已挂载重试策略。
+        registry (RateLimiterRegistry): 按主机划分的限流器注册表。
+        cache (Optional[HttpResponseCache]): 响应缓存，None 表示不缓存。
+        throttle_retries (int): 收到 429/503 后的最大重发次数。
+        throttle_backoff (float): 限流响应没有 Retry-After 时的初始暂停秒数，
+            每次重发加倍。
+    """
+
+    def __init__(
+        self,
+        registry: Optional[RateLimiterRegistry] = None,
+        retries: Optional[Retry] = None,
+        pool_maxsize: int = 32,
+        cache: Optional[HttpResponseCache] = None,
+        throttle_retries: int = 5,
+        throttle_backoff: float = 0.25,
+    ):
+        self.registry = registry or get_rate_limiter_registry()
+        self.cache = cache
+        self.throttle_retries = throttle_retries
+        self.throttle_backoff = throttle_backoff
+        # 429/503 不在重试列表中，也不在适配器内按 Retry-After 等待，
+        # 否则限流器看不到限流信号
+        retries = retries or Retry(
+            total=5,
+            backoff_factor=0.25,
+            status_forcelist=[500, 502, 504],
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retries, pool_connections=16, pool_maxsize=pool_maxsize
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def configure_cache(
+        self,
+        enabled: bool = True,
+        cache_dir: str = "./.cache/http",
+        max_age: Optional[float] = None,
+    ) -> None:
+        """启用或关闭响应缓存。
+
+        Args:
+            enabled (bool): 是否启用缓存。
+            cache_dir (str): 缓存目录，相对路径按调用时的工作目录解析。
+            max_age (Optional[float]): 缓存的新鲜期（秒），None 表示永不过期。
+        """
+        self.cache = HttpResponseCache(cache_dir, max_age) if enabled else None
+
+    def request(
+        self, method: str, url: str, cache: Optional[bool] = None, **kwargs
+    ) -> requests.Response:
+        """发送请求，优先使用响应缓存。
+
+        Args:
+            method (str): HTTP 方法。
+            url (str): 请求地址。
+            cache (Optional[bool]): 是否使用缓存。默认只缓存 GET；轮询状态等
+                不可缓存的请求应传 False，幂等的 POST 查询可以传 True。
+            **kwargs: 透传给 `requests.Session.request` 的参数。
+
+        Returns:
+            requests.Response: 响应对象，`from_cache` 属性表示是否来自缓存。
+        """
+        use_cache = self.cache is not None and (
+            cache if cache is not None else method.upper() == "GET"
+        )
+        if not use_cache:
+            return self._send(method, url, **kwargs)
+
+        full_url = self.session.prepare_request(
+            requests.Request(method, url, params=kwargs.get("params"))
+        ).url
+        key = self.cache.make_key(method, full_url, request_body_key(kwargs))
+        entry = self.cache.get(key)
+        cached = None if entry is None else self.cache.to_response(entry)
+        if cached is None:
+            entry = None  # 没有条目或条目损坏，按未命中处理
+        elif self.cache.is_fresh(entry):
+            _REQUESTS.inc(host=urlparse(url).netloc, outcome="cache")
+            return cached
+
+        if entry is not None:
+            # 过期条目：带上校验头做条件请求
+            kwargs["headers"] = {
+                **self.cache.validators(entry),
+                **(kwargs.get("headers") or {}),
+            }
+        response = self._send(method, url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(key, entry)
+            return cached
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """访问网络；收到限流响应时暂停该主机后重新排队发送。"""
+        limiter = self.registry.for_url(url)
+        for attempt in range(self.throttle_retries + 1):
+            response = self._send_once(limiter, method, url, **kwargs)
+            if (
+                response.status_code not in BACKOFF_STATUS_CODES
+                or attempt == self.throttle_retries
+            ):
+                break
+            # record 已把并发上限减半；再暂停发放令牌，所有线程一起退让
+            retry_after = _retry_after_seconds(response)
+            if retry_after is None:
+                retry_after = self.throttle_backoff * 2**attempt
+            if retry_after:
+                limiter.pause(retry_after)
+            _RETRIES.inc(host=limiter.host)
+            response.close()
+        return response
+
+    def _send_once(
+        self, limiter: HostLimiter, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """发送一次请求，期间占用目标主机的限流名额。"""
+        host = limiter.host
+        with limiter.slot():
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                elapsed = time.monotonic() - start
+                limiter.record(elapsed, None, error=True)
+                _REQUESTS.inc(host=host, outcome="error")
+                _REQUEST_SECONDS.observe(elapsed, host=host)
+                raise
+            elapsed = time.monotonic() - start
+            limiter.record(elapsed, response.status_code)
+
+        _REQUEST_SECONDS.observe(elapsed, host=host)
+        _REQUESTS.inc(host=host, outcome=f"{response.status_code // 100}xx")
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        if retries is not None and retries.history:
+            _RETRIES.inc(len(retries.history), host=host)
+        response.from_cache = False
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """返回进程级共享的 HTTP 客户端（首次调用时创建）。"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
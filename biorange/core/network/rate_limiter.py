@@ -0,0 +1,286 @@
+"""
+按主机限流与自适应并发控制。
+
+所有远程数据源（EBI、UniProt、PubChem、TCMSP ...）共享同一个进程级的
+`RateLimiterRegistry`，以主机名为键为每个数据源维护一个 `HostLimiter`：
+
+- `TokenBucket` 负责请求速率（每秒请求数 + 突发容量）。
+- `AIMDController` 负责并发数：延迟与错误率健康时加性增长，
+  遇到 429/503 等限流信号时乘性减小。
+
+类:
+    TokenBucket: 线程安全的令牌桶。
+    AIMDController: 加性增长/乘性减小的并发控制器。
+    HostLimiter: 单个主机的令牌桶 + 并发控制组合。
+    RateLimiterRegistry: 以主机为键的限流器注册表。
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 触发乘性减小的 HTTP 状态码
+BACKOFF_STATUS_CODES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """线程安全的令牌桶。
+
+    Attributes:
+        rate (float): 每秒补充的令牌数，即稳定状态下的每秒请求数。
+        capacity (float): 桶容量，即允许的最大突发请求数。
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate 和 capacity 必须为正数")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """尝试取出令牌。
+
+        Args:
+            tokens (float): 需要的令牌数。
+
+        Returns:
+            float: 0 表示成功取出；否则为建议的等待秒数。
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """阻塞直到取出令牌或超时。
+
+        Args:
+            tokens (float): 需要的令牌数。
+            timeout (Optional[float]): 最长等待秒数，None 表示一直等待。
+
+        Returns:
+            bool: 是否成功取出令牌。
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """在指定时间内停止发放令牌（用于响应 Retry-After）。"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class AIMDController:
+    """加性增长/乘性减小（AIMD）的并发控制器。
+
+    每次请求结束后调用 `record`：若最近窗口内延迟低于目标且错误率健康，
+    并发上限增加 `increase / limit`（约等于每轮增加 `increase`）；
+    遇到限流状态码时并发上限乘以 `decrease_factor`。
+
+    Attributes:
+        limit (float): 当前并发上限。
+        min_limit (int): 并发下限。
+        max_limit (int): 并发上限的最大值。
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_target: float = 5.0,
+        error_threshold: float = 0.1,
+        window: int = 20,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """等待直到在途请求数低于当前并发上限。"""
+        with self._cond:
+            acquired = self._cond.wait_for(
+                lambda: self._in_flight < int(self.limit), timeout=timeout
+            )
+            if acquired:
+                self._in_flight += 1
+            return acquired
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def record(self, latency: float, status: Optional[int], error: bool = False):
+        """根据一次请求的结果调整并发上限。
+
+        Args:
+            latency (float): 请求耗时（秒）。
+            status (Optional[int]): HTTP 状态码，连接错误时为 None。
+            error (bool): 请求是否失败。
+        """
+        with self._cond:
+            failed = error or (status is not None and status >= 500)
+            self._outcomes.append(failed)
+            if status in BACKOFF_STATUS_CODES:
+                self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                self._outcomes.clear()
+                return
+            error_rate = sum(self._outcomes) / len(self._outcomes)
+            if error_rate > self.error_threshold:
+                self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                self._outcomes.clear()
+            elif not failed and latency <= self.latency_target:
+                self.limit = min(
+                    float(self.max_limit), self.limit + self.increase / self.limit
+                )
+            self._cond.notify_all()
+
+
+class HostLimiter:
+    """单个主机的限流器：令牌桶控制速率，AIMD 控制并发。"""
+
+    def __init__(self, host: str, bucket: TokenBucket, concurrency: AIMDController):
+        self.host = host
+        self.bucket = bucket
+        self.concurrency = concurrency
+
+    @contextmanager
+    def slot(self) -> Iterator["HostLimiter"]:
+        """占用一个请求名额，退出时释放并发名额。"""
+        self.concurrency.acquire()
+        try:
+            self.bucket.acquire()
+            yield self
+        finally:
+            self.concurrency.release()
+
+    def record(self, latency: float, status: Optional[int], error: bool = False):
+        previous = int(self.concurrency.limit)
+        self.concurrency.record(latency, status, error)
+        current = int(self.concurrency.limit)
+        if current < previous:
+            logger.warning(
+                "%s 并发上限下调 %d -> %d (status=%s)", self.host, previous, current, status
+            )
+
+    def pause(self, seconds: float) -> None:
+        logger.warning("%s 请求限流，暂停 %.1fs", self.host, seconds)
+        self.bucket.pause(seconds)
+
+
+class RateLimiterRegistry:
+    """以主机名为键的限流器注册表。
+
+    Attributes:
+        defaults (dict): 未单独配置的主机使用的参数。
+        overrides (Dict[str, dict]): 按主机名覆盖的参数。
+    """
+
+    DEFAULTS = {
+        "rate": 5.0,
+        "burst": 5,
+        "initial_concurrency": 2,
+        "min_concurrency": 1,
+        "max_concurrency": 8,
+        "latency_target": 5.0,
+    }
+
+    def __init__(
+        self,
+        defaults: Optional[dict] = None,
+        overrides: Optional[Dict[str, dict]] = None,
+    ):
+        self.defaults = {**self.DEFAULTS, **(defaults or {})}
+        self.overrides = overrides or {}
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        defaults: Optional[dict] = None,
+        overrides: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        """更新配置，并丢弃已创建的限流器以便按新参数重建。"""
+        with self._lock:
+            self.defaults = {**self.DEFAULTS, **(defaults or {})}
+            self.overrides = overrides or {}
+            self._limiters.clear()
+
+    def _build(self, host: str) -> HostLimiter:
+        params = {**self.defaults, **self.overrides.get(host, {})}
+        return HostLimiter(
+            host,
+            TokenBucket(params["rate"], params["burst"]),
+            AIMDController(
+                initial=params["initial_concurrency"],
+                min_limit=params["min_concurrency"],
+                max_limit=params["max_concurrency"],
+                latency_target=params["latency_target"],
+            ),
+        )
+
+    def get(self, host: str) -> HostLimiter:
+        """获取（必要时创建）指定主机的限流器。"""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = self._build(host)
+            return limiter
+
+    def for_url(self, url: str) -> HostLimiter:
+        """根据 URL 的主机部分获取限流器。"""
+        return self.get(urlparse(url).netloc)
+
+
+# 进程级共享的限流器注册表
+_registry = RateLimiterRegistry()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """返回进程级共享的限流器注册表。"""
+    return _registry
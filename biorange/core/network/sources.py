@@ -0,0 +1,44 @@
+"""
+远程数据源的基础地址。
+
+爬虫在请求时通过 `get_source_url` 读取地址，因此只需修改配置即可把所有爬虫
+指向本地替身服务（见 `biorange.core.network.standin`）或镜像站点。
+"""
+
+import threading
+from typing import Dict, Optional
+
+DEFAULT_SOURCE_URLS: Dict[str, str] = {
+    "tcmsp": "https://old.tcmsp-e.com",
+    "chembl": "https://www.ebi.ac.uk/chembl",
+    "uniprot": "https://rest.uniprot.org",
+    "pubchem": "https://pubchem.ncbi.nlm.nih.gov/rest/pug",
+    "genecards": "https://www.genecards.org",
+}
+
+_source_urls: Dict[str, str] = dict(DEFAULT_SOURCE_URLS)
+_lock = threading.Lock()
+
+
+def configure_sources(urls: Optional[Dict[str, str]] = None) -> None:
+    """设置数据源地址，未给出的数据源恢复默认地址。
+
+    Args:
+        urls (Optional[Dict[str, str]]): 数据源名称到基础地址的映射。
+    """
+    with _lock:
+        _source_urls.clear()
+        _source_urls.update(DEFAULT_SOURCE_URLS)
+        _source_urls.update(
+            {name: url.rstrip("/") for name, url in (urls or {}).items() if url}
+        )
+
+
+def get_source_url(name: str) -> str:
+    """返回数据源的基础地址（不带结尾的斜杠）。
+
+    Raises:
+        KeyError: 未知的数据源名称。
+    """
+    with _lock:
+        return _source_urls[name]
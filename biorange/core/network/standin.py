@@ -0,0 +1,346 @@
+"""
+远程数据源的本地替身服务。
+
+用录制的响应模拟 TCMSP、ChEMBL 靶点预测、UniProt ID 映射、PubChem 和 GeneCards，
+支持可配置的延迟与错误注入，以及 UniProt 风格的任务轮询和分页。
+把配置中的 `network.sources` 指向 `StandInServer.source_urls()` 后，所有爬虫即可
+在无网络环境（CI、隔离节点）中运行，用于确定性地压测吞吐、并发限制和重试行为。
+
+用法:
+    with StandInServer(latency=0.05, error_rate=0.1) as server:
+        configure_sources(server.source_urls())
+        ...
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import resources
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import parse_qs, quote, urlparse
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SOURCES = ("tcmsp", "chembl", "uniprot", "pubchem", "genecards")
+
+BROWSE_PAGE = """<!DOCTYPE html>
+<html><body>
+<input id="inputVarTcm" type="text"><button id="searchBtTcm" onclick="search()">Search</button>
+<div id="grid"><div class="k-grid-content"><table><tbody></tbody></table></div></div>
+<script>
+function search() {
+  var q = document.getElementById("inputVarTcm").value;
+  var href = "tcmspsearch.php?qr=" + encodeURIComponent(q) + "&qsr=herb_cn_name";
+  document.querySelector("#grid tbody").innerHTML =
+    "<tr><td>1</td><td>" + q + "</td><td><a href='" + href + "'>" + q + "</a></td></tr>";
+}
+</script>
+</body></html>"""
+
+HERB_PAGE = """<!DOCTYPE html>
+<html><body>
+<div id="tabstrip"><ul><li>Related Ingredients</li></ul><div></div><div></div><div></div>
+<div id="grid"></div>
+<script>$("#grid").kendoGrid({dataSource: {data: %s, pageSize: 15}});</script>
+</div>
+</body></html>"""
+
+GENECARDS_PAGE = """<!DOCTYPE html>
+<html><body>
+<label id="exportBarLabel">Export</label>
+<a data-target="excel" href="/genecards/Search/Export?queryString=%s">Excel</a>
+</body></html>"""
+
+
+def _default_fixtures_dir() -> Path:
+    return Path(str(resources.files("biorange.data").joinpath("standin")))
+
+
+class StandInServer:
+    """本地替身 HTTP 服务。
+
+    Attributes:
+        fixtures_dir (Path): 录制响应所在目录。
+        latency (Union[float, Dict[str, float]]): 每个请求的附加延迟（秒），可按数据源配置。
+        error_rate (Union[float, Dict[str, float]]): 错误注入概率，可按数据源配置。
+        error_status (int): 注入错误时返回的状态码。
+        job_polls (int): UniProt 任务在完成前返回 RUNNING 的次数。
+        page_size (int): UniProt 结果分页大小的默认值。
+        request_counts (Dict[str, int]): 按数据源统计的请求次数。
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fixtures_dir: Optional[Union[str, Path]] = None,
+        latency: Union[float, Dict[str, float]] = 0.0,
+        error_rate: Union[float, Dict[str, float]] = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        job_polls: int = 1,
+        page_size: int = 5,
+    ):
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else _default_fixtures_dir()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.job_polls = job_polls
+        self.page_size = page_size
+        self.request_counts: Dict[str, int] = dict.fromkeys(SOURCES, 0)
+        self.jobs: Dict[str, dict] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._load_fixtures()
+
+        handler = type("StandInHandler", (_StandInHandler,), {"standin": self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_fixtures(self) -> None:
+        def load_json(name):
+            with open(self.fixtures_dir / name, "rt", encoding="utf-8") as f:
+                return json.load(f)
+
+        self.tcmsp_herbs = load_json("tcmsp_herbs.json")
+        self.chembl_predictions = load_json("chembl_target_predictions.json")
+        self.uniprot_entries = load_json("uniprot_idmapping.json")
+        self.pubchem_smiles = load_json("pubchem_smiles.json")
+        self.genecards_csv = (self.fixtures_dir / "genecards.csv").read_bytes()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def source_urls(self) -> Dict[str, str]:
+        """返回各数据源在替身服务上的基础地址，可直接用于 `configure_sources`。"""
+        return {source: f"{self.url}/{source}" for source in SOURCES}
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="standin-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Stand-in server listening on %s", self.url)
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _for_source(self, value, source: str) -> float:
+        if isinstance(value, dict):
+            return float(value.get(source, 0.0))
+        return float(value)
+
+    def before_response(self, source: str) -> bool:
+        """计数、施加延迟并决定是否注入错误。
+
+        Returns:
+            bool: True 表示应返回注入的错误。
+        """
+        with self._lock:
+            self.request_counts[source] = self.request_counts.get(source, 0) + 1
+            inject = self._random.random() < self._for_source(self.error_rate, source)
+        delay = self._for_source(self.latency, source)
+        if delay:
+            time.sleep(delay)
+        return inject
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    standin: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - 覆盖基类签名
+        logger.debug("stand-in %s", format % args)
+
+    # --- 响应工具 ---
+    def _send(self, status: int, body: bytes, content_type: str, headers=None):
+        if status == 200 and self.command == "GET":
+            # 录制的响应是静态的，用内容摘要作为 ETag 以支持条件请求
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            headers = {**(headers or {}), "ETag": etag}
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, payload, status: int = 200, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self._send(status, body, "application/json", headers)
+
+    def _html(self, html: str):
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _base(self) -> str:
+        return f"http://{self.headers.get('Host')}"
+
+    # --- 分发 ---
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split("/") if part]
+        body = self._body() if method == "POST" else b""
+        if not parts or parts[0] not in SOURCES:
+            self._json({"error": "unknown source"}, status=404)
+            return
+        source, rest = parts[0], parts[1:]
+        if self.standin.before_response(source):
+            self._json({"error": "injected"}, status=self.standin.error_status)
+            return
+        query = parse_qs(parsed.query)
+        handler = getattr(self, f"_{source}")
+        handler(method, rest, query, body)
+
+    # --- TCMSP ---
+    def _tcmsp(self, method, rest, query, body):
+        page = rest[0] if rest else ""
+        if page == "browse.php":
+            self._html(BROWSE_PAGE)
+        elif page == "tcmspsearch.php":
+            herb = query.get("qr", [""])[0]
+            rows = self.standin.tcmsp_herbs.get(herb, [])
+            self._html(HERB_PAGE % json.dumps(rows))
+        else:
+            self._json({"error": "not found"}, status=404)
+
+    # --- ChEMBL ---
+    def _chembl(self, method, rest, query, body):
+        if method != "POST" or rest != ["target-predictions"]:
+            self._json({"error": "not found"}, status=404)
+            return
+        smiles = json.loads(body or b"{}").get("smiles", "")
+        predictions = self.standin.chembl_predictions
+        self._json(predictions.get(smiles, predictions.get("*", [])))
+
+    # --- UniProt ID 映射 ---
+    def _uniprot(self, method, rest, query, body):
+        if method == "POST" and rest == ["idmapping", "run"]:
+            form = parse_qs(body.decode("utf-8"))
+            ids = [i for i in form.get("ids", [""])[0].split(",") if i]
+            job_id = uuid.uuid4().hex
+            with self.standin._lock:
+                self.standin.jobs[job_id] = {"ids": ids, "polls": 0}
+            self._json({"jobId": job_id})
+            return
+
+        if len(rest) < 3 or rest[0] != "idmapping":
+            self._json({"error": "not found"}, status=404)
+            return
+        job = self.standin.jobs.get(rest[-1])
+        if job is None:
+            self._json({"messages": ["Resource not found"]}, status=404)
+            return
+
+        results = [
+            {"from": i, "to": self.standin.uniprot_entries[i]}
+            for i in job["ids"]
+            if i in self.standin.uniprot_entries
+        ]
+        failed = [i for i in job["ids"] if i not in self.standin.uniprot_entries]
+
+        if rest[1] == "status":
+            with self.standin._lock:
+                job["polls"] += 1
+                running = job["polls"] <= self.standin.job_polls
+            if running:
+                self._json({"jobStatus": "RUNNING"})
+            else:
+                self._json({"results": results[: self.standin.page_size], "failedIds": failed})
+        elif rest[1] == "details":
+            redirect = (
+                f"{self._base()}/uniprot/idmapping/uniprotkb/results/{rest[-1]}"
+                f"?format=json&size={self.standin.page_size}"
+            )
+            self._json({"redirectURL": redirect})
+        elif rest[1] == "uniprotkb":
+            size = int(query.get("size", [self.standin.page_size])[0])
+            cursor = int(query.get("cursor", [0])[0])
+            page = {"results": results[cursor : cursor + size]}
+            if cursor == 0:
+                page["failedIds"] = failed
+            headers = {"x-total-results": str(len(results))}
+            if cursor + size < len(results):
+                next_url = (
+                    f"{self._base()}/uniprot/idmapping/uniprotkb/results/{rest[-1]}"
+                    f"?format=json&size={size}&cursor={cursor + size}"
+                )
+                headers["Link"] = f'<{next_url}>; rel="next"'
+            self._json(page, headers=headers)
+        else:
+            self._json({"error": "not found"}, status=404)
+
+    # --- PubChem ---
+    def _pubchem(self, method, rest, query, body):
+        # compound/inchikey/property/<props>/JSON 或 compound/inchikey/<key>/property/<props>/JSON
+        if rest[:2] != ["compound", "inchikey"] or "property" not in rest:
+            self._json({"Fault": {"Code": "PUGREST.BadRequest"}}, status=400)
+            return
+        if method == "POST":
+            form = parse_qs(body.decode("utf-8"))
+            keys = form.get("inchikey", [""])[0].split(",")
+        else:
+            keys = [rest[2]]
+        properties = [
+            {"CID": index, "InChIKey": key, "CanonicalSMILES": self.standin.pubchem_smiles[key]}
+            for index, key in enumerate(keys, 1)
+            if key in self.standin.pubchem_smiles
+        ]
+        if not properties:
+            self._json({"Fault": {"Code": "PUGREST.NotFound"}}, status=404)
+            return
+        self._json({"PropertyTable": {"Properties": properties}})
+
+    # --- GeneCards ---
+    def _genecards(self, method, rest, query, body):
+        query_string = query.get("queryString", [""])[0]
+        if rest == ["Search", "Keyword"]:
+            self._html(GENECARDS_PAGE % quote(query_string))
+        elif rest == ["Search", "Export"]:
+            self._send(
+                200,
+                self.standin.genecards_csv,
+                "text/csv",
+                {"Content-Disposition": 'attachment; filename="GeneCards-SearchResults.csv"'},
+            )
+        else:
+            self._json({"error": "not found"}, status=404)
@@ -0,0 +1,11 @@
+"""流程的可观测性：进程级指标（Prometheus 文本格式）与耗时区间（Chrome trace）。"""
+
+from biorange.core.telemetry.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    get_metrics_registry,
+    serve_metrics,
+)
+from biorange.core.telemetry.tracing import Tracer, get_tracer
@@ -0,0 +1,255 @@
+"""
+每次运行的性能清单（``performance.json``）及两次运行之间的对比。
+
+清单在运行结束时由指标登记表生成，进程池 worker 中更新的计数器和直方图已由调度器
+并入主进程的登记表。清单包括：
+
+- ``stages``：各流程步骤的耗时和产出项数；
+- ``analyzers``：各分析步骤按结果分类的项数（缓存命中/新计算/不完整）和逐项延迟；
+- ``sources``：各数据源按结果分类的查询次数、结果行数和查询延迟；
+- ``cache``：各缓存后端的命中、未命中次数和耗时；
+- ``http``：各主机按状态分类的请求数、重试次数和请求延迟；
+- ``breakers``：各数据源熔断器的状态、熔断次数和跳过的请求数，只包括主进程中的
+  熔断器（进程池 worker 中的熔断器各自独立，状态不会回到主进程）；
+- ``memory``：当前进程和子进程的 RSS 峰值。
+
+延迟分位数由直方图的桶插值估计，精度取决于桶的划分。
+
+函数:
+    peak_rss: 返回当前进程和子进程的 RSS 峰值。
+    build_manifest: 由指标登记表生成性能清单。
+    write_manifest: 写入性能清单。
+    load_manifest: 读取性能清单（可以传入结果目录）。
+    compare_manifests: 逐项对比两个性能清单。
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from biorange.core.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+MANIFEST_FILE = "performance.json"
+MANIFEST_VERSION = 1
+QUANTILES = (0.5, 0.9, 0.99)
+
+# 对比时按耗时处理的叶子字段
+_TIME_KEYS = {"elapsed", "seconds"} | {f"p{round(q * 100)}" for q in QUANTILES}
+
+
+def peak_rss() -> Dict[str, Optional[int]]:
+    """返回当前进程和已回收子进程的 RSS 峰值（字节），平台不支持时为 None。
+
+    峰值是整个进程生命周期内的最大值，同一进程中的多次运行看到的是同一个值。
+    """
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows 没有 resource 模块
+        return {"self": None, "children": None}
+    # Linux 上 ru_maxrss 以 KiB 为单位，macOS 上以字节为单位
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+    }
+
+
+def _samples(
+    snapshot: Dict[str, List[Dict[str, Any]]], name: str, suffix: str = ""
+) -> Iterator[Tuple[Dict[str, str], float]]:
+    for sample in snapshot.get(name, []):
+        if sample["sample"] == name + suffix:
+            yield sample["labels"], sample["value"]
+
+
+def _latency(
+    registry: MetricsRegistry,
+    snapshot: Dict[str, List[Dict[str, Any]]],
+    name: str,
+    key: str,
+) -> Dict[str, Dict[str, float]]:
+    """按标签 `key` 汇总直方图 `name` 的次数、总耗时和分位数。"""
+    histogram = registry.get(name)
+    totals = {labels[key]: value for labels, value in _samples(snapshot, name, "_sum")}
+    latency = {}
+    for labels, count in _samples(snapshot, name, "_count"):
+        entry = latency[labels[key]] = {
+            "count": count,
+            "seconds": round(totals.get(labels[key], 0.0), 6),
+        }
+        for q in QUANTILES:
+            entry[f"p{round(q * 100)}"] = round(histogram.quantile(q, **labels), 6)
+    return latency
+
+
+def build_manifest(
+    registry: Optional[MetricsRegistry] = None,
+    breakers: Iterable[dict] = (),
+    elapsed: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    由指标登记表生成性能清单。
+
+    Args:
+        registry (Optional[MetricsRegistry]): 指标登记表，默认为共享登记表。
+        breakers (Iterable[dict]): 熔断器状态快照（`CircuitBreakerRegistry.summary`）。
+        elapsed (Optional[float]): 整次运行的耗时（秒）。
+
+    Returns:
+        Dict[str, Any]: 可以直接写成 JSON 的清单。
+    """
+    registry = registry or get_metrics_registry()
+    snapshot = registry.snapshot()
+
+    stages: Dict[str, Dict[str, float]] = {}
+    for labels, value in _samples(snapshot, "biorange_pipeline_step_seconds"):
+        stages.setdefault(labels["step"], {})["seconds"] = round(value, 6)
+    for labels, value in _samples(snapshot, "biorange_pipeline_step_items", "_total"):
+        stages.setdefault(labels["step"], {})["items"] = value
+
+    analyzers: Dict[str, Dict[str, Any]] = {}
+    for labels, value in _samples(snapshot, "biorange_analyzer_items", "_total"):
+        analyzers.setdefault(labels["step"], {})[labels["outcome"]] = value
+    item_latency = _latency(
+        registry, snapshot, "biorange_analyzer_item_seconds", "step"
+    )
+    for step, latency in item_latency.items():
+        analyzers.setdefault(step, {})["latency"] = latency
+
+    sources: Dict[str, Dict[str, Any]] = {}
+    for labels, value in _samples(snapshot, "biorange_strategy_fetches", "_total"):
+        fetches = sources.setdefault(labels["source"], {}).setdefault("fetches", {})
+        fetches[labels["outcome"]] = value
+    for labels, value in _samples(snapshot, "biorange_strategy_rows", "_total"):
+        sources.setdefault(labels["source"], {})["rows"] = value
+    query_latency = _latency(
+        registry, snapshot, "biorange_strategy_query_seconds", "source"
+    )
+    for source, latency in query_latency.items():
+        sources.setdefault(source, {})["latency"] = latency
+
+    cache: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for labels, value in _samples(snapshot, "biorange_cache_requests", "_total"):
+        operation = cache.setdefault(labels["backend"], {}).setdefault(labels["op"], {})
+        operation[labels["result"]] = value
+    for labels, value in _samples(snapshot, "biorange_cache_seconds", "_sum"):
+        operation = cache.setdefault(labels["backend"], {}).setdefault(labels["op"], {})
+        operation["seconds"] = round(value, 6)
+    for operations in cache.values():
+        lookups = operations.get("get", {})
+        hits, misses = lookups.get("hit", 0), lookups.get("miss", 0)
+        if hits + misses:
+            lookups["hit_rate"] = round(hits / (hits + misses), 4)
+
+    http: Dict[str, Dict[str, Any]] = {}
+    for labels, value in _samples(snapshot, "biorange_http_requests", "_total"):
+        requests = http.setdefault(labels["host"], {}).setdefault("requests", {})
+        requests[labels["outcome"]] = value
+    for labels, value in _samples(snapshot, "biorange_http_retries", "_total"):
+        http.setdefault(labels["host"], {})["retries"] = value
+    request_latency = _latency(
+        registry, snapshot, "biorange_http_request_seconds", "host"
+    )
+    for host, latency in request_latency.items():
+        http.setdefault(host, {})["latency"] = latency
+
+    rss = peak_rss()
+    return {
+        "version": MANIFEST_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "elapsed": None if elapsed is None else round(elapsed, 6),
+        "stages": stages,
+        "analyzers": analyzers,
+        "sources": sources,
+        "cache": cache,
+        "http": http,
+        "breakers": {
+            breaker["source"]: {
+                "state": breaker["state"],
+                "trips": breaker["trips"],
+                "rejected": breaker["rejected"],
+            }
+            for breaker in breakers
+        },
+        "memory": {
+            "peak_rss": rss["self"],
+            "peak_rss_children": rss["children"],
+        },
+    }
+
+
+def write_manifest(path: Union[str, Path], manifest: Dict[str, Any]) -> None:
+    """把性能清单写入 JSON 文件。"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path: Union[str, Path]) -> Dict[str, Any]:
+    """读取性能清单，`path` 为目录时读取其中的 ``performance.json``。"""
+    path = Path(path)
+    if path.is_dir():
+        path = path / MANIFEST_FILE
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _flatten(value: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def _kind(metric: str) -> str:
+    if metric.startswith("memory."):
+        return "bytes"
+    if metric.rsplit(".", 1)[-1] in _TIME_KEYS:
+        return "time"
+    return "count"
+
+
+def compare_manifests(
+    before: Dict[str, Any], after: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    逐项对比两个性能清单中的数值。
+
+    Args:
+        before (Dict[str, Any]): 基准运行的清单。
+        after (Dict[str, Any]): 对比运行的清单。
+
+    Returns:
+        List[Dict[str, Any]]: 每个数值一行（``metric``、``kind``、``before``、
+        ``after``、``delta``、``ratio``），只在一侧出现的项另一侧为 None。
+        耗时行在前并按变化量的绝对值降序，其余按名称排序。
+    """
+    skipped = ("version",)
+    old = {k: v for k, v in _flatten(before) if k not in skipped}
+    new = {k: v for k, v in _flatten(after) if k not in skipped}
+    rows = []
+    for metric in sorted(old.keys() | new.keys()):
+        a, b = old.get(metric), new.get(metric)
+        rows.append(
+            {
+                "metric": metric,
+                "kind": _kind(metric),
+                "before": a,
+                "after": b,
+                "delta": (b or 0) - (a or 0),
+                "ratio": b / a if a and b is not None else None,
+            }
+        )
+    # 排序是稳定的，非耗时行保持名称顺序
+    rows.sort(
+        key=lambda row: (
+            row["kind"] != "time",
+            -abs(row["delta"]) if row["kind"] == "time" else 0,
+        )
+    )
+    return rows
@@ -0,0 +1,490 @@
+"""
+进程内的指标登记表及 Prometheus 文本格式导出。
+
+指标按名称登记一次，之后按标签取值更新，更新只在指标自身的锁内做一次字典
+操作，可以放在逐项调用的热点路径上。只依赖标准库，不需要 prometheus_client。
+
+进程池 worker 中更新的指标不会自动回到主进程：worker 用 `collect` 取出数值，
+主进程用 `merge` 并入自己的登记表。计数器和直方图累加；仪表是某一时刻的状态，
+按标签以 worker 报告的值覆盖（后写入者生效）。
+
+类:
+    Counter: 只增不减的计数器。
+    Gauge: 可增可减的数值，也可以在导出时从回调取值。
+    Histogram: 按桶统计的分布（耗时等）。
+    MetricsRegistry: 指标登记表。
+
+函数:
+    get_metrics_registry: 返回进程级共享的指标登记表。
+    serve_metrics: 在后台线程中提供 /metrics 端点。
+"""
+
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+_Labels = Tuple[str, ...]
+
+# 覆盖毫秒级缓存命中到分钟级远程查询
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """指标基类：名称、说明、标签名以及按标签值保存的数据。"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[_Labels, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> _Labels:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"Missing label {e} for metric {self.name}") from e
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, _Labels, float]]:
+        """返回 (样本名, 标签值, 数值) 列表。"""
+
+    @abstractmethod
+    def state(self) -> Dict[_Labels, object]:
+        """返回可以 pickle 的数值副本，供另一个进程 `merge`。"""
+
+    @abstractmethod
+    def merge(self, state: Dict[_Labels, object]) -> None:
+        """把另一个进程中同名指标的数值并入。"""
+
+    def expose(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for sample, labels, value in self.samples():
+            names = self.labelnames
+            if sample.endswith("_bucket"):
+                names = names + ("le",)
+            lines.append(
+                f"{sample}{_format_labels(names, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """只增不减的计数器。"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, _Labels, float]]:
+        with self._lock:
+            return [(f"{self.name}_total", k, v) for k, v in self._values.items()]
+
+    def state(self) -> Dict[_Labels, object]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, state: Dict[_Labels, object]) -> None:
+        with self._lock:
+            for key, value in state.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+
+class Gauge(_Metric):
+    """可增可减的数值。
+
+    设置了回调（`set_function`）时，导出时调用回调取值，回调返回
+    ``{标签值元组: 数值}``，用于队列深度等现成的状态。
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[_Labels, float]]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], Dict[_Labels, float]]) -> None:
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        if self._function is not None:
+            return self._function().get(key, 0)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> List[Tuple[str, _Labels, float]]:
+        if self._function is not None:
+            values = dict(self._function())
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [(self.name, k, v) for k, v in values.items()]
+
+    def state(self) -> Dict[_Labels, object]:
+        if self._function is not None:
+            return dict(self._function())
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, state: Dict[_Labels, object]) -> None:
+        """按标签以另一个进程的值覆盖（后写入者生效）。
+
+        仪表表示某一时刻的状态，两个进程的值相加没有意义。设置了回调的仪表
+        导出时只读回调，合并的值不会出现在导出中。
+        """
+        with self._lock:
+            self._values.update(state)
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """按桶统计的分布，桶为累计上界（最后隐含 +Inf）。"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = _HistogramValue(len(self.buckets))
+            data.counts[index] += 1
+            data.sum += value
+            data.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """记录代码块的耗时（秒）。"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **labels: str) -> Dict[str, float]:
+        """返回某组标签的 count 和 sum。"""
+        with self._lock:
+            data = self._values.get(self._key(labels))
+            if data is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": data.count, "sum": data.sum}
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """按桶估计分位数（与 PromQL 的 histogram_quantile 相同的线性插值）。
+
+        落在 +Inf 桶中的分位数取最大的有限上界；没有样本时返回 0。
+        """
+        with self._lock:
+            data = self._values.get(self._key(labels))
+            if data is None or not data.count:
+                return 0.0
+            counts = list(data.counts)
+            total = data.count
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return lower
+
+    def samples(self) -> List[Tuple[str, _Labels, float]]:
+        samples = []
+        with self._lock:
+            for key, data in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, data.counts):
+                    cumulative += count
+                    le = _format_value(bound)
+                    samples.append((f"{self.name}_bucket", key + (le,), cumulative))
+                samples.append((f"{self.name}_sum", key, data.sum))
+                samples.append((f"{self.name}_count", key, data.count))
+        return samples
+
+    def state(self) -> Dict[_Labels, object]:
+        with self._lock:
+            return {
+                key: (list(data.counts), data.sum, data.count)
+                for key, data in self._values.items()
+            }
+
+    def merge(self, state: Dict[_Labels, object]) -> None:
+        with self._lock:
+            for key, (counts, total, count) in state.items():
+                data = self._values.get(key)
+                if data is None:
+                    data = self._values[key] = _HistogramValue(len(self.buckets))
+                data.counts = [a + b for a, b in zip(data.counts, counts)]
+                data.sum += total
+                data.count += count
+
+
+class MetricsRegistry:
+    """指标登记表。
+
+    同名指标只登记一次，重复登记返回已有的指标，类型或标签不一致时报错。
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, documentation, labelnames, **kwargs
+                )
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered differently")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """清空所有指标的数值（登记和回调保留），用于每次运行开始时。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def collect(self) -> Dict[str, Dict[str, object]]:
+        """返回所有指标的定义和数值（可以 pickle），供主进程 `merge`。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        collected = {}
+        for metric in metrics:
+            extra = {}
+            if isinstance(metric, Histogram):
+                extra = {"buckets": metric.buckets[:-1]}
+            collected[metric.name] = {
+                "kind": metric.kind,
+                "documentation": metric.documentation,
+                "labelnames": metric.labelnames,
+                "state": metric.state(),
+                **extra,
+            }
+        return collected
+
+    def merge(self, collected: Dict[str, Dict[str, object]]) -> None:
+        """把另一个进程 `collect` 的数值并入本登记表，没有登记的指标先登记。"""
+        for name, entry in collected.items():
+            if not entry["state"]:
+                continue
+            args = (name, entry["documentation"], entry["labelnames"])
+            if entry["kind"] == Counter.kind:
+                metric = self.counter(*args)
+            elif entry["kind"] == Gauge.kind:
+                metric = self.gauge(*args)
+            else:
+                metric = self.histogram(*args, buckets=entry["buckets"])
+            metric.merge(entry["state"])
+
+    def snapshot(self) -> Dict[str, List[Dict[str, object]]]:
+        """按指标名返回所有样本，便于写入 JSON 报告。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = {}
+        for metric in metrics:
+            snapshot[metric.name] = [
+                {
+                    "sample": sample,
+                    "labels": dict(zip(metric.labelnames, labels)),
+                    "value": value,
+                }
+                for sample, labels, value in metric.samples()
+                if not sample.endswith("_bucket")
+            ]
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """以 Prometheus 文本格式（0.0.4）导出所有指标。"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """把指标写入文本文件（可供 node_exporter 的 textfile collector 读取）。"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """返回进程级共享的指标登记表。"""
+    return _registry
+
+
+def serve_metrics(
+    port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None
+) -> "ThreadingHTTPServer":
+    """在后台线程中提供 Prometheus 抓取端点（``/metrics``）。
+
+    Args:
+        port (int): 监听端口，为 0 时由系统分配。
+        host (str): 监听地址。
+        registry (Optional[MetricsRegistry]): 指标登记表，默认为共享登记表。
+
+    Returns:
+        ThreadingHTTPServer: 已启动的服务，用完后调用 `shutdown`。
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or get_metrics_registry()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # 抓取请求不写日志
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="biorange-metrics", daemon=True
+    ).start()
+    return server
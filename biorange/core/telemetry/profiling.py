@@ -0,0 +1,201 @@
+"""
+在采样分析器和 tracemalloc 下运行一段代码，并把结果写成可附在性能问题上的文件。
+
+- ``profile.collapsed``：折叠调用栈（每行 ``帧;帧;... 次数``），可以直接交给
+  flamegraph.pl、speedscope 或 https://www.speedscope.app 生成火焰图。
+  采样在后台线程中通过 `sys._current_frames` 进行，覆盖所有线程（流程节点、
+  调度器工作线程等），不需要额外依赖。
+- ``allocations.txt``：tracemalloc 按分配位置统计的前 N 项，以及峰值内存。
+- ``stages.json``：按流程步骤和数据源汇总的耗时（来自 `Tracer` 记录的区间）。
+  分析期间区间记录强制开启并被固定，被分析的运行即使配置了
+  ``telemetry.trace: false`` 也不会关闭或清空它。
+
+类:
+    SamplingProfiler: 定时对所有线程的调用栈采样。
+
+函数:
+    profile_call: 在分析器下运行函数并写出报告。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from biorange.core.telemetry.tracing import Tracer, get_tracer
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    # 库内文件显示包内路径，其余只显示文件名，火焰图中更易读
+    marker = f"{os.sep}biorange{os.sep}"
+    if marker in filename:
+        filename = "biorange" + os.sep + filename.split(marker, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """定时对所有线程的调用栈采样。
+
+    Attributes:
+        interval (float): 采样间隔（秒）。
+        samples (int): 已采样的次数。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="biorange-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> Dict[str, int]:
+        """返回折叠调用栈（根在前，以分号分隔）到采样次数的映射。"""
+        return dict(self._stacks)
+
+    def write_collapsed(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def write_allocation_report(
+    snapshot: tracemalloc.Snapshot, peak: int, path: Path, top: int = 25
+) -> None:
+    """写出 tracemalloc 快照中按分配位置统计的前 `top` 项。"""
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+    )
+    stats = snapshot.statistics("traceback")
+    total = sum(stat.size for stat in stats)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 2**20:.1f} MiB\n")
+        f.write(f"Live at end: {total / 2**20:.1f} MiB in {len(stats)} sites\n\n")
+        for index, stat in enumerate(stats[:top], 1):
+            f.write(
+                f"#{index}: {stat.size / 2**10:.1f} KiB in {stat.count} blocks\n"
+            )
+            for line in stat.traceback.format(most_recent_first=True):
+                f.write(f"    {line}\n")
+            f.write("\n")
+
+
+def stage_summary(tracer: Tracer) -> List[Dict[str, Any]]:
+    """按 (类别, 名称) 汇总区间：次数、总耗时和最长耗时（秒），按总耗时降序。"""
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for event in tracer.events():
+        if event.get("ph") != "X":
+            continue
+        key = (event["cat"], event["name"])
+        duration = event["dur"] / 1e6
+        entry = totals.setdefault(
+            key,
+            {"cat": key[0], "name": key[1], "count": 0, "total": 0.0, "max": 0.0},
+        )
+        entry["count"] += 1
+        entry["total"] += duration
+        entry["max"] = max(entry["max"], duration)
+    return sorted(totals.values(), key=lambda entry: entry["total"], reverse=True)
+
+
+def profile_call(
+    fn: Callable[[], Any],
+    output_dir: Path,
+    interval: float = 0.005,
+    top: int = 25,
+    frames: int = 10,
+) -> Dict[str, Any]:
+    """在采样分析器和 tracemalloc 下运行 `fn`，把报告写入 `output_dir`。
+
+    `fn` 抛出异常时报告照常写出，异常随后重新抛出。
+
+    Args:
+        fn (Callable[[], Any]): 被分析的函数。
+        output_dir (Path): 报告目录。
+        interval (float): 采样间隔（秒）。
+        top (int): 内存报告中的分配位置数。
+        frames (int): tracemalloc 为每次分配记录的调用栈深度。
+
+    Returns:
+        Dict[str, Any]: 运行摘要：耗时、采样次数、峰值内存和各报告的路径。
+    """
+    output_dir = Path(output_dir)
+    tracer = get_tracer()
+    was_enabled, was_pinned = tracer.enabled, tracer.pinned
+    tracer.enabled = True
+    tracer.reset()
+    tracer.pinned = True
+    profiler = SamplingProfiler(interval)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        fn()
+    finally:
+        profiler.stop()
+        tracer.enabled, tracer.pinned = was_enabled, was_pinned
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "profile": output_dir / "profile.collapsed",
+            "allocations": output_dir / "allocations.txt",
+            "stages": output_dir / "stages.json",
+        }
+        profiler.write_collapsed(paths["profile"])
+        write_allocation_report(snapshot, peak, paths["allocations"], top)
+        summary = {
+            "elapsed": elapsed,
+            "samples": profiler.samples,
+            "peak_memory": peak,
+            "stages": stage_summary(tracer),
+        }
+        with open(paths["stages"], "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        summary["paths"] = {name: str(path) for name, path in paths.items()}
+    return summary
@@ -0,0 +1,201 @@
+"""
+记录耗时区间并导出为 Chrome trace JSON。
+
+导出的文件可以直接在 ``chrome://tracing`` 或 https://ui.perfetto.dev 中打开，
+按线程查看每个流程节点、策略查询的起止时间。跨线程的区间（例如一个输入项从
+提交到全部策略完成）记为异步事件，显示在单独的轨道上。
+
+事件数达到 `max_events` 后不再记录新事件，只计数，避免大规模运行时内存无限增长。
+
+进程池 worker 中记录的事件用 `export` 取出，主进程用 `merge` 按两个进程的
+时间原点对齐后并入，在 trace 中显示为单独的进程。
+
+类:
+    Tracer: 区间记录器。
+
+函数:
+    get_tracer: 返回进程级共享的区间记录器。
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class Tracer:
+    """区间记录器。
+
+    Attributes:
+        enabled (bool): 是否记录事件，关闭后 `span` 只剩一次属性判断的开销。
+        max_events (int): 最多保留的事件数。
+        dropped (int): 超出上限而未记录的事件数。
+        pinned (bool): 为 True 时 `configure` 不生效，由外层（例如
+            `profile_call`）决定是否记录，内层的一次运行不会关闭或清空记录。
+    """
+
+    def __init__(self, enabled: bool = True, max_events: int = 500_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.dropped = 0
+        self.pinned = False
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[Tuple[int, int], str] = {}
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter()
+        self._origin_time = time.time()
+        self._lock = threading.Lock()
+
+    def _us(self, seconds: float) -> float:
+        return round((seconds - self._origin) * 1e6, 1)
+
+    def _append(self, *events: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        with self._lock:
+            if len(self._events) + len(events) > self.max_events:
+                self.dropped += len(events)
+                return
+            self._threads.setdefault((os.getpid(), thread.ident), thread.name)
+            self._events.extend(events)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "", **args: Any) -> Iterator[None]:
+        """记录代码块在当前线程上的耗时区间。"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, start, time.perf_counter(), **args)
+
+    def complete(
+        self, name: str, cat: str, start: float, end: float, **args: Any
+    ) -> None:
+        """记录当前线程上已经结束的区间（`time.perf_counter` 时间）。"""
+        if not self.enabled:
+            return
+        self._append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def async_span(
+        self, name: str, cat: str, start: float, end: float, **args: Any
+    ) -> None:
+        """记录跨线程的区间（开始和结束不在同一个线程上）。"""
+        if not self.enabled:
+            return
+        event_id = next(self._ids)
+        common = {"name": name, "cat": cat, "id": event_id, "pid": os.getpid()}
+        self._append(
+            {**common, "ph": "b", "ts": self._us(start), "args": args},
+            {**common, "ph": "e", "ts": self._us(end)},
+        )
+
+    def events(self, cat: Optional[str] = None) -> List[Dict[str, Any]]:
+        """返回已记录的事件（可按类别筛选）。"""
+        with self._lock:
+            return [e for e in self._events if cat is None or e["cat"] == cat]
+
+    def configure(self, enabled: bool, max_events: int) -> None:
+        """按一次运行的配置开关记录并清空已有事件（`pinned` 时不做修改）。"""
+        if self.pinned:
+            return
+        self.enabled = enabled
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self.dropped = 0
+            self._origin = time.perf_counter()
+            self._origin_time = time.time()
+
+    def export(self) -> Dict[str, Any]:
+        """返回已记录的事件、线程名和时间原点（可以 pickle），供主进程 `merge`。"""
+        with self._lock:
+            return {
+                "events": list(self._events),
+                "threads": dict(self._threads),
+                "dropped": self.dropped,
+                "origin_time": self._origin_time,
+            }
+
+    def merge(self, exported: Dict[str, Any]) -> None:
+        """并入另一个进程 `export` 的事件，时间戳按两个时间原点的差平移。"""
+        if not self.enabled:
+            return
+        shift = round((exported["origin_time"] - self._origin_time) * 1e6, 1)
+        events = [
+            {**event, "ts": round(event["ts"] + shift, 1)}
+            for event in exported["events"]
+        ]
+        with self._lock:
+            self.dropped += exported["dropped"]
+            room = max(self.max_events - len(self._events), 0)
+            self.dropped += max(len(events) - room, 0)
+            self._events.extend(events[:room])
+            for key, name in exported["threads"].items():
+                self._threads.setdefault(key, name)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """返回 Chrome trace 格式（JSON Object Format）的数据。"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+        pids = dict.fromkeys([pid] + [key[0] for key in threads])
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": p,
+                "args": {"name": "biorange" if p == pid else f"biorange worker {p}"},
+            }
+            for p in pids
+        ] + [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": p,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for (p, tid), name in threads.items()
+        ]
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped},
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        """把事件写入 Chrome trace JSON 文件。"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """返回进程级共享的区间记录器。"""
+    return _tracer
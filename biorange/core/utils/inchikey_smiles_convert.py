@@ -1,10 +1,29 @@
+import glob
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sqlite3
+import threading
+import warnings
 from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
 import pandas as pd
 import requests
 
+from biorange.core.logger import get_logger
+from biorange.core.network import get_http_client, get_source_url
+
+logger = get_logger(__name__)
+
+# PubChem 新版接口用 SMILES/ConnectivitySMILES 替代了 CanonicalSMILES
+SMILES_PROPERTIES = ("CanonicalSMILES", "ConnectivitySMILES", "SMILES")
+
+
+def _extract_smiles(properties: dict) -> Optional[str]:
+    for key in SMILES_PROPERTIES:
+        if properties.get(key):
+            return properties[key]
+    return None
+
 
 # 缓存请求结果以提高效率
 @lru_cache(maxsize=10000)
@@ -16,52 +35,208 @@ def inchikey_to_smiles(inchikey):
     Returns:
         str or None: 如果成功，返回对应的SMILES字符串；如果失败，返回None。
     """
-    url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/inchikey/{inchikey}/property/CanonicalSMILES/JSON"
-    response = requests.get(url)
+    base_url = get_source_url("pubchem")
+    url = f"{base_url}/compound/inchikey/{inchikey}/property/CanonicalSMILES/JSON"
+    response = get_http_client().get(url)
     if response.status_code == 200:
         data = response.json()
         try:
-            return data["PropertyTable"]["Properties"][0]["CanonicalSMILES"]
+            return _extract_smiles(data["PropertyTable"]["Properties"][0])
         except (KeyError, IndexError):
             return None
     else:
         return None
 
 
-def process_row(row):
-    if pd.isna(row["smiles"]) or row["smiles"] == "":
-        row["smiles"] = inchikey_to_smiles(row["inchikey"])
-    return row
+class SmilesStore:
+    """InChIKey → SMILES 的持久化映射（SQLite）。
 
+    查询过但 PubChem 没有结果的 InChIKey 以 NULL 保存，避免重复查询。
 
-def process_csv(input_file: str, output_file: str, max_workers: int = None):
-    if max_workers is None:
-        max_workers = os.cpu_count() * 2  # 根据系统 CPU 核心数设置默认线程数
+    Attributes:
+        path (str): SQLite 数据库文件路径。
+    """
 
-    # 读取输入文件
-    df = pd.read_csv(input_file)
+    def __init__(self, path: str = "./.cache/pubchem_smiles.sqlite"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS smiles (inchikey TEXT PRIMARY KEY, smiles TEXT)"
+        )
+        self._lock = threading.Lock()
 
-    # 使用并行处理来补全缺失的 SMILES
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(process_row, row): index for index, row in df.iterrows()
-        }
+    def get_many(self, inchikeys: List[str]) -> Dict[str, Optional[str]]:
+        """返回已保存的映射，未查询过的 InChIKey 不在结果中。"""
+        found: Dict[str, Optional[str]] = {}
+        with self._lock:
+            # SQLite 单条语句的参数个数有限，分批查询
+            for start in range(0, len(inchikeys), 500):
+                chunk = inchikeys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT inchikey, smiles FROM smiles WHERE inchikey IN ({placeholders})",
+                    chunk,
+                )
+                found.update(rows)
+        return found
 
-        for future in as_completed(futures):
-            index = futures[future]
-            try:
-                # 更新数据框中的行
-                df.iloc[index] = future.result()
-            except Exception as e:
-                print(f"Error processing row at index {index}: {e}")
+    def put_many(self, mapping: Dict[str, Optional[str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO smiles (inchikey, smiles) VALUES (?, ?)",
+                mapping.items(),
+            )
 
-    # 保存处理后的数据到输出文件
-    df.to_csv(output_file, index=False, encoding="utf-8")
+    def close(self) -> None:
+        self._conn.close()
 
 
-import glob
+class PubChemSmilesResolver:
+    """批量将 InChIKey 解析为 SMILES。
 
-import pandas as pd
+    InChIKey 按 `chunk_size` 分块 POST 到 PubChem，请求经过共享 HTTP 客户端，
+    受 pubchem 主机的限流约束；结果写入持久化的 `SmilesStore`。
+
+    Attributes:
+        store (SmilesStore): 持久化映射。
+        chunk_size (int): 每次 POST 的 InChIKey 数量。
+        base_url (str): PubChem PUG REST 地址，默认读取数据源配置。
+    """
+
+    def __init__(
+        self,
+        store: Optional[SmilesStore] = None,
+        chunk_size: int = 200,
+        base_url: Optional[str] = None,
+    ):
+        self.store = store or SmilesStore()
+        self.chunk_size = chunk_size
+        self.base_url = base_url or get_source_url("pubchem")
+        self.client = get_http_client()
+
+    def _fetch_chunk(self, inchikeys: List[str]) -> Optional[Dict[str, Optional[str]]]:
+        """查询一批 InChIKey，请求失败时返回 None（不写入持久化映射）。
+
+        PubChem 对含有格式错误的 InChIKey 的整批请求返回 400，此时把这一批
+        二分后分别查询，单个 InChIKey 仍返回 400 时视为查不到。拆分后只有
+        部分请求失败时，返回成功部分的映射。
+        """
+        url = (
+            f"{self.base_url}/compound/inchikey/property/InChIKey,CanonicalSMILES/JSON"
+        )
+        try:
+            response = self.client.post(
+                url,
+                data={"inchikey": ",".join(inchikeys)},
+                timeout=120,
+            )
+        except requests.RequestException as e:
+            logger.error("PubChem batch of %d failed: %s", len(inchikeys), e)
+            return None
+        mapping: Dict[str, Optional[str]] = dict.fromkeys(inchikeys)
+        if response.status_code == 404:
+            # PubChem 在整批都找不到时返回 404
+            return mapping
+        if response.status_code == 400:
+            if len(inchikeys) == 1:
+                logger.warning("PubChem rejected InChIKey %s", inchikeys[0])
+                return mapping
+            middle = len(inchikeys) // 2
+            halves = [
+                self._fetch_chunk(inchikeys[:middle]),
+                self._fetch_chunk(inchikeys[middle:]),
+            ]
+            if all(half is None for half in halves):
+                return None
+            resolved: Dict[str, Optional[str]] = {}
+            for half in halves:
+                resolved.update(half or {})
+            return resolved
+        if response.status_code != 200:
+            logger.error(
+                "PubChem batch of %d failed with status %d",
+                len(inchikeys),
+                response.status_code,
+            )
+            return None
+        for properties in response.json().get("PropertyTable", {}).get("Properties", []):
+            inchikey = properties.get("InChIKey")
+            # 一个 InChIKey 可能对应多个 CID，保留第一个
+            if inchikey in mapping and mapping[inchikey] is None:
+                mapping[inchikey] = _extract_smiles(properties)
+        return mapping
+
+    def resolve(self, inchikeys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """解析 InChIKey，优先使用持久化映射。
+
+        Args:
+            inchikeys (Iterable[str]): 需要解析的 InChIKey。
+
+        Returns:
+            Dict[str, Optional[str]]: InChIKey 到 SMILES 的映射，PubChem 无结果时为 None。
+        """
+        unique = list(dict.fromkeys(key for key in inchikeys if isinstance(key, str)))
+        resolved = self.store.get_many(unique)
+        pending = [key for key in unique if key not in resolved]
+        logger.info(
+            "Resolving %d InChIKeys: %d cached, %d to query",
+            len(unique),
+            len(resolved),
+            len(pending),
+        )
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start : start + self.chunk_size]
+            mapping = self._fetch_chunk(chunk)
+            if mapping is None:
+                continue
+            self.store.put_many(mapping)
+            resolved.update(mapping)
+            logger.info("Resolved %d / %d", start + len(chunk), len(pending))
+        return resolved
+
+
+def fill_missing_smiles(
+    df: pd.DataFrame, resolver: Optional[PubChemSmilesResolver] = None
+) -> pd.DataFrame:
+    """用 PubChem 补全缺失的 SMILES，结果以一次列更新写回。
+
+    Args:
+        df (pd.DataFrame): 包含 `inchikey` 和 `smiles` 列的数据框。
+        resolver (Optional[PubChemSmilesResolver]): 解析器，默认新建。
+
+    Returns:
+        pd.DataFrame: 补全后的数据框（原地修改并返回）。
+    """
+    resolver = resolver or PubChemSmilesResolver()
+    missing = df["smiles"].isna() | (df["smiles"] == "")
+    mapping = resolver.resolve(df.loc[missing, "inchikey"])
+    df.loc[missing, "smiles"] = df.loc[missing, "inchikey"].map(mapping)
+    return df
+
+
+def process_csv(
+    input_file: str,
+    output_file: str,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 200,
+):
+    if max_workers is not None:
+        # 逐行并发查询已改为分块批量查询，并发由 pubchem 主机的限流器控制
+        warnings.warn(
+            "process_csv 的 max_workers 参数已弃用且不再生效，请改用 chunk_size",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    # 读取输入文件
+    df = pd.read_csv(input_file)
+
+    # 批量补全缺失的 SMILES
+    fill_missing_smiles(df, PubChemSmilesResolver(chunk_size=chunk_size))
+
+    # 保存处理后的数据到输出文件
+    df.to_csv(output_file, index=False, encoding="utf-8")
 
 
 def merge_csv_files(file_pattern: str, output_file: str):
@@ -83,6 +258,6 @@ def merge_csv_files(file_pattern: str, output_file: str):
 
 
 if __name__ == "__main__":
-    process_csv("data/TCMSP_mol.csv", "data/mol2.csv", max_workers=50)
+    process_csv("data/TCMSP_mol.csv", "data/mol2.csv")
 
     merge_csv_files("data/mol*.csv", "data/TCMSP_mol.csv")
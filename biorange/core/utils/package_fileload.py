@@ -36,7 +36,7 @@ def copy_config_if_not_exists(target_dir=".", filename="config.yaml"):
     """
     target_file = os.path.join(target_dir, filename)
     if not os.path.exists(target_file):
-        logger.warning(f"未找到 {filename}，新建默认配置config.yaml...")
+        logger.warning("未找到 %s，新建默认配置config.yaml...", filename)
         with resources.path("biorange.data", filename) as path:
             copyfile(path, target_file)
-            logger.info(f"{filename} 配置成功")
+            logger.info("%s 配置成功", filename)
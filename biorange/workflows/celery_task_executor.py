@@ -0,0 +1,249 @@
+"""
+基于 Celery 的分布式任务执行器。
+
+`CeleryTaskExecutor` 实现了 `TaskExecutor` 接口，分析器可以直接用它替换本地
+调度器：每个 (输入项, 策略) 任务被序列化后发送到 Celery worker 执行，worker
+把结果写入共享缓存（Redis 等），客户端在任务完成后从共享缓存取回结果。
+
+Celery 是可选依赖，只在创建执行器或 worker 应用时才导入。
+
+启动 worker（与客户端使用相同的 broker 和共享缓存）::
+
+    export BIORANGE_CELERY_BROKER=redis://redis-host:6379/0
+    export BIORANGE_CELERY_BACKEND=redis://redis-host:6379/1
+    export BIORANGE_CACHE_REDIS=redis://redis-host:6379/2
+    celery -A biorange.workflows.celery_task_executor:app worker -Q biorange
+
+测试时可以使用 eager 模式（任务在提交时同步执行），或 ``memory://`` broker
+加进程内 worker。
+
+类:
+    CeleryTaskExecutor: 基于 Celery 的任务执行器。
+"""
+
+import os
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from biorange.core.cache.cache_manager import (
+    CacheManager,
+    CacheManagerFactory,
+    GeneralCacheManager,
+)
+from biorange.core.logger import get_logger
+from biorange.workflows.executor import TaskExecutor
+
+logger = get_logger(__name__)
+
+TASK_NAME = "biorange.run_task"
+RESULT_KEY_PREFIX = "celery_result_"
+DEFAULT_QUEUE = "biorange"
+DEFAULT_BROKER = "redis://localhost:6379/0"
+DEFAULT_BACKEND = "redis://localhost:6379/1"
+
+
+def _import_celery():
+    try:
+        import celery
+    except ImportError as e:
+        raise ImportError(
+            "CeleryTaskExecutor 需要安装 celery：pip install 'celery[redis]'"
+        ) from e
+    return celery
+
+
+def cache_config_from_env() -> Dict[str, Any]:
+    """从环境变量读取 worker 使用的共享缓存配置。"""
+    url = os.environ.get("BIORANGE_CACHE_REDIS")
+    if not url:
+        return {"cache_type": "redis"}
+    parsed = urlparse(url)
+    return {
+        "cache_type": "redis",
+        "redis_config": {
+            "host": parsed.hostname or "localhost",
+            "port": parsed.port or 6379,
+            "db": int(parsed.path.lstrip("/") or 0),
+        },
+    }
+
+
+def get_app_cache(app) -> CacheManager:
+    """返回 Celery 应用使用的共享缓存，首次调用时按 `app.conf.biorange_cache` 创建。"""
+    cache = getattr(app, "biorange_cache", None)
+    if cache is None:
+        config = app.conf.get("biorange_cache") or {"cache_type": "memory"}
+        cache = GeneralCacheManager(CacheManagerFactory.create_cache_manager(**config))
+        app.biorange_cache = cache
+    return cache
+
+
+def _run_task(task, payload: bytes, result_key: str, result_ttl: int) -> str:
+    """worker 端：执行任务，把结果写入共享缓存，返回结果的键。"""
+    fn, args, kwargs = pickle.loads(payload)
+    result = fn(*args, **kwargs)
+    get_app_cache(task.app).save(result_key, {"value": result}, ttl=result_ttl)
+    return result_key
+
+
+def create_celery_app(
+    broker_url: str = DEFAULT_BROKER,
+    result_backend: str = DEFAULT_BACKEND,
+    eager: bool = False,
+    cache_config: Optional[Dict[str, Any]] = None,
+):
+    """创建注册了 biorange 任务的 Celery 应用。
+
+    Args:
+        broker_url (str): broker 地址，测试可用 ``memory://``。
+        result_backend (str): 结果后端地址，测试可用 ``cache+memory://``。
+        eager (bool): 是否在提交时同步执行任务。
+        cache_config (Optional[Dict[str, Any]]): 共享缓存配置，传给
+            `CacheManagerFactory.create_cache_manager`。
+
+    Returns:
+        celery.Celery: Celery 应用。
+    """
+    celery = _import_celery()
+    app = celery.Celery("biorange", broker=broker_url, backend=result_backend)
+    app.conf.update(
+        task_serializer="pickle",
+        result_serializer="json",
+        accept_content=["pickle", "json"],
+        task_default_queue=DEFAULT_QUEUE,
+        task_always_eager=eager,
+        task_eager_propagates=True,
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        biorange_cache=cache_config,
+    )
+    app.task(name=TASK_NAME, bind=True)(_run_task)
+    return app
+
+
+class CeleryTaskExecutor(TaskExecutor):
+    """基于 Celery 的任务执行器。
+
+    Attributes:
+        app (celery.Celery): Celery 应用。
+        cache (CacheManager): 取回结果的共享缓存。
+        queues (Dict[str, str]): 数据源到队列的路由，未配置的数据源进入默认队列，
+            可以让不同的 worker 只服务部分数据源（如装有浏览器的节点服务 TCMSP）。
+    """
+
+    def __init__(
+        self,
+        app=None,
+        cache_manager: Optional[CacheManager] = None,
+        broker_url: Optional[str] = None,
+        result_backend: Optional[str] = None,
+        eager: bool = False,
+        queues: Optional[Dict[str, str]] = None,
+        poll_interval: float = 0.2,
+        result_ttl: int = 24 * 3600,
+    ):
+        self.app = app or create_celery_app(
+            broker_url or os.environ.get("BIORANGE_CELERY_BROKER", DEFAULT_BROKER),
+            result_backend
+            or os.environ.get("BIORANGE_CELERY_BACKEND", DEFAULT_BACKEND),
+            eager=eager,
+            cache_config=cache_config_from_env(),
+        )
+        if cache_manager is not None:
+            self.app.biorange_cache = cache_manager
+        self.cache = get_app_cache(self.app)
+        self.queues = dict(queues or {})
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self._pending: List[Tuple[Any, Future, str]] = []
+        self._lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def submit(self, source: str, fn: Callable, *args, **kwargs) -> Future:
+        """把任务发送到 Celery worker。
+
+        `fn` 和参数会被 pickle，worker 端必须能导入它们所在的模块。
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        key = f"{RESULT_KEY_PREFIX}{uuid.uuid4().hex}"
+        try:
+            payload = pickle.dumps((fn, args, kwargs))
+            async_result = self.app.tasks[TASK_NAME].apply_async(
+                (payload, key, self.result_ttl),
+                queue=self.queues.get(source, DEFAULT_QUEUE),
+            )
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        if async_result.ready():  # eager 模式下任务已经执行完
+            self._complete(async_result, future, key)
+        else:
+            with self._lock:
+                self._pending.append((async_result, future, key))
+                self._ensure_poller()
+        return future
+
+    def _complete(self, async_result, future: Future, key: str) -> None:
+        try:
+            async_result.get(disable_sync_subtasks=False)
+            entry = self.cache.get(key)
+            if entry is None:
+                raise RuntimeError(f"Result {key} not found in the shared cache")
+            self.cache.delete(key)
+            future.set_result(entry["value"])
+        except Exception as e:
+            future.set_exception(e)
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None:
+            self._poller = threading.Thread(
+                target=self._poll, name="biorange-celery", daemon=True
+            )
+            self._poller.start()
+
+    def _poll(self) -> None:
+        # 一个线程轮询所有未完成的任务，不为每个任务占用一个线程；查询状态时
+        # 不持有锁，提交新任务不必等这一轮轮询结束
+        while not self._stopped.is_set():
+            with self._lock:
+                pending, self._pending = self._pending, []
+            waiting = []
+            for entry in pending:
+                if entry[0].ready():
+                    self._complete(*entry)
+                else:
+                    waiting.append(entry)
+            with self._lock:
+                self._pending = waiting + self._pending
+            time.sleep(self.poll_interval)
+
+    def execute(self, task, *args, **kwargs) -> str:
+        """提交一个已注册的 Celery 任务，返回任务 ID。"""
+        return task.apply_async(args=args, kwargs=kwargs).id
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stopped.set()
+        if wait and self._poller is not None:
+            self._poller.join()
+        self._poller = None
+
+
+def __getattr__(name: str):
+    # worker 入口：celery -A biorange.workflows.celery_task_executor:app worker
+    if name == "app":
+        app = create_celery_app(
+            os.environ.get("BIORANGE_CELERY_BROKER", DEFAULT_BROKER),
+            os.environ.get("BIORANGE_CELERY_BACKEND", DEFAULT_BACKEND),
+            cache_config=cache_config_from_env(),
+        )
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
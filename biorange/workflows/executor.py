@@ -0,0 +1,86 @@
+"""
+任务执行器抽象。
+
+分析器只通过 `TaskExecutor` 的接口提交任务，具体在哪里执行由实现决定：
+
+- 本地：`biorange.workflows.network_pharmacology.scheduler.TaskScheduler`，
+  I/O 型任务使用线程池，计算密集型任务分批使用进程池；
+- 分布式：`biorange.workflows.celery_task_executor.CeleryTaskExecutor`，
+  任务发送到 Celery worker，结果通过共享缓存取回。
+
+类:
+    TaskExecutor: 任务执行器的抽象基类。
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class TaskExecutor(ABC):
+    """任务执行器的抽象基类。"""
+
+    @abstractmethod
+    def submit(self, source: str, fn: Callable, *args, **kwargs) -> Future:
+        """提交任务。
+
+        Args:
+            source (str): 任务所属的数据源，用于限流和路由。
+            fn (Callable): 要执行的函数。
+            *args: 位置参数。
+            **kwargs: 关键字参数。
+
+        Returns:
+            Future: 任务的 Future，结果或异常与 `fn` 一致。
+        """
+
+    def submit_timed(
+        self,
+        source: str,
+        on_start: Optional[Callable[[], None]],
+        fn: Callable,
+        *args,
+        **kwargs,
+    ) -> Future:
+        """提交任务，并在任务开始运行时于提交方的进程中调用 `on_start`。
+
+        截止时间由提交方从 `on_start` 开始计时，`fn` 和参数原样交给执行器，
+        不会被包装成不可 pickle 的闭包。默认实现无法得知任务何时开始运行，
+        在提交时调用 `on_start`，排队时间也计入截止时间。
+
+        Args:
+            source (str): 任务所属的数据源。
+            on_start (Optional[Callable[[], None]]): 任务开始运行时的回调。
+            fn (Callable): 要执行的函数。
+            *args: 位置参数。
+            **kwargs: 关键字参数。
+
+        Returns:
+            Future: 任务的 Future。
+        """
+        if on_start is not None:
+            on_start()
+        return self.submit(source, fn, *args, **kwargs)
+
+    def submit_batched(
+        self, source: str, fn: Callable[[Sequence[Any]], List[Any]], item: Any
+    ) -> Future:
+        """提交计算密集型任务，默认逐个调用批处理函数。"""
+        future: Future = Future()
+        inner = self.submit(source, fn, [item])
+
+        def unwrap(done: Future) -> None:
+            exception = done.exception()
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(done.result()[0])
+
+        inner.add_done_callback(unwrap)
+        return future
+
+    def flush(self) -> None:
+        """提交所有缓冲中的任务，默认没有缓冲。"""
+
+    def shutdown(self, wait: bool = True) -> None:
+        """释放执行器占用的资源。"""
@@ -1,7 +1,4 @@
-# 定义结果目录
+# 定义结果目录，由写出结果的步骤按需创建
 from pathlib import Path
 
 results_dir = Path("results")
-
-# 确保结果目录存在
-results_dir.mkdir(parents=True, exist_ok=True)
@@ -5,33 +5,128 @@
 数据处理流程，并定义了钩子方法供子类覆盖以添加额外的处理逻辑。
 
 类:
+    FetchResult: 一次策略调用的结果及其来源。
     BaseDataFetcher: 数据获取策略的抽象基类。
     DrugComponentFinder: 查找药物成分的具体实现类。
     ComponentTargetPredictor: 预测成分靶点的具体实现类。
     DiseaseTargetFinder: 查找疾病靶点的具体实现类。
 """
 
+import hashlib
+import inspect
+import threading
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
 from biorange.core.logger import get_logger
+from biorange.core.network import CircuitOpenError, get_circuit_breaker_registry
+from biorange.core.telemetry import get_metrics_registry, get_tracer
+from biorange.workflows.network_pharmacology.schema import (
+    COMPONENTS,
+    DISEASE_TARGETS,
+    TARGETS,
+    StepSchema,
+)
+from biorange.workflows.network_pharmacology.store import (
+    get_intermediate_store,
+    make_key,
+)
 
 RESUILTS_DIR = "./results"
 
+# 没有拿到数据源结果的调用来源：结果为空，不能当作该项已完成
+FAILED_OUTCOMES = frozenset({"breaker_open", "error"})
+
+_metrics = get_metrics_registry()
+_FETCHES = _metrics.counter(
+    "biorange_strategy_fetches",
+    "Strategy fetch calls by source and outcome",
+    ("source", "outcome"),
+)
+_ROWS = _metrics.counter(
+    "biorange_strategy_rows", "Rows produced by strategies", ("source",)
+)
+_QUERY_SECONDS = _metrics.histogram(
+    "biorange_strategy_query_seconds",
+    "Strategy query and normalization time in seconds",
+    ("source",),
+)
+
+
+_identity_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _class_identity(cls: type) -> str:
+    digest = hashlib.sha256()
+    # inspect.getsource 会解析整个模块的 AST，CPython 3.11 中多个线程同时解析
+    # 可能抛出 SystemError，首次计算时串行进行
+    with _identity_lock:
+        for klass in cls.__mro__:
+            if klass.__module__ == "builtins" or klass is ABC:
+                continue
+            try:
+                digest.update(inspect.getsource(klass).encode("utf-8"))
+            except (OSError, TypeError):  # 动态创建或没有源码的类
+                digest.update(klass.__qualname__.encode("utf-8"))
+    return f"{cls.__module__}.{cls.__qualname__}:{digest.hexdigest()[:16]}"
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """一次策略调用的结果及其来源。
+
+    Attributes:
+        data (pd.DataFrame): 规范化后的结果，失败时为空结果。
+        outcome (str): 结果来源：store（中间结果存储）、query（查询）、
+            breaker_open（数据源熔断）、error（查询失败）或 deadline（超过硬截止）。
+        error (Optional[str]): 失败原因。
+    """
+
+    data: pd.DataFrame
+    outcome: str
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        """数据源是否没有给出结果（熔断或查询失败）。"""
+        return self.outcome in FAILED_OUTCOMES
+
 
 class BaseDataFetcher(ABC):
     """数据获取策略的抽象基类。
 
     该类定义了数据获取、规范化和保存的基本流程，并提供了钩子方法供子类定制额外的处理逻辑。
+
+    Attributes:
+        source (str): 数据源名称，用于熔断等按数据源划分的控制，默认为类名。
+        schema (Optional[StepSchema]): 输出的列定义，`normalize` 的结果应通过
+            `self.schema.conform` 转换为该定义。
+        uses_browser (bool): 查询是否占用一个浏览器实例，此类数据源的并发数
+            不超过浏览器池大小。
+        cpu_bound (bool): 查询是否为受 GIL 限制的本地计算，此类策略由调度器
+            分批交给进程池执行（通过 `fetch_many`），实例必须可以被 pickle。
+        store_fields (Tuple[str, ...]): 影响查询结果的实例属性名，这些属性的值
+            参与中间结果存储的键。
     """
 
+    source: str = ""
+    schema: Optional[StepSchema] = None
+    uses_browser: bool = False
+    cpu_bound: bool = False
+    store_fields: Tuple[str, ...] = ()
+
     def __init__(self):
         """初始化BaseDataFetcher实例，创建一个空的DataFrame以存储数据。"""
         self.data = pd.DataFrame()
-        self.logger = get_logger(self.__class__.__name__)
+        cls = self.__class__
+        self.logger = get_logger(f"{cls.__module__}.{cls.__name__}")
 
     @abstractmethod
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
@@ -65,57 +160,134 @@ class BaseDataFetcher(ABC):
         """执行策略：查询并规范化数据。
 
         参数:
-            name (str): 数据名称，用于保存文件。
-            save_results (bool): 是否保存结果到CSV文件，默认为True。
+            name (str): 查询的名称（输入项）。
+            save_results (bool): 是否把结果保存到中间结果存储，默认为True。
 
         返回:
-            pd.DataFrame: 规范化后的数据框。
+            pd.DataFrame: 规范化后的数据框。数据源熔断或查询失败时返回空结果，且不保存。
         """
-        parent_class_name = self.__class__.__bases__[0].__name__
-        directory = Path(RESUILTS_DIR) / parent_class_name / self.__class__.__name__
-        file_path = directory / f"{name}.csv"
+        return self.fetch_result(name, save_results).data
 
-        if file_path.exists():
-            self.logger.info(
-                f"File {file_path} already exists. Loading data from file."
+    def fetch_result(self, name: str, save_results: bool = True) -> FetchResult:
+        """与 `fetch` 相同，但同时返回结果的来源，调用方据此区分空结果和失败。
+
+        参数:
+            name (str): 查询的名称（输入项）。
+            save_results (bool): 是否把结果保存到中间结果存储，默认为True。
+
+        返回:
+            FetchResult: 结果及其来源。
+        """
+        source = self.source_name
+        with get_tracer().span("fetch", source, item=name):
+            result = self._fetch(name, save_results)
+        _FETCHES.inc(source=source, outcome=result.outcome)
+        _ROWS.inc(len(result.data), source=source)
+        return result
+
+    def _fetch(self, name: str, save_results: bool) -> FetchResult:
+        store = get_intermediate_store()
+        key = self.store_key(name)
+        data = store.get(key)
+        if data is not None:
+            self.logger.debug(
+                "Loaded %s result for %s from store", self.source_name, name
             )
-            self.data = pd.read_csv(file_path)
-            return self.data
-
-        self.logger.info(
-            f"File {file_path} does not exist. Querying and processing data."
-        )
-        raw_data = self.query(name)
-        self.data = self.normalize(raw_data)
-        self.data = self.post_process(self.data)  # 调用钩子方法
+            self.data = data
+            return FetchResult(data, "store")
+
+        breaker = get_circuit_breaker_registry().get(self.source_name)
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            self.logger.warning("Skipping %s: %s", name, e)
+            return FetchResult(self.empty_result(), "breaker_open", str(e))
+        start = time.perf_counter()
+        try:
+            raw_data = self.query(name)
+        except Exception as e:
+            breaker.record_failure()
+            self.logger.exception("Query failed for %s from %s", name, self.source_name)
+            return FetchResult(self.empty_result(), "error", f"{type(e).__name__}: {e}")
+        breaker.record_success()
+
+        # 同一个策略实例会被多个线程并发调用，结果只保存在局部变量中
+        data = self.normalize(raw_data)
+        data = self.post_process(data)  # 调用钩子方法
+        _QUERY_SECONDS.observe(time.perf_counter() - start, source=self.source_name)
+        self.data = data
         if save_results:
-            self.save_to_csv(name)
-        return self.data
+            store.put(key, data, {"strategy": self.store_identity(), "item": name})
+        return FetchResult(data, "query")
+
+    def fetch_many(self, names: List[str]) -> List[FetchResult]:
+        """批量执行 `fetch_result`，按输入顺序返回结果。
 
-    def save_to_csv(self, name: str):
+        计算密集型策略在进程池中以批为单位调用此方法，子类可以覆盖它做
+        向量化的批量查询。
+        """
+        return [self.fetch_result(name) for name in names]
+
+    @classmethod
+    def store_identity(cls) -> str:
+        """策略标识：类的全名加上其代码（含父类）的哈希，代码变化后旧结果失效。"""
+        return _class_identity(cls)
+
+    def store_params(self) -> Dict[str, Any]:
+        """影响查询结果的参数，即 `store_fields` 中列出的实例属性。"""
+        return {field: getattr(self, field) for field in self.store_fields}
+
+    def store_key(self, name: str) -> str:
+        """某个输入项的结果在中间结果存储中的键。"""
+        params = self.store_params()
+        if self.schema is not None:
+            params["schema"] = self.schema.columns
+        return make_key(self.store_identity(), params, name)
+
+    @property
+    def source_name(self) -> str:
+        """数据源名称，未设置 `source` 时使用类名。"""
+        return self.source or self.__class__.__name__
+
+    def empty_result(self) -> pd.DataFrame:
+        """返回只有输出列、没有数据的结果。"""
+        return self.schema.empty() if self.schema is not None else pd.DataFrame()
+
+    def save_to_csv(self, name: str, data: Optional[pd.DataFrame] = None):
         """将规范化后的数据保存到CSV文件。
 
         参数:
             name (str): 数据名称，用于保存文件。
+            data (Optional[pd.DataFrame]): 要保存的数据，默认为 `self.data`。
         """
         parent_class_name = self.__class__.__bases__[0].__name__
         directory = Path(RESUILTS_DIR) / parent_class_name / self.__class__.__name__
         directory.mkdir(parents=True, exist_ok=True)
         file_path = directory / f"{name}.csv"
-        self.data.to_csv(file_path, index=False)
-        self.logger.info(f"Data saved to {file_path}")
+        (self.data if data is None else data).to_csv(file_path, index=False)
+        self.logger.info("Data saved to %s", file_path)
 
     @staticmethod
-    def merge_results(results: List[pd.DataFrame]) -> pd.DataFrame:
+    def merge_results(
+        results: List[pd.DataFrame], schema: Optional[StepSchema] = None
+    ) -> pd.DataFrame:
         """合并多个数据框的结果。
 
+        给出 `schema` 时分类列先统一类别再合并，去重直接比较分类编码。
+
         参数:
             results (List[pd.DataFrame]): 数据框列表。
+            schema (Optional[StepSchema]): 结果的列定义，通常为策略的
+                `schema`；为 None 时直接合并。
 
         返回:
             pd.DataFrame: 合并且去重的数据框。
         """
-        return pd.concat(results, ignore_index=True).drop_duplicates()
+        if schema is not None:
+            merged = schema.concat(results)
+        else:
+            merged = pd.concat(results, ignore_index=True)
+        return merged.drop_duplicates()
 
     def post_process(self, data: pd.DataFrame) -> pd.DataFrame:
         """对规范化后的数据进行额外处理的钩子方法。
@@ -134,6 +306,8 @@ class BaseDataFetcher(ABC):
 class DrugComponentFinder(BaseDataFetcher):
     """查找药物成分的具体实现类。"""
 
+    schema = COMPONENTS
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """查询数据库并返回药物成分的原始结果。
 
@@ -157,7 +331,7 @@ class DrugComponentFinder(BaseDataFetcher):
         返回:
             pd.DataFrame: 规范化后的数据框。
         """
-        normalized_data = raw_data  # 假设这是规范化后的数据
+        normalized_data = self.schema.conform(raw_data)
         return normalized_data
 
     def post_process(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -177,6 +351,8 @@ class DrugComponentFinder(BaseDataFetcher):
 class ComponentTargetPredictor(BaseDataFetcher):
     """预测成分靶点的具体实现类。"""
 
+    schema = TARGETS
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """查询数据库并返回成分靶点的原始结果。
 
@@ -200,7 +376,7 @@ class ComponentTargetPredictor(BaseDataFetcher):
         返回:
             pd.DataFrame: 规范化后的数据框。
         """
-        normalized_data = raw_data  # 假设这是规范化后的数据
+        normalized_data = self.schema.conform(raw_data)
         return normalized_data
 
     def post_process(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -219,6 +395,8 @@ class ComponentTargetPredictor(BaseDataFetcher):
 class DiseaseTargetFinder(BaseDataFetcher):
     """查找疾病靶点的具体实现类。"""
 
+    schema = DISEASE_TARGETS
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """查询数据库并返回疾病靶点的原始结果。
 
@@ -242,7 +420,7 @@ class DiseaseTargetFinder(BaseDataFetcher):
         返回:
             pd.DataFrame: 规范化后的数据框。
         """
-        normalized_data = raw_data  # 假设这是规范化后的数据
+        normalized_data = self.schema.conform(raw_data)
         return normalized_data
 
     def post_process(self, data: pd.DataFrame) -> pd.DataFrame:
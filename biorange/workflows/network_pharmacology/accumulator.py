@@ -0,0 +1,157 @@
+"""
+成分-靶点结果的列式累加器。
+
+每个 (SMILES, 策略) 查询只产生几行结果，逐个保留小 DataFrame 再 `pd.concat`
+时，pandas 的对象开销远大于数据本身。`TargetAccumulator` 把
+(smiles, targets, source) 行追加到三个整数数组中，字符串按列做字典编码，
+最后一次性构造 DataFrame（分类类型，直接复用编码）。
+
+类:
+    StringDictionary: 字符串到整数编码的字典。
+    TargetRecord: 累加器中一行的只读视图。
+    TargetAccumulator: (smiles, targets, source) 行的列式累加器。
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MISSING = -1
+
+
+class StringDictionary:
+    """字符串到整数编码的字典，缺失值编码为 -1。"""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None or value is pd.NA or value != value:  # 缺失值
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code == MISSING else self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class TargetRecord:
+    """累加器中一行的只读视图，不复制数据。"""
+
+    __slots__ = ("_accumulator", "_row")
+
+    def __init__(self, accumulator: "TargetAccumulator", row: int):
+        self._accumulator = accumulator
+        self._row = row
+
+    @property
+    def smiles(self) -> Optional[str]:
+        return self._accumulator.value("smiles", self._row)
+
+    @property
+    def targets(self) -> Optional[str]:
+        return self._accumulator.value("targets", self._row)
+
+    @property
+    def source(self) -> Optional[str]:
+        return self._accumulator.value("source", self._row)
+
+    def __repr__(self) -> str:
+        return (
+            f"TargetRecord(smiles={self.smiles!r}, targets={self.targets!r}, "
+            f"source={self.source!r})"
+        )
+
+
+class TargetAccumulator:
+    """(smiles, targets, source) 行的列式累加器。
+
+    每列是一个 `array('i')` 编码数组加一个字符串字典，追加操作是线程安全的。
+
+    Example:
+        >>> accumulator = TargetAccumulator()
+        >>> accumulator.append("CCO", "PTGS1", "TCMSP")
+        >>> accumulator.extend(strategy_result)
+        >>> frame = accumulator.to_frame()
+    """
+
+    columns = ("smiles", "targets", "source")
+
+    def __init__(self):
+        self._codes = {column: array("i") for column in self.columns}
+        self._dictionaries = {column: StringDictionary() for column in self.columns}
+        self._lock = threading.Lock()
+
+    def append(
+        self, smiles: Optional[str], targets: Optional[str], source: Optional[str]
+    ) -> None:
+        """追加一行。"""
+        with self._lock:
+            for column, value in zip(self.columns, (smiles, targets, source)):
+                self._codes[column].append(self._dictionaries[column].encode(value))
+
+    def extend(self, frame: pd.DataFrame) -> None:
+        """追加一个结果块的所有行，缺少的列按缺失值处理。"""
+        if frame is None or len(frame) == 0:
+            return
+        rows = len(frame)
+        # 整块一次转换为 Python 列表，避免逐列访问 Series 的开销
+        positions = {column: i for i, column in enumerate(frame.columns)}
+        values = frame.to_numpy(dtype=object).T.tolist()
+        with self._lock:
+            for column in self.columns:
+                position = positions.get(column)
+                if position is None:
+                    self._codes[column].extend([MISSING] * rows)
+                    continue
+                encode = self._dictionaries[column].encode
+                self._codes[column].extend([encode(v) for v in values[position]])
+
+    def value(self, column: str, row: int) -> Optional[str]:
+        return self._dictionaries[column].decode(self._codes[column][row])
+
+    def __len__(self) -> int:
+        return len(self._codes["smiles"])
+
+    def __getitem__(self, row: int) -> TargetRecord:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return TargetRecord(self, row)
+
+    def __iter__(self) -> Iterator[TargetRecord]:
+        for row in range(len(self)):
+            yield TargetRecord(self, row)
+
+    def nbytes(self) -> int:
+        """编码数组占用的字节数（不含字典中的字符串）。"""
+        return sum(codes.itemsize * len(codes) for codes in self._codes.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """一次性构造 DataFrame，各列为直接复用编码的分类类型。"""
+        with self._lock:
+            return pd.DataFrame(
+                {
+                    column: pd.Categorical.from_codes(
+                        np.array(self._codes[column], dtype=np.int32),
+                        categories=self._categories(column),
+                    )
+                    for column in self.columns
+                }
+            )
+
+    def _categories(self, column: str) -> pd.Index:
+        return pd.Index(self._dictionaries[column].values, dtype=object)
@@ -1,141 +1,415 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import pandas as pd
 
 from biorange.core.cache.cache_manager import CacheManagerFactory, GeneralCacheManager
 from biorange.core.logger import get_logger
-from biorange.workflows.network_pharmacology.abstract import BaseDataFetcher
+from biorange.core.telemetry import get_metrics_registry, get_tracer
+from biorange.workflows.executor import TaskExecutor
+from biorange.workflows.network_pharmacology.abstract import (
+    BaseDataFetcher,
+    FetchResult,
+)
+from biorange.workflows.network_pharmacology.accumulator import TargetAccumulator
+from biorange.workflows.network_pharmacology.deadlines import (
+    DeadlineCall,
+    DeadlinePolicy,
+    LatencyRecorder,
+    MissingResult,
+)
+from biorange.workflows.network_pharmacology.progress import StepProgress
+from biorange.workflows.network_pharmacology.scheduler import get_scheduler
+from biorange.workflows.network_pharmacology.schema import (
+    COMPONENTS,
+    DISEASE_TARGETS,
+    TARGETS,
+    StepSchema,
+)
+
+_metrics = get_metrics_registry()
+_ITEMS = _metrics.counter(
+    "biorange_analyzer_items",
+    "Items processed by analyzers by step and outcome",
+    ("step", "outcome"),
+)
+_IN_FLIGHT = _metrics.gauge(
+    "biorange_analyzer_in_flight", "Items submitted and not yet collected", ("step",)
+)
+_ITEM_SECONDS = _metrics.histogram(
+    "biorange_analyzer_item_seconds",
+    "Time from submitting an item to all its strategies completing",
+    ("step",),
+)
+
+
+class StrategyAnalyzer:
+    """分析器基类：把每个策略的查询作为独立任务提交到共享调度器。
+
+    任务按策略的数据源名称限流，分析器自身不再创建线程池。
+
+    Attributes:
+        max_in_flight (int): 流式执行时同时在途的输入项上限，超过后先消费
+            已完成的结果再提交新的输入，避免结果在内存中堆积。
+        deadlines (Dict[str, DeadlinePolicy]): 按数据源的截止时间策略。
+        missing (List[MissingResult]): 缺失的结果：超过硬截止、数据源熔断或
+            查询失败。有缺失的输入项不写入缓存，下次运行时重新查询。
+        latency (LatencyRecorder): 每个输入项从提交到全部策略完成的延迟。
+        progress (StepProgress): 进度计数，供 `ProgressDisplay` 读取。
+    """
+
+    cache_prefix = ""
+    schema: Optional[StepSchema] = None
 
-
-class ComponentFinder:
     def __init__(
         self,
         strategies: List[BaseDataFetcher],
         cache_manager: GeneralCacheManager,
-        max_workers: int = 5,
+        scheduler: Optional[TaskExecutor] = None,
+        logger_name: Optional[str] = None,
+        max_in_flight: int = 64,
+        deadlines: Optional[Dict[str, DeadlinePolicy]] = None,
     ):
         self.strategies = strategies
         self.cache_manager = cache_manager
-        self.max_workers = max_workers
-        self.logger = get_logger("component_finder")
+        self._scheduler = scheduler
+        self.max_in_flight = max_in_flight
+        self.deadlines = dict(deadlines or {})
+        self.missing: List[MissingResult] = []
+        self._missing_items: Set[str] = set()
+        self.latency = LatencyRecorder()
+        self.progress = StepProgress()
+        self._missing_lock = threading.Lock()
+        # 默认按模块和类命名，日志配置可以按模块前缀设置采样和限流
+        cls = type(self)
+        self.logger = get_logger(logger_name or f"{cls.__module__}.{cls.__name__}")
+
+    @property
+    def scheduler(self) -> TaskExecutor:
+        """任务执行器，未显式指定时使用进程级共享的本地调度器。"""
+        return self._scheduler or get_scheduler()
+
+    @scheduler.setter
+    def scheduler(self, executor: Optional[TaskExecutor]) -> None:
+        self._scheduler = executor
+
+    def _submit_strategies(self, input_data: str) -> List[Future]:
+        return [self._submit(strategy, input_data) for strategy in self.strategies]
+
+    def _submit(self, strategy: BaseDataFetcher, input_data: str) -> Future:
+        """提交单个策略的查询，按数据源的策略加上截止时间和对冲。"""
+        source = strategy.source_name
+        if strategy.cpu_bound:
+            # 计算密集型策略分批在进程池中执行，不受截止时间约束
+            return self.scheduler.submit_batched(
+                source, strategy.fetch_many, input_data
+            )
+        policy = self.deadlines.get(source)
+        if policy is None or not policy.active:
+            return self.scheduler.submit(source, strategy.fetch_result, input_data)
 
-    def execute(self, drug_names: str | List[str]) -> pd.DataFrame:
-        all_components = []
-        if isinstance(drug_names, str):
-            drug_names = [drug_names]
-        for drug_name in drug_names:
-            cache_key = f"components_{drug_name}"
-            cached_data = self.cache_manager.get(cache_key)
-            if cached_data is not None:
-                self.logger.info(f"Cache hit for components of drug: {drug_name}")
-                all_components.append(cached_data)
-                continue
+        def on_missing(reason: str) -> None:
+            self.logger.warning(
+                "Missing %s result for %s: %s", source, input_data, reason
+            )
+            self._record_missing(input_data, source, reason)
+
+        return DeadlineCall(
+            submit=lambda on_start: self.scheduler.submit_timed(
+                source, on_start, strategy.fetch_result, input_data
+            ),
+            policy=policy,
+            fallback=lambda: FetchResult(strategy.empty_result(), "deadline"),
+            on_missing=on_missing,
+            is_failure=lambda result: result.failed,
+        ).future
+
+    def _record_missing(self, item: str, source: str, reason: str) -> None:
+        with self._missing_lock:
+            self.missing.append(MissingResult(item, source, reason))
+            self._missing_items.add(item)
+
+    def has_missing(self, item: str) -> bool:
+        """该输入项是否有策略没有给出结果（其结果不完整）。"""
+        with self._missing_lock:
+            return item in self._missing_items
+
+    def clear_missing(self) -> None:
+        """清空缺失记录（新的一次运行开始时调用）。"""
+        with self._missing_lock:
+            self.missing.clear()
+            self._missing_items.clear()
+
+    def _gather(self, item: str, futures: List[Future]) -> pd.DataFrame:
+        results = []
+        for strategy, future in zip(self.strategies, futures):
+            result: FetchResult = future.result()
+            if result.failed:
+                # 熔断或查询失败的空结果与超过硬截止一样记为缺失
+                self._record_missing(
+                    item, strategy.source_name, f"{result.outcome}: {result.error}"
+                )
+            results.append(result.data)
+        if self.schema is not None:
+            # 统一分类类别后再合并，结果保持步骤定义的类型
+            return self.schema.concat(results)
+        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
 
-            self.logger.info(f"Finding components for drug: {drug_name}")
-            components = self._run_strategies(drug_name)
-            self.cache_manager.save(cache_key, components)
-            all_components.append(components)
+    def cache_key(self, item: str) -> str:
+        return f"{self.cache_prefix}_{item}"
 
-        # Combine all components into a single DataFrame
-        return (
-            pd.concat(all_components, ignore_index=True)
-            if all_components
-            else pd.DataFrame()
-        )
+    def _record_item(self, item: str, start: float) -> str:
+        """记录一个查询完成的输入项的延迟和指标，返回其结果类别。"""
+        end = time.perf_counter()
+        self.latency.record(end - start)
+        outcome = "incomplete" if self.has_missing(item) else "computed"
+        _ITEMS.inc(step=self.cache_prefix, outcome=outcome)
+        _ITEM_SECONDS.observe(end - start, step=self.cache_prefix)
+        get_tracer().async_span("item", self.cache_prefix, start, end, item=item)
+        return outcome
 
-    def _run_strategies(self, input_data: str) -> pd.DataFrame:
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(strategy.fetch, input_data)
-                for strategy in self.strategies
-            ]
-            results = [future.result() for future in as_completed(futures)]
+    def execute_stream(
+        self,
+        items: Iterable[str],
+        max_in_flight: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """流式执行：某个输入项的所有策略完成后立即产出其结果。
+
+        输入按需消费（可以是生成器），在途项达到上限时先产出已完成的结果，
+        调用方处理得慢时不会继续提交新任务。重复的输入项只处理一次。
+
+        Args:
+            items (Iterable[str]): 输入项。
+            max_in_flight (Optional[int]): 在途项上限，默认使用 `self.max_in_flight`。
+            ordered (bool): 是否按输入顺序产出。各项仍并发执行，先完成的项
+                缓存在内存中，等待排在前面的项完成。
+
+        Yields:
+            Tuple[str, pd.DataFrame]: (输入项, 该项的结果)，默认按完成顺序产出。
+        """
+        order: Deque[str] = deque()
+        stream = self._stream(items, max_in_flight, order)
+        return self._in_order(stream, order) if ordered else stream
+
+    @staticmethod
+    def _in_order(
+        stream: Iterator[Tuple[str, pd.DataFrame]], order: Deque[str]
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        ready: Dict[str, pd.DataFrame] = {}
+        for item, result in stream:
+            ready[item] = result
+            while order and order[0] in ready:
+                head = order.popleft()
+                yield head, ready.pop(head)
+
+    def _stream(
+        self,
+        items: Iterable[str],
+        max_in_flight: Optional[int],
+        order: Deque[str],
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        limit = max(1, max_in_flight or self.max_in_flight)
+        progress = self.progress
+        progress.input_done = False
+        completed: "queue.Queue[str]" = queue.Queue()
+        in_flight: Dict[str, List[Future]] = {}
+        started: Dict[str, float] = {}
+        seen = set()
+
+        def submit(item: str) -> None:
+            started[item] = time.perf_counter()
+            futures = self._submit_strategies(item)
+            in_flight[item] = futures
+            _IN_FLIGHT.inc(step=self.cache_prefix)
+            if not futures:
+                completed.put(item)
+                return
+            remaining = [len(futures)]
+            lock = threading.Lock()
+
+            def on_done(_future: Future) -> None:
+                with lock:
+                    remaining[0] -= 1
+                    finished = remaining[0] == 0
+                if finished:
+                    completed.put(item)
+
+            for future in futures:
+                future.add_done_callback(on_done)
+
+        def collect(block: bool = True) -> Tuple[str, pd.DataFrame]:
+            item = completed.get(block=block)
+            result = self._gather(item, in_flight.pop(item))
+            _IN_FLIGHT.dec(step=self.cache_prefix)
+            # 不完整的结果不写入缓存，下次运行时重新查询
+            if self._record_item(item, started.pop(item)) == "computed":
+                self.cache_manager.save(self.cache_key(item), result)
+            progress.item_completed()
+            return item, result
+
+        # 逐项的日志只写 DEBUG，控制台上的进度由 ProgressDisplay 显示
+        for item in items:
+            if item in seen:
+                continue
+            seen.add(item)
+            order.append(item)
+            progress.item_seen()
+            cached_data = self.cache_manager.get(self.cache_key(item))
+            if cached_data is not None:
+                self.logger.debug("Cache hit for %s of: %s", self.cache_prefix, item)
+                _ITEMS.inc(step=self.cache_prefix, outcome="cache_hit")
+                progress.item_completed(cache_hit=True)
+                yield item, cached_data
+                continue
 
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+            while len(in_flight) >= limit:
+                # 等待前先提交不足一批的计算任务，避免等待永远不会开始的批次
+                self.scheduler.flush()
+                yield collect()
+            self.logger.debug("Querying %s for: %s", self.cache_prefix, item)
+            submit(item)
+            # 顺带产出已经完成的项，不阻塞
+            while not completed.empty():
+                yield collect(block=False)
+
+        progress.input_done = True
+        self.scheduler.flush()
+        while in_flight:
+            yield collect()
+        self.log_latency()
+
+    def log_latency(self) -> None:
+        summary = self.latency.summary()
+        if summary["count"]:
+            self.logger.info(
+                "%s latency over %d items: p50=%.2fs p99=%.2fs max=%.2fs",
+                self.cache_prefix,
+                summary["count"],
+                summary["p50"],
+                summary["p99"],
+                summary["max"],
+            )
 
 
-class SmilesTargetPredictor:
+class ComponentFinder(StrategyAnalyzer):
+    cache_prefix = "components"
+    schema = COMPONENTS
+
     def __init__(
         self,
         strategies: List[BaseDataFetcher],
         cache_manager: GeneralCacheManager,
-        max_workers: int = 5,
+        scheduler: Optional[TaskExecutor] = None,
+        max_in_flight: int = 64,
+        deadlines: Optional[Dict[str, DeadlinePolicy]] = None,
     ):
-        self.strategies = strategies
-        self.cache_manager = cache_manager
-        self.max_workers = max_workers
-        self.logger = get_logger("target_predictor")
+        super().__init__(
+            strategies,
+            cache_manager,
+            scheduler,
+            max_in_flight=max_in_flight,
+            deadlines=deadlines,
+        )
 
-    def execute(self, components: pd.DataFrame) -> pd.DataFrame:
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(self._predict_component_targets, component)
-                for component in components["smiles"].unique()
-            ]
-            results = [future.result() for future in as_completed(futures)]
+    def execute_stream(
+        self,
+        drug_names: str | Iterable[str],
+        max_in_flight: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        # 所有 (药物, 策略) 任务一次性提交，并发度由调度器的数据源上限约束
+        if isinstance(drug_names, str):
+            drug_names = [drug_names]
+        return super().execute_stream(drug_names, max_in_flight, ordered)
 
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    def execute(self, drug_names: str | List[str]) -> pd.DataFrame:
+        all_components = [
+            components
+            for _, components in self.execute_stream(drug_names, ordered=True)
+        ]
+        # Combine all components into a single DataFrame
+        return self.schema.concat(all_components)
 
-    def _predict_component_targets(self, component: str) -> pd.DataFrame:
-        cache_key = f"targets_{component}"
-        cached_data = self.cache_manager.get(cache_key)
-        if cached_data is not None:
-            self.logger.info(f"Cache hit for targets of component: {component}")
-            return cached_data
 
-        self.logger.info(f"Predicting targets for component: {component}")
-        targets = self._run_strategies(component)
-        self.cache_manager.save(cache_key, targets)
-        return targets
+class SmilesTargetPredictor(StrategyAnalyzer):
+    cache_prefix = "targets"
+    schema = TARGETS
 
-    def _run_strategies(self, input_data: str) -> pd.DataFrame:
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(strategy.fetch, input_data)
-                for strategy in self.strategies
-            ]
-            results = [future.result() for future in as_completed(futures)]
+    def __init__(
+        self,
+        strategies: List[BaseDataFetcher],
+        cache_manager: GeneralCacheManager,
+        scheduler: Optional[TaskExecutor] = None,
+        max_in_flight: int = 64,
+        deadlines: Optional[Dict[str, DeadlinePolicy]] = None,
+    ):
+        super().__init__(
+            strategies,
+            cache_manager,
+            scheduler,
+            max_in_flight=max_in_flight,
+            deadlines=deadlines,
+        )
 
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    def execute_stream(
+        self,
+        smiles: Iterable[str],
+        max_in_flight: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        # (SMILES, 策略) 任务平铺提交到共享调度器，缺失的 SMILES 直接跳过
+        return super().execute_stream(
+            (s for s in smiles if isinstance(s, str) and s), max_in_flight, ordered
+        )
+
+    def execute(self, components: pd.DataFrame) -> pd.DataFrame:
+        # 结果块追加到列式累加器，最后一次性构造 DataFrame，避免大量小表 concat
+        accumulator = TargetAccumulator()
+        for _, targets in self.execute_stream(components["smiles"]):
+            accumulator.extend(targets)
+        return accumulator.to_frame()
 
 
-class DiseaseTargetFinder:
+class DiseaseTargetFinder(StrategyAnalyzer):
+    cache_prefix = "disease_targets"
+    schema = DISEASE_TARGETS
+
     def __init__(
         self,
         strategies: List[BaseDataFetcher],
         cache_manager: GeneralCacheManager,
-        max_workers: int = 5,
+        scheduler: Optional[TaskExecutor] = None,
+        deadlines: Optional[Dict[str, DeadlinePolicy]] = None,
     ):
-        self.strategies = strategies
-        self.cache_manager = cache_manager
-        self.max_workers = max_workers
-        self.logger = get_logger("disease_target_finder")
+        super().__init__(strategies, cache_manager, scheduler, deadlines=deadlines)
 
     def execute(self, disease_name: str) -> pd.DataFrame:
-        cache_key = f"disease_targets_{disease_name}"
+        cache_key = self.cache_key(disease_name)
+        self.progress.item_seen()
         cached_data = self.cache_manager.get(cache_key)
         if cached_data is not None:
             self.logger.info(
-                f"Cache hit for disease targets of disease: {disease_name}"
+                "Cache hit for disease targets of disease: %s", disease_name
             )
+            _ITEMS.inc(step=self.cache_prefix, outcome="cache_hit")
+            self.progress.item_completed(cache_hit=True)
             return cached_data
 
-        self.logger.info(f"Finding disease targets for disease: {disease_name}")
-        disease_targets = self._run_strategies(disease_name)
-        self.cache_manager.save(cache_key, disease_targets)
+        self.logger.info("Finding disease targets for disease: %s", disease_name)
+        start = time.perf_counter()
+        futures = self._submit_strategies(disease_name)
+        self.scheduler.flush()
+        disease_targets = self._gather(disease_name, futures)
+        if self._record_item(disease_name, start) == "computed":
+            self.cache_manager.save(cache_key, disease_targets)
+        self.progress.item_completed()
         return disease_targets
 
-    def _run_strategies(self, input_data: str) -> pd.DataFrame:
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(strategy.fetch, input_data)
-                for strategy in self.strategies
-            ]
-            results = [future.result() for future in as_completed(futures)]
-
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
-
 
 if __name__ == "__main__":
     from biorange.workflows.network_pharmacology.strategy import (
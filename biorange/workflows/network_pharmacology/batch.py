@@ -0,0 +1,179 @@
+"""
+多项目批量运行。
+
+多个项目（方剂/疾病）通常共享大量药物和成分（如槲皮素、山柰酚）。批量运行先
+求出所有项目的药物、SMILES 和疾病的并集，每个唯一实体只查询一次，再按项目
+组装各自的结果文件。总工作量随唯一实体数增长，而不是随项目数增长。
+
+类:
+    BatchRunner: 跨项目去重的批量运行器。
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import yaml
+
+from biorange.core.config.config_model import BatchProject
+from biorange.core.logger import get_logger
+from biorange.workflows.network_pharmacology.analyzers import (
+    ComponentFinder,
+    DiseaseTargetFinder,
+    SmilesTargetPredictor,
+)
+from biorange.workflows.network_pharmacology.dag import Node, PipelineGraph
+
+logger = get_logger(__name__)
+
+
+def unique(values: Iterable[str]) -> List[str]:
+    """按首次出现的顺序去重。"""
+    return list(dict.fromkeys(v for v in values if isinstance(v, str) and v))
+
+
+class BatchRunner:
+    """跨项目去重的批量运行器。
+
+    Attributes:
+        components (Dict[str, pd.DataFrame]): 每味药的成分。
+        targets (Dict[str, pd.DataFrame]): 每个 SMILES 的靶点。
+        disease_targets (Dict[str, pd.DataFrame]): 每个疾病的靶点。
+        requested (Dict[str, int]): 各步骤在所有项目中被请求的次数（含重复）。
+        unique_counts (Dict[str, int]): 各步骤实际查询的唯一实体数。
+
+    Example:
+        >>> runner = BatchRunner(component_finder, target_predictor, disease_finder)
+        >>> runner.run(manifest.projects)
+    """
+
+    def __init__(
+        self,
+        component_finder: ComponentFinder,
+        target_predictor: SmilesTargetPredictor,
+        disease_target_finder: DiseaseTargetFinder,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.component_finder = component_finder
+        self.target_predictor = target_predictor
+        self.disease_target_finder = disease_target_finder
+        self.max_in_flight = max_in_flight
+        self.components: Dict[str, pd.DataFrame] = {}
+        self.targets: Dict[str, pd.DataFrame] = {}
+        self.disease_targets: Dict[str, pd.DataFrame] = {}
+        self.requested: Dict[str, int] = {}
+        self.unique_counts: Dict[str, int] = {}
+
+    def run(self, projects: Sequence[BatchProject]) -> Dict[str, Node]:
+        """查询所有项目的唯一实体，然后写出每个项目的结果。
+
+        Args:
+            projects (Sequence[BatchProject]): 项目列表。
+
+        Returns:
+            Dict[str, Node]: 各步骤的节点（含耗时和处理项数）。
+        """
+        drugs = unique(d for project in projects for d in project.drug_name)
+        diseases = unique(project.disease_name for project in projects)
+        self.requested = {
+            "components": sum(len(project.drug_name) for project in projects),
+            "disease_targets": sum(1 for project in projects if project.disease_name),
+        }
+        self.unique_counts = {"components": len(drugs), "disease_targets": len(diseases)}
+
+        graph = PipelineGraph(channel_size=self.max_in_flight or 64)
+        graph.add_node(
+            "components",
+            lambda: self.component_finder.execute_stream(drugs, self.max_in_flight),
+            on_output=self._collect(self.components),
+        )
+        graph.add_node(
+            "targets",
+            lambda chunks: self.target_predictor.execute_stream(
+                self._smiles(chunks), self.max_in_flight
+            ),
+            inputs=["components"],
+            on_output=self._collect(self.targets),
+        )
+        graph.add_node(
+            "disease_targets",
+            lambda: self.disease_target_finder.execute_stream(
+                diseases, self.max_in_flight
+            ),
+            on_output=self._collect(self.disease_targets),
+        )
+        nodes = graph.run()
+
+        self.requested["targets"] = 0
+        for project in projects:
+            self.requested["targets"] += len(self._project_smiles(project))
+            self.assemble(project)
+        self.unique_counts["targets"] = len(self.targets)
+        return nodes
+
+    @staticmethod
+    def _collect(results: Dict[str, pd.DataFrame]):
+        def on_output(chunk: Tuple[str, pd.DataFrame]) -> None:
+            item, data = chunk
+            results[item] = data
+
+        return on_output
+
+    @staticmethod
+    def _smiles(component_chunks) -> Iterator[str]:
+        # 每味药的成分一完成，其中的 SMILES 就进入靶点预测；重复的 SMILES 由
+        # 分析器去重
+        for _, components in component_chunks:
+            if "smiles" in components:
+                yield from components["smiles"]
+
+    def _project_smiles(self, project: BatchProject) -> List[str]:
+        return unique(
+            smiles
+            for drug in project.drug_name
+            if drug in self.components
+            for smiles in self.components[drug]["smiles"]
+        )
+
+    def assemble(self, project: BatchProject) -> Path:
+        """从共享结果中组装一个项目的结果文件。
+
+        输出与 `biorange netparam` 相同：``config.yaml``、``components_.csv``、
+        ``targets_.csv``、``disease_targets_.csv``，以及有缺失结果时的
+        ``missing.csv``。
+
+        Args:
+            project (BatchProject): 项目。
+
+        Returns:
+            Path: 项目的结果目录。
+        """
+        results_dir = Path(project.results_dir)
+        results_dir.mkdir(parents=True, exist_ok=True)
+        with open(results_dir / "config.yaml", "wt", encoding="utf-8") as f:
+            yaml.dump(project.model_dump(), f, allow_unicode=True)
+
+        smiles = self._project_smiles(project)
+        outputs = (
+            (self.component_finder, self.components, project.drug_name),
+            (self.target_predictor, self.targets, smiles),
+            (self.disease_target_finder, self.disease_targets, [project.disease_name]),
+        )
+        missing = []
+        for analyzer, results, items in outputs:
+            frames = [results[item] for item in items if item in results]
+            analyzer.schema.concat(frames).to_csv(
+                results_dir / f"{analyzer.cache_prefix}_.csv", index=False
+            )
+            items = set(items)
+            missing.extend(vars(m) for m in analyzer.missing if m.item in items)
+        if missing:
+            pd.DataFrame(missing).to_csv(results_dir / "missing.csv", index=False)
+
+        logger.info(
+            "Assembled project %s: %d drugs, %d SMILES",
+            results_dir,
+            len(project.drug_name),
+            len(smiles),
+        )
+        return results_dir
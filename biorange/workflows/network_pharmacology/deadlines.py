@@ -0,0 +1,233 @@
+"""
+策略查询的软/硬截止时间与对冲请求。
+
+- 软截止：任务开始运行后超过 `soft` 秒仍未完成，可选地再提交一个相同的
+  对冲请求，先成功的结果生效；失败的结果要等所有请求都结束后才生效。
+- 硬截止：超过 `hard` 秒仍未完成，立即以空结果结束，并记录缺失原因。
+  卡住的工作线程无法被强制终止，它的结果到达后会被丢弃。在线程返回之前，
+  被放弃的请求仍占用调度器中该数据源的一个并发名额和一个工作线程；卡住的
+  请求达到数据源上限后，该数据源的后续请求只会排队直到硬截止。因此硬截止
+  不能代替 HTTP 超时，卡住的请求最终由网络层的超时结束并释放名额。
+
+所有截止时间由一个后台线程统一计时，不为每个任务单独创建线程。计时在提交方
+进行，提交给执行器的只有可以 pickle 的查询函数和参数，Celery 等远程执行器同样
+适用。
+
+类:
+    DeadlinePolicy: 一个数据源的截止时间策略。
+    MissingResult: 超过硬截止而缺失的结果。
+    DeadlineWatcher: 统一计时的后台线程。
+    DeadlineCall: 带截止时间和对冲的一次策略调用。
+    LatencyRecorder: 记录每个输入项的延迟并计算分位数。
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class DeadlinePolicy:
+    """一个数据源的截止时间策略。
+
+    Attributes:
+        soft (Optional[float]): 软截止（秒），None 表示不设。
+        hard (Optional[float]): 硬截止（秒），None 表示不设。
+        hedge (bool): 超过软截止时是否发出对冲请求。
+    """
+
+    soft: Optional[float] = None
+    hard: Optional[float] = None
+    hedge: bool = False
+
+    @property
+    def active(self) -> bool:
+        return self.hard is not None or (self.soft is not None and self.hedge)
+
+
+@dataclass(frozen=True)
+class MissingResult:
+    """超过硬截止而缺失的结果。"""
+
+    item: str
+    source: str
+    reason: str
+
+
+class DeadlineWatcher:
+    """统一计时的后台线程，到期后在该线程中执行回调。"""
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        with self._condition:
+            when = time.monotonic() + delay
+            heapq.heappush(self._heap, (when, next(self._counter), callback))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="biorange-deadlines", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                when, _, callback = self._heap[0]
+                remaining = when - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+            try:
+                callback()
+            except Exception as e:  # 回调失败不能影响其他计时
+                logger.error("Deadline callback failed: %s", e)
+
+
+_watcher: Optional[DeadlineWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_deadline_watcher() -> DeadlineWatcher:
+    """返回进程级共享的计时线程（首次调用时创建）。"""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = DeadlineWatcher()
+    return _watcher
+
+
+class DeadlineCall:
+    """带截止时间和对冲的一次策略调用。
+
+    Attributes:
+        future (Future): 调用的最终结果：主请求或对冲请求中先成功的结果；
+            都失败时为最后结束的失败结果；超过硬截止时为 `fallback` 的结果。
+        hedged (bool): 是否发出了对冲请求。
+    """
+
+    def __init__(
+        self,
+        submit: Callable[[Optional[Callable[[], None]]], Future],
+        policy: DeadlinePolicy,
+        fallback: Callable[[], Any],
+        on_missing: Callable[[str], None],
+        watcher: Optional[DeadlineWatcher] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+    ):
+        """
+        Args:
+            submit (Callable): 提交一次查询并返回 Future；参数是查询开始运行时
+                要调用的回调（`TaskExecutor.submit_timed` 的 `on_start`），
+                对冲请求传入 None。
+            policy (DeadlinePolicy): 截止时间策略。
+            fallback (Callable): 超过硬截止时返回的结果。
+            on_missing (Callable[[str], None]): 超过硬截止时以原因调用。
+            watcher (Optional[DeadlineWatcher]): 计时线程，默认使用共享实例。
+            is_failure (Optional[Callable[[Any], bool]]): 判断正常返回的结果
+                是否为失败（例如查询出错的空结果），默认只有异常算失败。
+        """
+        self.future: Future = Future()
+        self.future.set_running_or_notify_cancel()
+        self.hedged = False
+        self._submit = submit
+        self._policy = policy
+        self._fallback = fallback
+        self._on_missing = on_missing
+        self._watcher = watcher or get_deadline_watcher()
+        self._is_failure = is_failure or (lambda result: False)
+        self._lock = threading.Lock()
+        self._outstanding = 1
+        self._attach(submit(self._start_timers))
+
+    def _start_timers(self) -> None:
+        # 从主请求开始运行时计时；执行器无法报告开始时间时从提交时计时
+        if self._policy.soft is not None and self._policy.hedge:
+            self._watcher.schedule(self._policy.soft, self._on_soft_deadline)
+        if self._policy.hard is not None:
+            self._watcher.schedule(self._policy.hard, self._on_hard_deadline)
+
+    def _attach(self, future: Future) -> None:
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future) -> None:
+        exception = future.exception()
+        result = None if exception is not None else future.result()
+        failed = exception is not None or self._is_failure(result)
+        with self._lock:
+            self._outstanding -= 1
+            if self.future.done():
+                return
+            if failed and self._outstanding > 0:
+                # 还有请求在运行，等它的结果；失败只在最后一个请求结束时生效
+                return
+            if exception is not None:
+                self.future.set_exception(exception)
+            else:
+                self.future.set_result(result)
+
+    def _on_soft_deadline(self) -> None:
+        with self._lock:
+            if self.future.done() or self.hedged:
+                return
+            self.hedged = True
+            self._outstanding += 1
+        logger.info("Soft deadline %.1fs exceeded, hedging", self._policy.soft)
+        self._attach(self._submit(None))
+
+    def _on_hard_deadline(self) -> None:
+        with self._lock:
+            if self.future.done():
+                return
+            # 先记录缺失，再结束 Future，等待结果的一方总能看到缺失记录
+            self._on_missing(f"hard deadline {self._policy.hard:.1f}s exceeded")
+            self.future.set_result(self._fallback())
+
+
+class LatencyRecorder:
+    """记录每个输入项的延迟并计算分位数。"""
+
+    def __init__(self):
+        self._samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """最近秩法的分位数，没有样本时返回 0。"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            count = len(self._samples)
+            maximum = max(self._samples, default=0.0)
+        return {
+            "count": count,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": maximum,
+        }
@@ -0,0 +1,128 @@
+"""
+运行日志（断点续跑）。
+
+每完成一个输入项（一味药、一个 SMILES、一个疾病），在结果目录的
+`journal.jsonl` 中追加一行记录。结果块先写入 CSV，再记入日志，因此崩溃后
+以 `--resume` 重跑时，日志中已有的项一定已经落盘，可以直接跳过；
+写入后、记录前崩溃的项会被重做，重复的行在运行结束时去重。
+
+类:
+    RunJournal: 按步骤记录已完成输入项的运行日志。
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Union
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RunJournal:
+    """按步骤记录已完成输入项的运行日志。
+
+    Attributes:
+        path (Path): 日志文件路径。
+        resume (bool): 是否从已有日志续跑；否则清空日志重新开始。
+        skipped (Dict[str, int]): 续跑时每个步骤跳过的项数。
+    """
+
+    FILENAME = "journal.jsonl"
+
+    def __init__(
+        self,
+        results_dir: Union[str, Path],
+        resume: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            results_dir (Union[str, Path]): 结果目录。
+            resume (bool): 是否续跑。
+            params (Optional[Dict[str, Any]]): 本次运行的参数，续跑时与日志中
+                记录的参数不一致会给出警告。
+        """
+        self.path = Path(results_dir) / self.FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.resume = resume
+        self.skipped: Dict[str, int] = {}
+        self._completed: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._journaled_params = None
+
+        if resume and self.path.exists():
+            self._load(params)
+        else:
+            self.path.write_text("", encoding="utf-8")
+        if params is not None and self._journaled_params is None:
+            self._append({"event": "run", "params": params, "time": time.time()})
+
+    def _load(self, params: Optional[Dict[str, Any]]) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 崩溃时可能留下写了一半的最后一行
+                    continue
+                if entry.get("event") == "run":
+                    self._journaled_params = entry.get("params")
+                    if params is not None and entry.get("params") != params:
+                        logger.warning(
+                            "Resuming with parameters different from the "
+                            "journaled run: %s",
+                            entry.get("params"),
+                        )
+                elif entry.get("event") == "done":
+                    self._completed.setdefault(entry["step"], set()).add(entry["item"])
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def is_done(self, step: str, item: str) -> bool:
+        return item in self._completed.get(step, ())
+
+    def completed(self, step: str) -> Set[str]:
+        """返回某个步骤已完成的输入项。"""
+        return set(self._completed.get(step, ()))
+
+    def record(self, step: str, item: str, rows: int = 0) -> None:
+        """记录一个输入项已完成（其结果应已落盘）。"""
+        with self._lock:
+            self._completed.setdefault(step, set()).add(item)
+        self._append(
+            {
+                "event": "done",
+                "step": step,
+                "item": item,
+                "rows": rows,
+                "time": time.time(),
+            }
+        )
+
+    def pending(self, step: str, items: Iterable[Any]) -> Iterator[Any]:
+        """过滤掉已完成的输入项，并统计跳过的项数（重复项只计一次）。"""
+        skipped = set()
+        for item in items:
+            if self.is_done(step, item):
+                if item not in skipped:
+                    skipped.add(item)
+                    self.skipped[step] = self.skipped.get(step, 0) + 1
+                continue
+            yield item
+
+    def report(self) -> str:
+        """返回续跑时跳过情况的摘要。"""
+        if not self.skipped:
+            return "Resume: nothing to skip."
+        return "Resume: skipped " + ", ".join(
+            f"{count} {step}" for step, count in self.skipped.items()
+        )
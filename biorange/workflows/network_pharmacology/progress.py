@@ -0,0 +1,266 @@
+"""
+分析步骤的实时进度显示。
+
+分析器逐项处理时只累加 `StepProgress` 中的计数，不写日志；显示线程按固定间隔
+读取这些计数和调度器的状态后重绘。每个步骤一行，例如::
+
+    targets      1204/3000+    35.2 items/s  ETA 0:00:51  cache 41%  chembl 8+120q
+
+- ``3000+``：输入仍在流入（上游步骤还没结束），总数还会增加，ETA 按已知的项估计；
+- ``chembl 8+120q``：该数据源运行中 8 个任务、排队 120 个，排队多说明受并发上限
+  或限流约束；
+- ``stalled 45s``：有在途项，但已经 45 秒没有项完成。
+
+输出是终端时原地刷新；重定向到文件或在 CI 中运行时每 `log_interval` 秒打印一次。
+原地刷新期间，写到同一终端的控制台日志改由显示器写出：先清除进度行，写出日志，
+再在日志下方重绘进度行，日志不会打乱进度显示。
+
+类:
+    StepProgress: 一个分析步骤的进度计数。
+    ProgressDisplay: 在后台线程中刷新各步骤进度的显示器。
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from typing import IO, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from biorange.core.logger import LogManager
+
+
+class StepProgress:
+    """一个分析步骤的进度计数，只由执行该步骤的线程更新。
+
+    Attributes:
+        seen (int): 已接收的（去重后的）输入项数。
+        completed (int): 已完成的输入项数，包括缓存命中。
+        cache_hits (int): 缓存命中的输入项数。
+        input_done (bool): 输入是否已全部接收，此后 `seen` 即为总数。
+        started (Optional[float]): 接收第一个输入项的时间（`time.perf_counter`）。
+        last_completed (Optional[float]): 最近一次有项完成的时间。
+    """
+
+    def __init__(self):
+        self.seen = 0
+        self.completed = 0
+        self.cache_hits = 0
+        self.input_done = False
+        self.started: Optional[float] = None
+        self.last_completed: Optional[float] = None
+
+    def item_seen(self) -> None:
+        if self.started is None:
+            self.started = time.perf_counter()
+        self.seen += 1
+
+    def item_completed(self, cache_hit: bool = False) -> None:
+        self.completed += 1
+        if cache_hit:
+            self.cache_hits += 1
+        self.last_completed = time.perf_counter()
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class _LogWriter:
+    """替换控制台日志处理器的输出流，日志经过显示器写出。"""
+
+    def __init__(self, display: "ProgressDisplay", stream: IO[str]):
+        self._display = display
+        self._stream = stream
+
+    def write(self, text: str) -> None:
+        self._display._write_log(self._stream, text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+class ProgressDisplay:
+    """在后台线程中刷新各分析步骤进度的显示器，可作为上下文管理器使用。
+
+    Attributes:
+        analyzers (List): 要显示的分析器（`StrategyAnalyzer`）。
+        enabled (bool): 为假时不启动显示线程。
+        interval (float): 终端中的刷新间隔（秒）。
+        log_interval (float): 非终端输出时的打印间隔（秒）。
+        window (float): 计算吞吐量的滑动窗口（秒）。
+        stall_after (float): 在途项持续多久没有完成时标记为停滞（秒）。
+        log_handlers (Optional[Sequence[logging.StreamHandler]]): 原地刷新期间
+            改由显示器写出的控制台日志处理器，默认为日志配置中的控制台处理器。
+    """
+
+    def __init__(
+        self,
+        analyzers: Sequence,
+        stream: Optional[IO[str]] = None,
+        enabled: bool = True,
+        interval: float = 0.5,
+        log_interval: float = 10.0,
+        window: float = 10.0,
+        stall_after: float = 30.0,
+        log_handlers: Optional[Sequence] = None,
+    ):
+        self.analyzers = list(analyzers)
+        self.stream = stream or sys.stderr
+        self.enabled = enabled
+        self.interval = interval
+        self.log_interval = log_interval
+        self.window = window
+        self.stall_after = stall_after
+        isatty = getattr(self.stream, "isatty", None)
+        self._interactive = bool(isatty and isatty())
+        self._history: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._reported: Set[str] = set()
+        self._lines = 0
+        self._last: List[str] = []
+        self._log_handlers = log_handlers
+        self._redirected: List[Tuple] = []
+        self._draw_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ProgressDisplay":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        if self._interactive:
+            self._redirect_logs()
+        self._thread = threading.Thread(
+            target=self._run, name="biorange-progress", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._interactive:
+            self._draw(self.render())  # 保留最终状态
+        for handler, stream in self._redirected:
+            handler.setStream(stream)
+        self._redirected = []
+
+    def _redirect_logs(self) -> None:
+        handlers = self._log_handlers
+        if handlers is None:
+            handlers = LogManager().console_handlers()
+        for handler in handlers:
+            stream = handler.stream
+            isatty = getattr(stream, "isatty", None)
+            # 只接管写到同一终端的处理器
+            if stream is self.stream or (isatty and isatty()):
+                handler.setStream(_LogWriter(self, stream))
+                self._redirected.append((handler, stream))
+
+    def _write_log(self, stream: IO[str], text: str) -> None:
+        with self._draw_lock:
+            if self._lines:
+                # 光标移回进度行的第一行，清除到屏幕末尾
+                self.stream.write(f"\x1b[{self._lines}F\x1b[J")
+                self.stream.flush()
+                self._lines = 0
+            stream.write(text)
+            stream.flush()
+            if self._last:
+                self._draw_locked(self._last)
+
+    def _run(self) -> None:
+        period = self.interval if self._interactive else self.log_interval
+        while not self._stop.wait(period):
+            self._draw(self.render())
+
+    def _draw(self, lines: List[str]) -> None:
+        with self._draw_lock:
+            self._draw_locked(lines)
+
+    def _draw_locked(self, lines: List[str]) -> None:
+        if self._interactive:
+            self._last = lines
+            # 光标移回上次绘制的第一行，逐行清除后重绘
+            up = f"\x1b[{self._lines}F" if self._lines else ""
+            text = up + "".join(f"\x1b[2K{line}\n" for line in lines)
+            self._lines = len(lines)
+        else:
+            text = "".join(f"Progress {line}\n" for line in lines if line)
+        self.stream.write(text)
+        self.stream.flush()
+
+    def render(self, now: Optional[float] = None) -> List[str]:
+        """返回每个步骤的一行进度；非终端输出时未开始和已报告过完成的步骤为空行。"""
+        now = time.perf_counter() if now is None else now
+        return [self._step_line(analyzer, now) for analyzer in self.analyzers]
+
+    def _rate(self, step: str, progress: StepProgress, now: float) -> float:
+        history = self._history.setdefault(step, deque())
+        history.append((now, progress.completed))
+        while len(history) > 2 and now - history[0][0] > self.window:
+            history.popleft()
+        start, completed = history[0]
+        if now - start < 1e-6 and progress.started is not None:
+            # 刚开始还没有窗口，按开始以来的平均值估计
+            start, completed = progress.started, 0
+        elapsed = now - start
+        return (progress.completed - completed) / elapsed if elapsed > 0 else 0.0
+
+    def _sources(self, analyzer) -> str:
+        scheduler = analyzer.scheduler
+        # 只有本地调度器能报告按数据源的运行和排队数（Celery 执行器没有）
+        if not hasattr(scheduler, "in_flight"):
+            return ""
+        running = scheduler.in_flight()
+        queued = scheduler.queue_depths()
+        parts = []
+        for source in dict.fromkeys(s.source_name for s in analyzer.strategies):
+            part = f"{source} {running.get(source, 0)}"
+            if queued.get(source):
+                part += f"+{queued[source]}q"
+            parts.append(part)
+        return "  ".join(parts)
+
+    def _step_line(self, analyzer, now: float) -> str:
+        step = analyzer.cache_prefix
+        progress: StepProgress = analyzer.progress
+        started = now if progress.started is None else progress.started
+        last = started if progress.last_completed is None else progress.last_completed
+        if progress.seen == 0:
+            if progress.input_done or not self._interactive:
+                return ""
+            return f"{step:<18} waiting"
+        if progress.input_done and progress.completed >= progress.seen:
+            if not self._interactive:
+                if step in self._reported:
+                    return ""
+                self._reported.add(step)
+            return (
+                f"{step:<18}{progress.completed:>7}/{progress.seen:<8} "
+                f"done in {_format_duration(last - started)}"
+            )
+
+        total = f"{progress.seen}{'' if progress.input_done else '+'}"
+        rate = self._rate(step, progress, now)
+        remaining = progress.seen - progress.completed
+        eta = _format_duration(remaining / rate) if rate > 0 else "--:--"
+        hit_rate = progress.cache_hits / progress.completed if progress.completed else 0
+        line = (
+            f"{step:<18}{progress.completed:>7}/{total:<8}"
+            f"{rate:>7.1f} items/s  ETA {eta}  cache {hit_rate:.0%}"
+        )
+        if remaining and now - last >= self.stall_after:
+            line += f"  stalled {now - last:.0f}s"
+        sources = self._sources(analyzer)
+        return f"{line}  {sources}" if sources else line
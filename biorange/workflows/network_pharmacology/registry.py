@@ -0,0 +1,59 @@
+"""
+按名称登记的数据获取策略。
+
+配置中通过名称选择每个分析步骤使用的策略，策略类在创建时才导入，未使用的
+数据源不会加载其依赖。
+
+函数:
+    register_strategy: 登记一个策略。
+    create_strategy: 按名称导入并实例化策略。
+"""
+
+from importlib import import_module
+from typing import Dict
+
+from biorange.workflows.network_pharmacology.abstract import BaseDataFetcher
+
+_STRATEGY_MODULE = "biorange.workflows.network_pharmacology.strategy"
+
+# 策略名称 -> "模块:类名"
+STRATEGIES: Dict[str, str] = {
+    "tcmsp": f"{_STRATEGY_MODULE}:TCMSPDrugComponentFinder",
+    "chembl": f"{_STRATEGY_MODULE}:CheMBLTargetPredictor",
+    "stitch": f"{_STRATEGY_MODULE}:STITCHTargetPredictor",
+    "tcmsp_local": f"{_STRATEGY_MODULE}:TCMSPTargetPredictor",
+    "genecards": f"{_STRATEGY_MODULE}:GenecardsTargetPredictor",
+    "omim": f"{_STRATEGY_MODULE}:OMIMTargetPredictor",
+    "ttd": f"{_STRATEGY_MODULE}:TTDTargetPredictor",
+}
+
+
+def register_strategy(name: str, target: str) -> None:
+    """登记一个策略。
+
+    Args:
+        name (str): 策略名称。
+        target (str): ``"模块:类名"`` 形式的策略类路径。
+    """
+    STRATEGIES[name] = target
+
+
+def create_strategy(name: str) -> BaseDataFetcher:
+    """按名称导入并实例化策略。
+
+    Args:
+        name (str): 策略名称。
+
+    Returns:
+        BaseDataFetcher: 策略实例。
+
+    Raises:
+        ValueError: 名称未登记。
+    """
+    try:
+        module_name, class_name = STRATEGIES[name].split(":")
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown strategy {name!r}, available: {', '.join(sorted(STRATEGIES))}"
+        ) from e
+    return getattr(import_module(module_name), class_name)()
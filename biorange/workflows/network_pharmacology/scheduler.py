@@ -0,0 +1,331 @@
+"""
+网络药理学工作流共享的有界任务调度器。
+
+所有分析器把任务提交到同一个 `TaskScheduler`：
+
+- 全局上限：底层只有一个线程池，线程数固定为 `max_workers`。
+- 按数据源限流：每个数据源同时运行的任务数不超过其上限，超出的任务在调度器
+  内部排队，而不是占着工作线程阻塞等待，因此不会因嵌套提交而死锁。
+- 计算密集型任务：受 GIL 限制的任务通过 `submit_batched` 提交，按批次交给
+  进程池执行，一次进程间通信处理一批输入。worker 在每批中更新的计数器、直方图
+  和记录的区间随结果返回，并入本进程的指标登记表和区间记录器；worker 中的
+  熔断器各自独立，状态不会回到本进程，也不出现在性能清单中。worker 是新启动的
+  进程，不继承本进程的配置，需要的配置由 `initializer` 在 worker 中重新设置。
+
+类:
+    TaskScheduler: 有全局上限和按数据源上限的任务调度器。
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from biorange.core.logger import LogManager, forward_worker_logs, get_logger
+from biorange.core.telemetry import get_metrics_registry, get_tracer
+from biorange.workflows.executor import TaskExecutor
+
+logger = get_logger(__name__)
+
+_Task = Tuple[Future, Optional[Callable[[], None]], Callable, tuple, dict]
+
+
+def _run_batch(fn: Callable[[Sequence[Any]], List[Any]], items, trace: bool):
+    """worker 端：执行一批输入，连同这一批更新的指标和记录的区间一起返回。"""
+    registry, tracer = get_metrics_registry(), get_tracer()
+    registry.reset()
+    tracer.reset()
+    tracer.enabled = trace
+    results = fn(items)
+    return results, registry.collect(), tracer.export()
+
+
+def _init_worker(log_queue, initializer, initargs) -> None:
+    """worker 启动时：日志发回主进程，再执行调用方给出的初始化函数。"""
+    forward_worker_logs(log_queue)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class _Batch:
+    """同一个数据源、同一个批处理函数的待提交输入。"""
+
+    def __init__(self, source: str, fn: Callable[[Sequence[Any]], List[Any]]):
+        self.source = source
+        self.fn = fn
+        self.items: List[Any] = []
+        self.futures: List[Future] = []
+
+
+class TaskScheduler(TaskExecutor):
+    """有全局上限和按数据源上限的任务调度器（本地执行器）。
+
+    Attributes:
+        max_workers (int): 全局并发上限（线程数）。
+        source_limits (Dict[str, int]): 按数据源的并发上限，未配置的数据源使用
+            `default_source_limit`。
+        process_workers (int): 进程池大小，默认为 CPU 核数。
+        chunk_size (int): 计算密集型任务每批的输入数。
+        initializer (Optional[Callable]): 每个进程池 worker 启动时执行的函数，
+            用于设置数据源地址、中间结果存储等进程级配置，必须可以被 pickle。
+        initargs (tuple): `initializer` 的参数，必须可以被 pickle。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        source_limits: Optional[Dict[str, int]] = None,
+        default_source_limit: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        chunk_size: int = 32,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+    ):
+        self.max_workers = max_workers
+        self.source_limits = dict(source_limits or {})
+        self.default_source_limit = default_source_limit or max_workers
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Deque[_Task]] = {}
+        self._running: Dict[str, int] = {}
+        self._batches: Dict[Tuple[str, Any], _Batch] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # 首次提交时才创建线程池
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="biorange"
+            )
+        return self._executor
+
+    def limit_for(self, source: str) -> int:
+        return self.source_limits.get(source, self.default_source_limit)
+
+    def submit(self, source: str, fn: Callable, *args, **kwargs) -> Future:
+        """提交任务。
+
+        Args:
+            source (str): 任务所属的数据源，用于按数据源限流。
+            fn (Callable): 要执行的函数。
+            *args: 位置参数。
+            **kwargs: 关键字参数。
+
+        Returns:
+            Future: 任务的 Future，结果或异常与 `fn` 一致。
+        """
+        return self.submit_timed(source, None, fn, *args, **kwargs)
+
+    def submit_timed(
+        self,
+        source: str,
+        on_start: Optional[Callable[[], None]],
+        fn: Callable,
+        *args,
+        **kwargs,
+    ) -> Future:
+        """提交任务，任务离开队列、开始运行时调用 `on_start`（排队时间不计入）。"""
+        future: Future = Future()
+        task = (future, on_start, fn, args, kwargs)
+        with self._lock:
+            self._pending.setdefault(source, deque()).append(task)
+            self._dispatch(source)
+        return future
+
+    def _dispatch(self, source: str) -> None:
+        """在持有锁的情况下，把排队任务交给线程池，直到达到数据源上限。"""
+        queue = self._pending.get(source)
+        limit = self.limit_for(source)
+        while queue and self._running.get(source, 0) < limit:
+            task = queue.popleft()
+            if not task[0].set_running_or_notify_cancel():
+                continue
+            self._running[source] = self._running.get(source, 0) + 1
+            self._get_executor().submit(self._run, source, *task)
+
+    def _run(self, source, future, on_start, fn, args, kwargs) -> None:
+        try:
+            if on_start is not None:
+                on_start()
+            result = fn(*args, **kwargs)
+        except BaseException as e:  # 异常交给调用方处理
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._running[source] -= 1
+                self._dispatch(source)
+
+    def _get_process_executor(self) -> ProcessPoolExecutor:
+        if self._process_executor is None:
+            # 不用 fork 启动 worker：fork 出的子进程会继承其他线程此刻持有的锁
+            # （日志、缓存、熔断器等），这些锁在子进程中永远不会被释放
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            # worker 的日志记录发送回本进程，由这里的处理器统一输出
+            log_queue = LogManager().worker_log_queue(context)
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(log_queue, self.initializer, self.initargs),
+            )
+        return self._process_executor
+
+    def submit_batched(
+        self, source: str, fn: Callable[[Sequence[Any]], List[Any]], item: Any
+    ) -> Future:
+        """提交计算密集型任务，按批次在进程池中执行。
+
+        同一个数据源、同一个批处理函数的输入攒够 `chunk_size` 个后作为一批
+        提交；不足一批的输入在调用 `flush()` 时提交。
+
+        Args:
+            source (str): 任务所属的数据源。
+            fn (Callable[[Sequence[Any]], List[Any]]): 批处理函数，接收一批输入，
+                按相同顺序返回每个输入的结果。必须可以被 pickle。
+            item (Any): 输入。
+
+        Returns:
+            Future: 该输入的结果。
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        key = (source, fn)
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(source, fn)
+            batch.items.append(item)
+            batch.futures.append(future)
+            if len(batch.items) >= self.chunk_size:
+                del self._batches[key]
+            else:
+                batch = None
+        if batch is not None:
+            self._submit_batch(batch)
+        return future
+
+    def flush(self) -> None:
+        """提交所有不足一批的计算密集型任务。"""
+        with self._lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+        for batch in batches:
+            self._submit_batch(batch)
+
+    def _submit_batch(self, batch: _Batch) -> None:
+        try:
+            result = self._get_process_executor().submit(
+                _run_batch, batch.fn, batch.items, get_tracer().enabled
+            )
+        except Exception as e:  # 进程池不可用时，把异常交给每个输入
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+
+        def distribute(done: Future) -> None:
+            exception = done.exception()
+            if exception is None:
+                results, metrics, events = done.result()
+                get_metrics_registry().merge(metrics)
+                get_tracer().merge(events)
+                if len(results) != len(batch.futures):
+                    exception = ValueError(
+                        f"Batch for {batch.source} returned {len(results)} "
+                        f"results for {len(batch.futures)} inputs"
+                    )
+            if exception is not None:
+                for future in batch.futures:
+                    future.set_exception(exception)
+                return
+            for future, value in zip(batch.futures, results):
+                future.set_result(value)
+
+        result.add_done_callback(distribute)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """返回每个数据源排队中的任务数。"""
+        with self._lock:
+            return {source: len(queue) for source, queue in self._pending.items()}
+
+    def in_flight(self) -> Dict[str, int]:
+        """返回每个数据源运行中的任务数。"""
+        with self._lock:
+            return dict(self._running)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait)
+            self._process_executor = None
+
+
+_scheduler: Optional[TaskScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> TaskScheduler:
+    """返回进程级共享的调度器（首次调用时创建）。"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = TaskScheduler()
+    return _scheduler
+
+
+def _shared_samples(view: Callable[[TaskScheduler], Dict[str, int]]):
+    # 导出时读取共享调度器的当前状态，调度器重建后自动跟随
+    def samples() -> Dict[Tuple[str, ...], float]:
+        scheduler = _scheduler
+        if scheduler is None:
+            return {}
+        return {(source,): count for source, count in view(scheduler).items()}
+
+    return samples
+
+
+_metrics = get_metrics_registry()
+_metrics.gauge(
+    "biorange_scheduler_queued", "Tasks queued in the shared scheduler", ("source",)
+).set_function(_shared_samples(TaskScheduler.queue_depths))
+_metrics.gauge(
+    "biorange_scheduler_running", "Tasks running in the shared scheduler", ("source",)
+).set_function(_shared_samples(TaskScheduler.in_flight))
+
+
+def configure_scheduler(
+    max_workers: int,
+    source_limits: Optional[Dict[str, int]] = None,
+    process_workers: Optional[int] = None,
+    chunk_size: int = 32,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+) -> TaskScheduler:
+    """按配置重建进程级共享的调度器，参数见 `TaskScheduler`。"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.shutdown(wait=False)
+        _scheduler = TaskScheduler(
+            max_workers,
+            source_limits,
+            process_workers=process_workers,
+            chunk_size=chunk_size,
+            initializer=initializer,
+            initargs=initargs,
+        )
+    return _scheduler
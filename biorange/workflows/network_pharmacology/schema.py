@@ -0,0 +1,142 @@
+"""
+各分析步骤输出的列定义与类型。
+
+`source`、`targets`、`name` 等列在大规模运行中大量重复，按对象类型保存时
+每个单元格都是一个 Python 字符串。这里为每个步骤定义固定的输出列和类型：
+
+- ``category``：重复度高的列（数据源、靶点基因、疾病名等），每个取值只保存
+  一次，行中只存整数编码。编码由各 DataFrame 自己的类别决定，合并时会重排，
+  不能当作稳定的基因编号使用；
+- ``string``：几乎不重复的列（成分名、InChIKey 等），安装了 pyarrow 时使用
+  Arrow 字符串；
+- ``float``：数值列。
+
+每个策略在 `normalize` 中通过 `self.schema.conform` 把结果转换为该步骤的
+类型，合并时通过 `concat` 先统一分类，避免 `pd.concat` 退化为对象类型。
+
+类:
+    StepSchema: 一个分析步骤的输出列定义。
+"""
+
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from biorange.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:  # pragma: no cover - 没有 pyarrow 时退回 Python 字符串
+    STRING_DTYPE = "string"
+
+
+class StepSchema:
+    """一个分析步骤的输出列定义。
+
+    Attributes:
+        name (str): 步骤名称。
+        columns (Dict[str, str]): 列名到类型（``category``/``string``/``float``）
+            的映射，顺序即输出列的顺序。
+    """
+
+    def __init__(self, name: str, columns: Dict[str, str]):
+        self.name = name
+        self.columns = dict(columns)
+        self._dropped: Set[str] = set()
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def conform(self, data: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """按列定义选择、补齐并转换列类型。
+
+        多余的列被丢弃（每个列名第一次出现时记录警告），缺少的列补为缺失值。
+
+        Args:
+            data (Optional[pd.DataFrame]): 规范化前的数据。
+
+        Returns:
+            pd.DataFrame: 列和类型都符合定义的数据。
+        """
+        if data is None:
+            data = pd.DataFrame()
+        extra = [column for column in data.columns if column not in self.columns]
+        if extra:
+            self._warn_dropped(extra)
+        data = data.reindex(columns=self.column_names)
+        return pd.DataFrame(
+            {
+                column: self._cast(data[column], kind)
+                for column, kind in self.columns.items()
+            },
+            index=data.index,
+        )
+
+    def _warn_dropped(self, columns: List[str]) -> None:
+        # conform 对每个输入项都会调用，同一列只提醒一次
+        new = [column for column in columns if column not in self._dropped]
+        if new:
+            self._dropped.update(new)
+            logger.warning(
+                "Dropping columns not in the %s schema: %s",
+                self.name,
+                ", ".join(map(str, new)),
+            )
+
+    @staticmethod
+    def _cast(values: pd.Series, kind: str) -> pd.Series:
+        if kind == "category":
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                return values
+            return values.astype("object").astype("category")
+        if kind == "float":
+            return pd.to_numeric(values, errors="coerce").astype("float64")
+        if kind == "string":
+            return values.astype(STRING_DTYPE)
+        raise ValueError(f"Unknown column kind: {kind}")
+
+    def empty(self) -> pd.DataFrame:
+        """只有列、没有数据的结果。"""
+        return self.conform(pd.DataFrame())
+
+    def concat(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """合并多个结果，分类列先统一类别，合并后仍为分类类型。"""
+        frames = [self.conform(frame) for frame in frames]
+        if not frames:
+            return self.empty()
+        for column, kind in self.columns.items():
+            if kind != "category":
+                continue
+            categories = union_categoricals(
+                [frame[column] for frame in frames], ignore_order=True
+            ).categories
+            for frame in frames:
+                frame[column] = frame[column].cat.set_categories(categories)
+        return pd.concat(frames, ignore_index=True)
+
+
+COMPONENTS = StepSchema(
+    "components",
+    {
+        "component_name": "string",
+        "smiles": "string",
+        "inchikey": "string",
+        "oral_bioavailability": "float",
+        "drug_likeness": "float",
+    },
+)
+
+TARGETS = StepSchema(
+    "targets", {"smiles": "category", "targets": "category", "source": "category"}
+)
+
+DISEASE_TARGETS = StepSchema(
+    "disease_targets",
+    {"name": "category", "target_name": "category", "source": "category"},
+)
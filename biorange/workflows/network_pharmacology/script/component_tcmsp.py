@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright
 
 from biorange.core.logger import get_logger
+from biorange.core.network import get_http_client, get_source_url
 
 logger = get_logger(__name__)
 
@@ -34,7 +35,7 @@ class TCMSPComponentScraper:
                 "使用远程 Playwright 服务。确保你已在远程运行：playwright run-server --host 0.0.0.0 --port 1985"
             )
             logger.info(
-                f"或docker run -it --rm -p 1985:1985 --ipc=host august777/playwright-server:v1.46.0-jammy"
+                "或docker run -it --rm -p 1985:1985 --ipc=host august777/playwright-server:v1.46.0-jammy"
             )
         else:
             logger.info("使用本地 Playwright。确保你已安装：pip install playwright")
@@ -56,8 +57,9 @@ class TCMSPComponentScraper:
             else:
                 browser = p.chromium.launch(headless=True)
 
+            base_url = get_source_url("tcmsp")
             page = browser.new_page()
-            page.goto("https://old.tcmsp-e.com/browse.php?qc=herbs")
+            page.goto(f"{base_url}/browse.php?qc=herbs")
 
             # 在搜索框中输入搜索词
             page.fill("#inputVarTcm", search_term)
@@ -76,8 +78,8 @@ class TCMSPComponentScraper:
             browser.close()
 
             if href:
-                result_url = f"https://old.tcmsp-e.com/{href}"
-                logger.info(f"成功获取搜索结果的URL: {result_url}")
+                result_url = f"{base_url}/{href}"
+                logger.info("成功获取搜索结果的URL: %s", result_url)
                 return result_url
             else:
                 logger.error("未能获取搜索结果的URL")
@@ -94,12 +96,12 @@ class TCMSPComponentScraper:
             str: 网页的HTML内容。
         """
         try:
-            response = requests.get(url)
+            response = get_http_client().get(url)
             response.raise_for_status()
-            logger.info(f"成功获取网页内容: {url}")
+            logger.info("成功获取网页内容: %s", url)
             return response.text
         except requests.RequestException as e:
-            logger.error(f"获取网页内容时出错: {e}")
+            logger.error("获取网页内容时出错: %s", e)
             raise
 
     def extract_json_data(self, html_content: str) -> Optional[List[Dict[str, Any]]]:
@@ -131,7 +133,7 @@ class TCMSPComponentScraper:
             logger.info("成功提取并解析JSON数据")
             return json_data
         except json.JSONDecodeError as e:
-            logger.error(f"JSON解析错误: {e}")
+            logger.error("JSON解析错误: %s", e)
             return None
 
     def convert_to_dataframe(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -149,7 +151,7 @@ class TCMSPComponentScraper:
             logger.info("成功将数据转换为DataFrame")
             return df
         except Exception as e:
-            logger.error(f"数据转换为DataFrame时出错: {e}")
+            logger.error("数据转换为DataFrame时出错: %s", e)
             raise
 
     def search_herb(self, herb_name: str) -> pd.DataFrame:
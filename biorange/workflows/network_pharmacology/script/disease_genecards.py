@@ -4,6 +4,7 @@ import pandas as pd
 from playwright.sync_api import sync_playwright
 
 from biorange.core.logger import get_logger
+from biorange.core.network import get_source_url
 from biorange.core.utils.package_fileload import get_data_file_path
 
 logger = get_logger(__name__)
@@ -82,7 +83,7 @@ class GenecardsDiseaseScraper:
                 }
             )
             # 构建完整的URL并导航
-            url = f"https://www.genecards.org/Search/Keyword?queryString={query_string}"
+            url = f"{get_source_url('genecards')}/Search/Keyword?queryString={query_string}"
             self.page.goto(url)
             print("Page loaded.")
             # 手动登录
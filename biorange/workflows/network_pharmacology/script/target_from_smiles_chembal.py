@@ -8,36 +8,35 @@ from xml.etree import ElementTree
 
 import pandas as pd
 import requests
-from requests.adapters import HTTPAdapter, Retry
 
 from biorange.core.logger import get_logger
+from biorange.core.network import get_http_client, get_source_url
 
 logger = get_logger(__name__)
 
 # Constants
 POLLING_INTERVAL = 3
-API_URL = "https://rest.uniprot.org"
-
-# Retry strategy for requests
-retries = Retry(total=5, backoff_factor=0.25, status_forcelist=[500, 502, 503, 504])
-session = requests.Session()
-session.mount("https://", HTTPAdapter(max_retries=retries))
 
 
 class ChEMBLTargetScraper:
     def __init__(self):
-        self.session = session
+        # 共享客户端：重试策略 + 按主机限流与自适应并发
+        self.session = get_http_client()
+        # UniProt ID 映射接口地址，可通过配置指向本地替身服务
+        self.api_url = get_source_url("uniprot")
 
     def check_response(self, response: requests.Response) -> None:
         try:
             response.raise_for_status()
         except requests.HTTPError as e:
-            logger.error(f"HTTPError: {e.response.json()}")
+            logger.error("HTTPError: %s", e.response.json())
             raise
 
     def submit_id_mapping(self, from_db: str, to_db: str, ids: List[str]) -> str:
+        # UniProt 的映射任务会过期，每次都重新提交，不缓存任务 ID；
+        # 任务的状态、详情和结果页也只属于这一次提交，同样不缓存
         response = self.session.post(
-            f"{API_URL}/idmapping/run",
+            f"{self.api_url}/idmapping/run",
             data={"from": from_db, "to": to_db, "ids": ",".join(ids)},
             timeout=600,
         )
@@ -52,11 +51,13 @@ class ChEMBLTargetScraper:
 
     def check_id_mapping_results_ready(self, job_id: str) -> bool:
         while True:
-            response = self.session.get(f"{API_URL}/idmapping/status/{job_id}")
+            response = self.session.get(
+                f"{self.api_url}/idmapping/status/{job_id}", cache=False
+            )
             self.check_response(response)
             status = response.json().get("jobStatus")
             if status == "RUNNING":
-                logger.info(f"Retrying in {POLLING_INTERVAL}s")
+                logger.info("Retrying in %ss", POLLING_INTERVAL)
                 time.sleep(POLLING_INTERVAL)
             elif status:
                 raise Exception(status)
@@ -69,7 +70,7 @@ class ChEMBLTargetScraper:
         self, batch_url: str, file_format: str, compressed: bool
     ) -> Generator[Union[Dict[str, Any], List[str]], None, None]:
         while batch_url:
-            response = self.session.get(batch_url)
+            response = self.session.get(batch_url, cache=False)
             self.check_response(response)
             yield self.decode_results(response, file_format, compressed)
             batch_url = self.get_next_link(response.headers)
@@ -93,7 +94,9 @@ class ChEMBLTargetScraper:
         return all_results
 
     def get_id_mapping_results_link(self, job_id: str) -> str:
-        response = self.session.get(f"{API_URL}/idmapping/details/{job_id}")
+        response = self.session.get(
+            f"{self.api_url}/idmapping/details/{job_id}", cache=False
+        )
         self.check_response(response)
         return response.json()["redirectURL"]
 
@@ -129,7 +132,7 @@ class ChEMBLTargetScraper:
 
     def print_progress_batches(self, batch_index: int, size: int, total: int) -> None:
         n_fetched = min((batch_index + 1) * size, total)
-        logger.info(f"Fetched: {n_fetched} / {total}")
+        logger.info("Fetched: %s / %s", n_fetched, total)
 
     def get_id_mapping_results_search(self, url: str) -> Union[Dict[str, Any], str]:
         parsed = urlparse(url)
@@ -140,7 +143,7 @@ class ChEMBLTargetScraper:
         parsed = parsed._replace(query=urlencode(query, doseq=True))
         url = parsed.geturl()
 
-        response = self.session.get(url)
+        response = self.session.get(url, cache=False)
         self.check_response(response)
         results = self.decode_results(response, file_format, compressed)
         total = int(response.headers["x-total-results"])
@@ -162,7 +165,7 @@ class ChEMBLTargetScraper:
     ) -> Union[Dict[str, Any], List[str]]:
         if "/stream/" not in url:
             url = url.replace("/results/", "/results/stream/")
-        response = self.session.get(url)
+        response = self.session.get(url, cache=False)
         self.check_response(response)
         parsed = urlparse(url)
         query = parse_qs(parsed.query)
@@ -204,17 +207,18 @@ class ChEMBLTargetScraper:
             smiles (str): 化合物的SMILES表示。
 
         Returns:
-            pd.DataFrame: 包含目标预测结果的DataFrame。如果请求失败，返回空DataFrame。
+            pd.DataFrame: 包含目标预测结果的DataFrame。
 
         Raises:
-            requests.exceptions.RequestException: 如果API请求失败。
+            requests.exceptions.RequestException: 如果API请求失败。失败会继续向上抛出，
+                由调用方的熔断器统计连续失败次数。
         """
-        url = "https://www.ebi.ac.uk/chembl/target-predictions"
+        url = f"{get_source_url('chembl')}/target-predictions"
         headers = {"Content-Type": "application/json"}
         payload = {"smiles": smiles}
         try:
             response = self.session.post(
-                url, headers=headers, json=payload, timeout=600
+                url, headers=headers, json=payload, timeout=600, cache=True
             )
             self.check_response(response)
             data = response.json()
@@ -222,8 +226,8 @@ class ChEMBLTargetScraper:
             result_df.insert(0, "smiles", smiles)
             return result_df
         except requests.exceptions.RequestException as e:
-            logger.error(f"Returning empty DataFrame for {smiles} with error: {e}")
-            return pd.DataFrame()
+            logger.error("Target prediction failed for %s: %s", smiles, e)
+            raise
 
     def search_smiles(self, smiles: str) -> pd.DataFrame:
         df_predictions = self.get_target_predictions(smiles)
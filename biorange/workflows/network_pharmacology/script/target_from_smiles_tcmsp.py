@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pandas as pd
 
 from biorange.core.logger import get_logger
@@ -12,30 +14,33 @@ class TCMSPTargetScraper:
         self.molecules_df = pd.read_csv(get_data_file_path(molecules_csv))
         self.targets_df = pd.read_csv(get_data_file_path(targets_csv))
         self.merged_df = self._merge_dataframes()
+        # SMILES -> 行号的索引，查询时不再整表扫描
+        self.smiles_index = self.merged_df.groupby("smiles").indices
 
     def _merge_dataframes(self):
         logger.info("Merging molecules and targets dataframes")
         merged_df = self.molecules_df.merge(
             self.targets_df, left_on="molecule_ID", right_on="molecule_ID", how="left"
         )
-        logger.debug(f"Merged dataframe shape: {merged_df.shape}")
+        logger.debug("Merged dataframe shape: %s", merged_df.shape)
         return merged_df
 
     def search_smiles(self, input_smiles):
-        logger.info(f"Searching for SMILES: {input_smiles}")
+        logger.info("Searching for SMILES: %s", input_smiles)
 
         # 筛选输入的smiles
-        filtered_df = self.merged_df[self.merged_df["smiles"] == input_smiles].copy()
+        rows = self.smiles_index.get(input_smiles, [])
+        filtered_df = self.merged_df.iloc[rows].copy()
         filtered_df["source"] = "TCMSP"
 
         if filtered_df.empty:
-            logger.warning(f"No matches found for SMILES: {input_smiles}")
+            logger.warning("No matches found for SMILES: %s", input_smiles)
             # 如果没有匹配的smiles
             results_df = pd.DataFrame(
                 {"smiles": [input_smiles], "targets": [None], "source": ["TCMSP"]}
             )
         else:
-            logger.info(f"Matches found for SMILES: {input_smiles}")
+            logger.info("Matches found for SMILES: %s", input_smiles)
             # 选择需要的列并重命名
             results_df = filtered_df[["smiles", "Gene Names", "source"]].rename(
                 columns={"Gene Names": "targets"}
@@ -44,6 +49,12 @@ class TCMSPTargetScraper:
         return results_df
 
 
+@lru_cache(maxsize=None)
+def get_tcmsp_target_scraper() -> TCMSPTargetScraper:
+    """返回本进程共享的 TCMSPTargetScraper，数据表只加载一次。"""
+    return TCMSPTargetScraper()
+
+
 # 示例使用
 if __name__ == "__main__":
     searcher = TCMSPTargetScraper()
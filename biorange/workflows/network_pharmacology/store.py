@@ -0,0 +1,203 @@
+"""
+按内容寻址的中间结果存储。
+
+策略的每个查询结果以 (策略标识, 策略代码, 参数, 输入) 的哈希为键保存：
+
+- 键与输入的字符无关，SMILES 中的 ``/``、``\\``、``#`` 等不会影响文件名；
+- 策略代码或参数变化后键随之变化，旧结果自然失效；
+- 所有条目记录在一个 ``manifest.jsonl`` 索引中，启动时读一次，之后判断是否
+  命中只查内存中的索引，不再为每个输入项访问文件系统；
+- 进程池中的 worker 由调度器的初始化函数配置为同一个存储目录，与主进程追加
+  同一个索引，每次追加都持有文件锁，各进程写入的行不会交错。各进程的内存索引
+  只包含启动时读到的和自己写入的条目，其他进程新写入的条目下次加载时才可见；
+- 结果以 Parquet 保存，分类、字符串和数值类型可以原样往返；没有 pyarrow
+  或数据无法写成 Parquet 时退回 pickle。
+
+类:
+    IntermediateStore: 按内容寻址的中间结果存储。
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+
+from biorange.core.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 没有 fcntl
+    fcntl = None
+    import msvcrt
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_DIR = "./results/.store"
+
+
+def make_key(identity: str, params: Dict[str, Any], item: str) -> str:
+    """计算一个查询结果的键。
+
+    Args:
+        identity (str): 策略标识（含代码哈希）。
+        params (Dict[str, Any]): 影响结果的参数。
+        item (str): 输入项。
+
+    Returns:
+        str: 十六进制的 SHA-256 摘要。
+    """
+    payload = json.dumps(
+        {"identity": identity, "params": params, "item": item},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _append_locked(path: Path, line: str) -> None:
+    """持有文件锁追加一行，多个进程同时追加同一文件时各行保持完整。"""
+    with open(path, "a", encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows 上锁住第一个字节
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            f.write(line)
+            f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:  # pragma: no cover
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _dtype_name(dtype) -> str:
+    if isinstance(dtype, pd.StringDtype):
+        return f"string[{dtype.storage}]"
+    return str(dtype)
+
+
+class IntermediateStore:
+    """按内容寻址的中间结果存储。
+
+    Attributes:
+        root (Path): 存储目录。
+        manifest_path (Path): 索引文件路径。
+    """
+
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / self.MANIFEST
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:  # 写到一半中断的最后一行
+                    continue
+                self._index[entry["key"]] = entry
+        logger.debug("Loaded %d entries from %s", len(self._index), self.manifest_path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """读取一个结果，未命中时返回 None。"""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        path = self.root / entry["path"]
+        try:
+            if entry["format"] != "parquet":
+                return pd.read_pickle(path)
+            data = pd.read_parquet(path)
+        except FileNotFoundError:
+            # 数据文件被手动删除，按未命中处理
+            logger.warning("Payload %s for %s is missing", path, entry.get("item"))
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+        # Parquet 不区分 pandas 字符串类型的存储方式，按写入时的类型还原
+        for column, dtype in entry.get("dtypes", {}).items():
+            if column in data and _dtype_name(data[column].dtype) != dtype:
+                data[column] = data[column].astype(dtype)
+        return data
+
+    def put(
+        self, key: str, data: pd.DataFrame, meta: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """保存一个结果：先原子地写数据文件，再追加索引。
+
+        Args:
+            key (str): `make_key` 计算的键。
+            data (pd.DataFrame): 结果。
+            meta (Optional[Dict[str, Any]]): 记入索引的附加信息（策略、输入项等）。
+        """
+        directory = self.root / key[:2]
+        directory.mkdir(parents=True, exist_ok=True)
+        fmt, path = self._write_payload(directory, key, data)
+        entry = {
+            "key": key,
+            "path": path.relative_to(self.root).as_posix(),
+            "format": fmt,
+            "rows": len(data),
+            "dtypes": {str(c): _dtype_name(t) for c, t in data.dtypes.items()},
+            "time": time.time(),
+            **(meta or {}),
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            _append_locked(self.manifest_path, line)
+            self._index[key] = entry
+
+    @staticmethod
+    def _write_payload(directory: Path, key: str, data: pd.DataFrame):
+        tmp = directory / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data.to_parquet(tmp, index=False)
+            fmt, path = "parquet", directory / f"{key}.parquet"
+        except Exception:  # 没有 pyarrow，或列中有无法写成 Parquet 的对象
+            data.to_pickle(tmp)
+            fmt, path = "pickle", directory / f"{key}.pkl"
+        os.replace(tmp, path)
+        return fmt, path
+
+
+_stores: Dict[Path, IntermediateStore] = {}
+_store_dir: Union[str, Path] = DEFAULT_STORE_DIR
+_stores_lock = threading.Lock()
+
+
+def configure_intermediate_store(root: Union[str, Path]) -> None:
+    """设置中间结果存储的目录。"""
+    global _store_dir
+    _store_dir = root
+
+
+def get_intermediate_store() -> IntermediateStore:
+    """返回当前目录下的中间结果存储，每个目录只加载一次索引。"""
+    root = Path(os.path.abspath(_store_dir))  # 不访问文件系统
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = IntermediateStore(root)
+        return store
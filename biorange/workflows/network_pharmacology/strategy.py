@@ -11,17 +11,13 @@ Classes:
     TTDTargetPredictor: 
 """
 
-# TODO 以后要实现延迟导入
 import pandas as pd
 
 # Import abstract base classes for different types of predictors
 from .abstract import ComponentTargetPredictor, DiseaseTargetFinder, DrugComponentFinder
-from .script.component_tcmsp_local import TCMSPComponentLocalScraper
-from .script.disease_genecards import GenecardsDiseaseScraper
-from .script.disease_omim import OmimDiseaseScraper
-from .script.disease_ttd import TTDDiseaseScraper
-from .script.target_from_smiles_chembal import ChEMBLTargetScraper
-from .script.target_from_smiles_tcmsp import TCMSPTargetScraper
+
+# Scrapers pull in Playwright, BeautifulSoup, requests and local tables, so each
+# one is imported inside the query that uses it.
 
 # Implement specific strategies for querying and normalizing data from different databases
 
@@ -31,6 +27,9 @@ class TCMSPDrugComponentFinder(DrugComponentFinder):
     A concrete implementation of DrugComponentFinder for querying the TCMSP database.
     """
 
+    source = "tcmsp"
+    uses_browser = True
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the TCMSP database for components of a given drug.
@@ -46,6 +45,8 @@ class TCMSPDrugComponentFinder(DrugComponentFinder):
 
         self.logger.info("query %s from TCMSP", name)
         # 实现 TCMSP 数据库查询逻辑
+        from .script.component_tcmsp_local import TCMSPComponentLocalScraper
+
         data = TCMSPComponentLocalScraper(use_remote=True).search_herb(name)
         # MOL_ID,pubchem_cid,molecule_ID,molecule_name,tpsa,rbn,
         # inchikey,ob,dl,bbb,caco2,mw,hdon,hacc,alogp,halflife,FASA
@@ -70,8 +71,8 @@ class TCMSPDrugComponentFinder(DrugComponentFinder):
             "dl": "drug_likeness",
         }
 
-        # 重命名的时候顺手过滤了
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        # 重命名后按成分表的列定义过滤并转换类型
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
     def post_process(self, data: pd.DataFrame) -> pd.DataFrame:
         """负责过滤等操作的钩子"""
@@ -115,6 +116,8 @@ class CheMBLTargetPredictor(ComponentTargetPredictor):
     A concrete implementation of ComponentTargetPredictor for querying the CheMBL database.
     """
 
+    source = "chembl"
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the CheMBL database for targets of a given component.
@@ -128,6 +131,8 @@ class CheMBLTargetPredictor(ComponentTargetPredictor):
             pd.DataFrame: DataFrame containing the queried targets.
         """
         # Implement CheMBL database query logic here
+        from .script.target_from_smiles_chembal import ChEMBLTargetScraper
+
         return ChEMBLTargetScraper().search_smiles(name)
 
     def normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
@@ -147,10 +152,7 @@ class CheMBLTargetPredictor(ComponentTargetPredictor):
             "gene_name": "targets",
             "source": "source",
         }
-        if raw_data.empty:
-            return pd.DataFrame(columns=list(column_mapping.values()))
-
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
 
 # TODO stich
@@ -159,6 +161,8 @@ class STITCHTargetPredictor(ComponentTargetPredictor):
     A concrete implementation of ComponentTargetPredictor for querying the STITCH database.
     """
 
+    source = "stitch"
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the STITCH database for targets of a given component.
@@ -197,10 +201,7 @@ class STITCHTargetPredictor(ComponentTargetPredictor):
             "gene_name": "targets",
             "source": "source",
         }
-        if raw_data.empty:
-            return pd.DataFrame(columns=list(column_mapping.values()))
-
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
 
 class TCMSPTargetPredictor(ComponentTargetPredictor):
@@ -208,6 +209,10 @@ class TCMSPTargetPredictor(ComponentTargetPredictor):
     A concrete implementation of ComponentTargetPredictor for querying the TCMSP database.
     """
 
+    # 按 SMILES 索引查表，每项约 3 ms，不声明 cpu_bound：放进进程池时每个
+    # worker 都要重新加载数据表，结果 DataFrame 还要序列化回主进程，实测更慢
+    source = "tcmsp_local"
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the TCMSP database for targets of a given component.
@@ -220,8 +225,10 @@ class TCMSPTargetPredictor(ComponentTargetPredictor):
         Returns:
             pd.DataFrame: DataFrame containing the queried targets.
         """
-        # Implement TCMSP database query logic here
-        return TCMSPTargetScraper().search_smiles(name)
+        # The scraper loads and merges the local tables once per process
+        from .script.target_from_smiles_tcmsp import get_tcmsp_target_scraper
+
+        return get_tcmsp_target_scraper().search_smiles(name)
 
     def normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
 
@@ -230,10 +237,7 @@ class TCMSPTargetPredictor(ComponentTargetPredictor):
             "targets": "targets",
             "source": "source",
         }
-        if raw_data.empty:
-            return pd.DataFrame(columns=list(column_mapping.values()))
-
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
 
 class GenecardsTargetPredictor(DiseaseTargetFinder):
@@ -241,6 +245,9 @@ class GenecardsTargetPredictor(DiseaseTargetFinder):
     A concrete implementation of DiseaseTargetFinder for querying the Genecards database.
     """
 
+    source = "genecards"
+    uses_browser = True
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the Genecards database for targets associated with a given disease.
@@ -254,6 +261,8 @@ class GenecardsTargetPredictor(DiseaseTargetFinder):
             pd.DataFrame: DataFrame containing the queried targets.
         """
         # Implement Genecards database query logic here
+        from .script.disease_genecards import GenecardsDiseaseScraper
+
         return GenecardsDiseaseScraper().search(name)
 
     def normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
@@ -271,7 +280,7 @@ class GenecardsTargetPredictor(DiseaseTargetFinder):
             "dis_targets": "target_name",
             "source": "source",
         }
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
 
 class OMIMTargetPredictor(DiseaseTargetFinder):
@@ -279,6 +288,8 @@ class OMIMTargetPredictor(DiseaseTargetFinder):
     A concrete implementation of DiseaseTargetFinder for querying the OMIM database.
     """
 
+    source = "omim"
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the OMIM database for targets associated with a given disease.
@@ -292,6 +303,8 @@ class OMIMTargetPredictor(DiseaseTargetFinder):
             pd.DataFrame: DataFrame containing the queried targets.
         """
         # Implement OMIM database query logic here
+        from .script.disease_omim import OmimDiseaseScraper
+
         return OmimDiseaseScraper().search(name)
 
     def normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
@@ -309,7 +322,7 @@ class OMIMTargetPredictor(DiseaseTargetFinder):
             "dis_targets": "target_name",
             "source": "source",
         }
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
 
 
 class TTDTargetPredictor(DiseaseTargetFinder):
@@ -317,6 +330,8 @@ class TTDTargetPredictor(DiseaseTargetFinder):
     A concrete implementation of DiseaseTargetFinder for querying the TTD database.
     """
 
+    source = "ttd"
+
     def query(self, name: str, *args, **kwargs) -> pd.DataFrame:
         """
         Query the TTD database for targets associated with a given disease.
@@ -330,6 +345,8 @@ class TTDTargetPredictor(DiseaseTargetFinder):
             pd.DataFrame: DataFrame containing the queried targets.
         """
         # Implement TTD database query logic here
+        from .script.disease_ttd import TTDDiseaseScraper
+
         return TTDDiseaseScraper().search(name)
 
     def normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
@@ -347,4 +364,4 @@ class TTDTargetPredictor(DiseaseTargetFinder):
             "dis_targets": "target_name",
             "source": "source",
         }
-        return raw_data.rename(columns=column_mapping)[list(column_mapping.values())]
+        return self.schema.conform(raw_data.rename(columns=column_mapping))
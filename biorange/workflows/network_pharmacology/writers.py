@@ -0,0 +1,69 @@
+"""
+结果的增量写出。
+
+流式分析每完成一项就把对应的结果块追加到磁盘，下游步骤可以提前读取，
+运行中途崩溃也只会丢失尚未完成的项。
+"""
+
+import threading
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+
+class IncrementalCsvWriter:
+    """把 DataFrame 结果块逐块追加到同一个 CSV 文件。
+
+    列顺序由第一个非空块确定，之后的块按该顺序对齐。
+
+    Attributes:
+        path (Path): 输出文件路径。
+        rows_written (int): 已写出的行数。
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = False):
+        """
+        Args:
+            path (Union[str, Path]): 输出文件路径。
+            append (bool): 是否在已有文件后追加；默认覆盖。
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows_written = 0
+        self.columns: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        if append and self.path.exists() and self.path.stat().st_size > 0:
+            self.columns = list(pd.read_csv(self.path, nrows=0).columns)
+        else:
+            self.path.write_text("", encoding="utf-8")
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """追加一个结果块并立即落盘，空块会被忽略。"""
+        if chunk is None or chunk.empty:
+            return
+        with self._lock:
+            header = self.columns is None
+            if header:
+                self.columns = list(chunk.columns)
+            chunk.reindex(columns=self.columns).to_csv(
+                self.path, mode="a", header=header, index=False, encoding="utf-8"
+            )
+            self.rows_written += len(chunk)
+
+
+def deduplicate_csv(path: Union[str, Path]) -> int:
+    """去除 CSV 文件中的重复行（续跑时可能重复写出的结果块）。
+
+    Returns:
+        int: 去除的行数。
+    """
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return 0
+    data = pd.read_csv(path)
+    deduplicated = data.drop_duplicates()
+    removed = len(data) - len(deduplicated)
+    if removed:
+        deduplicated.to_csv(path, index=False, encoding="utf-8")
+    return removed
@@ -40,14 +40,14 @@ class Handler(ABC):
         """
         if not self.check(adata):
             logger.info(
-                f"{self.__class__.__name__}: Condition not met, attempting to fix."
+                "%s: Condition not met, attempting to fix.", self.__class__.__name__
             )
             if not self.fix(adata):
-                logger.error(f"{self.__class__.__name__}: Failed to fix.")
+                logger.error("%s: Failed to fix.", self.__class__.__name__)
                 return
         else:
             logger.info(
-                f"{self.__class__.__name__}: Condition already met, no need to fix."
+                "%s: Condition already met, no need to fix.", self.__class__.__name__
             )
         if self._next_handler:
             self._next_handler.handle(adata)
@@ -89,7 +89,7 @@ class QualityControlHandler(Handler):
             logger.info("Quality control applied.")
             return True
         except Exception as e:
-            logger.error(f"Failed to apply quality control: {e}")
+            logger.error("Failed to apply quality control: %s", e)
             return False
 
 
@@ -118,7 +118,7 @@ class DoubletRemovalHandler(Handler):
             logger.info("Doublet removal applied.")
             return True
         except Exception as e:
-            logger.error(f"Failed to remove doublets: {e}")
+            logger.error("Failed to remove doublets: %s", e)
             return False
 
 
@@ -157,7 +157,7 @@ class NormalizationHandler(Handler):
             logger.info("Normalization and variable gene selection applied.")
             return True
         except Exception as e:
-            logger.error(f"Failed to normalize data: {e}")
+            logger.error("Failed to normalize data: %s", e)
             return False
 
 
@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_shared_http_cache():
+    """共享 HTTP 客户端是进程级单例：运行流程的测试会启用它的响应缓存，
+    每个测试结束后关闭，避免后续测试沿用并把响应写进仓库目录。"""
+    yield
+    from biorange.core.network import get_http_client
+
+    get_http_client().configure_cache(enabled=False)
+
+
+@pytest.fixture(autouse=True)
+def reset_intermediate_store_dir():
+    """运行流程的测试会把中间结果存储指向各自的结果目录（绝对路径），每个测试
+    结束后恢复默认的相对目录，后续测试随各自的工作目录使用独立的存储。"""
+    yield
+    from biorange.workflows.network_pharmacology.store import (
+        DEFAULT_STORE_DIR,
+        configure_intermediate_store,
+    )
+
+    configure_intermediate_store(DEFAULT_STORE_DIR)
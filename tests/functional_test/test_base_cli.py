@@ -1,3 +1,5 @@
+import json
+
 from typer.testing import CliRunner
 
 from biorange.cli.main import app
@@ -24,3 +26,42 @@ def test_ppi_analysis():
         ["analyze", "ppi"],
     )
     assert "PPI analysis completed." in result.output
+
+
+def test_profile_wraps_command(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(app, ["profile", "--output", "prof", "analyze", "ppi"])
+    assert result.exit_code == 0
+    assert "PPI analysis completed." in result.output
+    for name in ("profile.collapsed", "allocations.txt", "stages.json"):
+        assert (tmp_path / "prof" / name).exists()
+
+
+def test_compare_runs(tmp_path):
+    before = {"elapsed": 10.0, "stages": {"targets": {"seconds": 8.0, "items": 5}}}
+    after = {"elapsed": 7.0, "stages": {"targets": {"seconds": 4.0, "items": 5}}}
+    for name, manifest in (("before", before), ("after", after)):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "performance.json").write_text(json.dumps(manifest))
+
+    result = runner.invoke(
+        app, ["compare-runs", str(tmp_path / "before"), str(tmp_path / "after")]
+    )
+
+    assert result.exit_code == 0
+    rows = [line.split() for line in result.output.splitlines()]
+    header = rows.index(["Time", "(s)", "before", "after", "delta", "ratio"])
+    assert rows[header + 1] == [
+        "stages.targets.seconds",
+        "8.000",
+        "4.000",
+        "-4.000",
+        "0.50x",
+    ]
+    assert "stages.targets.items" not in result.output
+
+
+def test_compare_runs_missing_manifest(tmp_path):
+    result = runner.invoke(app, ["compare-runs", str(tmp_path), str(tmp_path)])
+    assert result.exit_code == 1
+    assert "Cannot read performance manifest" in result.output
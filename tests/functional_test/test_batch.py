@@ -0,0 +1,110 @@
+import pandas as pd
+import yaml
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.config.config_model import BatchManifest
+from biorange.workflows.network_pharmacology.abstract import (
+    ComponentTargetPredictor,
+    DiseaseTargetFinder,
+    DrugComponentFinder,
+)
+from biorange.workflows.network_pharmacology.analyzers import (
+    ComponentFinder,
+    DiseaseTargetFinder as DiseaseAnalyzer,
+    SmilesTargetPredictor,
+)
+from biorange.workflows.network_pharmacology.batch import BatchRunner
+
+# 两味药共享成分 quercetin
+HERBS = {"A": ["quercetin", "a1"], "B": ["quercetin", "b1"], "C": ["c1"]}
+
+
+class StubComponents(DrugComponentFinder):
+    source = "stub_components"
+
+    def __init__(self):
+        super().__init__()
+        self.queried = []
+
+    def query(self, name, *args, **kwargs):
+        self.queried.append(name)
+        smiles = HERBS[name]
+        return pd.DataFrame({"component_name": smiles, "smiles": smiles})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+class StubTargets(ComponentTargetPredictor):
+    source = "stub_targets"
+
+    def __init__(self):
+        super().__init__()
+        self.queried = []
+
+    def query(self, name, *args, **kwargs):
+        self.queried.append(name)
+        return pd.DataFrame({"smiles": [name], "targets": ["T1"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+class StubDisease(DiseaseTargetFinder):
+    source = "stub_disease"
+
+    def __init__(self):
+        super().__init__()
+        self.queried = []
+
+    def query(self, name, *args, **kwargs):
+        self.queried.append(name)
+        return pd.DataFrame({"name": [name], "target_name": ["T1"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_batch_queries_unique_entities_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manifest = BatchManifest(
+        **yaml.safe_load(
+            f"""
+projects:
+  - {{drug_name: [A, B], disease_name: D1, results_dir: {tmp_path}/p1}}
+  - {{drug_name: [B, C], disease_name: D1, results_dir: {tmp_path}/p2}}
+  - {{drug_name: [A], disease_name: D2, results_dir: {tmp_path}/p3}}
+"""
+        )
+    )
+    cache = GeneralCacheManager(InMemoryCacheManager())
+    components, targets, disease = StubComponents(), StubTargets(), StubDisease()
+    runner = BatchRunner(
+        ComponentFinder([components], cache),
+        SmilesTargetPredictor([targets], cache),
+        DiseaseAnalyzer([disease], cache),
+    )
+
+    runner.run(manifest.projects)
+
+    assert sorted(components.queried) == ["A", "B", "C"]
+    assert sorted(targets.queried) == ["a1", "b1", "c1", "quercetin"]
+    assert sorted(disease.queried) == ["D1", "D2"]
+    assert runner.requested == {"components": 5, "disease_targets": 3, "targets": 8}
+
+    p1 = tmp_path / "p1"
+    assert list(pd.read_csv(p1 / "components_.csv")["smiles"]) == [
+        "quercetin",
+        "a1",
+        "quercetin",
+        "b1",
+    ]
+    assert sorted(pd.read_csv(p1 / "targets_.csv")["smiles"]) == [
+        "a1",
+        "b1",
+        "quercetin",
+    ]
+    assert list(pd.read_csv(tmp_path / "p3" / "disease_targets_.csv")["name"]) == [
+        "D2"
+    ]
+    assert yaml.safe_load((p1 / "config.yaml").read_text())["drug_name"] == ["A", "B"]
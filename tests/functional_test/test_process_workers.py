@@ -0,0 +1,87 @@
+import json
+import os
+
+import pandas as pd
+
+from biorange.cli import dependence
+from biorange.cli.container import Container
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.config.config_model import Settings
+from biorange.core.network import configure_sources, get_source_url
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.scheduler import get_scheduler
+from biorange.workflows.network_pharmacology.store import (
+    IntermediateStore,
+    get_intermediate_store,
+)
+
+STANDIN_URL = "http://127.0.0.1:8765/chembl"
+
+
+class UrlProbe(ComponentTargetPredictor):
+    """在 worker 进程中报告看到的数据源地址和进程号。"""
+
+    source = "url_probe"
+    cpu_bound = True
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame(
+            {
+                "smiles": [name],
+                "targets": [get_source_url("chembl")],
+                "source": [str(os.getpid())],
+            }
+        )
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_process_workers_use_the_configured_store_and_sources(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings(results_dir=str(tmp_path / "out"))
+    settings.network.sources.chembl = STANDIN_URL
+    settings.pipeline.process_workers = 1
+    container = Container(settings)
+    container.cache_manager = GeneralCacheManager(InMemoryCacheManager())
+    container.strategies = lambda step: [UrlProbe()] if step == "targets" else []
+
+    dependence.configure_pipeline(container)
+    try:
+        result = container.target_predictor.execute(
+            pd.DataFrame({"smiles": ["C1", "C2"]})
+        )
+    finally:
+        get_scheduler().shutdown()
+        configure_sources()
+
+    assert set(result["targets"]) == {STANDIN_URL}
+    assert str(os.getpid()) not in set(result["source"])
+    manifest = tmp_path / "out" / ".store" / "manifest.jsonl"
+    assert len(manifest.read_text().splitlines()) == 2
+    assert not (tmp_path / "results").exists()
+
+
+def test_parent_and_worker_append_to_one_manifest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings(results_dir=str(tmp_path / "out"))
+    settings.pipeline.process_workers = 2
+    settings.pipeline.cpu_chunk_size = 1
+    container = Container(settings)
+    container.cache_manager = GeneralCacheManager(InMemoryCacheManager())
+    container.strategies = lambda step: [UrlProbe()] if step == "targets" else []
+
+    dependence.configure_pipeline(container)
+    get_intermediate_store().put("parent", pd.DataFrame({"a": [1]}))
+    try:
+        result = container.target_predictor.execute(
+            pd.DataFrame({"smiles": [f"C{i}" for i in range(6)]})
+        )
+    finally:
+        get_scheduler().shutdown()
+
+    assert str(os.getpid()) not in set(result["source"])
+    store_dir = tmp_path / "out" / ".store"
+    lines = (store_dir / IntermediateStore.MANIFEST).read_text().splitlines()
+    assert len([json.loads(line) for line in lines]) == 7
+    assert len(IntermediateStore(store_dir)) == 7
@@ -0,0 +1,156 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from biorange.cli import dependence
+from biorange.cli.container import Container
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.config.config_model import Settings
+from biorange.workflows.network_pharmacology.abstract import (
+    ComponentTargetPredictor,
+    DiseaseTargetFinder,
+    DrugComponentFinder,
+)
+from biorange.workflows.network_pharmacology.journal import RunJournal
+
+
+class StubComponents(DrugComponentFinder):
+    source = "stub_components"
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame({"component_name": [name], "smiles": [f"C_{name}"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+class StubTargets(ComponentTargetPredictor):
+    source = "stub_targets"
+
+    def __init__(self, fail_on=None, down_on=None):
+        super().__init__()
+        self.fail_on = fail_on
+        self.down_on = down_on
+        self.queried = []
+
+    def query(self, name, *args, **kwargs):
+        self.queried.append(name)
+        if name == self.down_on:
+            # 查询的异常由 fetch 记录为失败，运行继续
+            raise ConnectionError("source unavailable")
+        return pd.DataFrame({"smiles": [name], "targets": ["T1"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        # normalize 的异常不会被 fetch 吞掉，用来模拟运行中途崩溃
+        if raw_data["smiles"][0] == self.fail_on:
+            raise RuntimeError("crash")
+        return raw_data
+
+
+class StubDisease(DiseaseTargetFinder):
+    source = "stub_disease"
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame({"name": [name], "target_name": ["T1"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def make_container(settings, target_strategy):
+    container = Container(settings)
+    container.cache_manager = GeneralCacheManager(InMemoryCacheManager())
+    container.strategies = lambda step: {
+        "components": [StubComponents()],
+        "targets": [target_strategy],
+        "disease_targets": [StubDisease()],
+    }[step]
+    return container
+
+
+def test_resume_skips_completed_items(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings(
+        drug_name=["A", "B", "C"], disease_name="D", results_dir=str(tmp_path / "out")
+    )
+    settings.pipeline.max_workers = 1
+    config_manager = SimpleNamespace(settings=settings)
+
+    crashing = make_container(settings, StubTargets(fail_on="C_C"))
+    with pytest.raises(RuntimeError):
+        dependence.run_analysis(config_manager, container=crashing)
+
+    resumed_strategy = StubTargets()
+    resumed = make_container(settings, resumed_strategy)
+    dependence.run_analysis(config_manager, resume=True, container=resumed)
+
+    out = tmp_path / "out"
+    assert resumed_strategy.queried == ["C_C"]
+    assert sorted(pd.read_csv(out / "targets_.csv")["smiles"]) == ["C_A", "C_B", "C_C"]
+    assert len(pd.read_csv(out / "components_.csv")) == 3
+    assert len(pd.read_csv(out / "disease_targets_.csv")) == 1
+    journal = RunJournal(out, resume=True)
+    assert journal.completed("targets") == {"C_A", "C_B", "C_C"}
+
+
+def test_resume_retries_items_whose_source_failed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings(
+        drug_name=["A", "B"], disease_name="D", results_dir=str(tmp_path / "out")
+    )
+    config_manager = SimpleNamespace(settings=settings)
+
+    failing = make_container(settings, StubTargets(down_on="C_B"))
+    dependence.run_analysis(config_manager, container=failing)
+
+    out = tmp_path / "out"
+    missing = pd.read_csv(out / "missing.csv")
+    assert list(missing["item"]) == ["C_B"]
+    assert RunJournal(out, resume=True).completed("targets") == {"C_A"}
+
+    resumed_strategy = StubTargets()
+    resumed = make_container(settings, resumed_strategy)
+    dependence.run_analysis(config_manager, resume=True, container=resumed)
+
+    assert resumed_strategy.queried == ["C_B"]
+    targets = pd.read_csv(out / "targets_.csv").dropna()
+    assert sorted(targets["smiles"]) == ["C_A", "C_B"]
+    assert RunJournal(out, resume=True).completed("targets") == {"C_A", "C_B"}
+    assert not (out / "missing.csv").exists()
+
+
+def test_journal_tolerates_truncated_line(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.record("targets", "CCO", 2)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "done", "step": "tar')
+
+    resumed = RunJournal(tmp_path, resume=True)
+    assert list(resumed.pending("targets", ["CCO", "CCN", "CCO"])) == ["CCN"]
+    assert resumed.skipped == {"targets": 1}
+    assert RunJournal(tmp_path).completed("targets") == set()
+
+
+def test_run_writes_metrics_trace_and_manifest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings(drug_name=["A"], disease_name="D", results_dir="out")
+    config_manager = SimpleNamespace(settings=settings)
+
+    dependence.run_analysis(
+        config_manager, container=make_container(settings, StubTargets())
+    )
+
+    metrics = (tmp_path / "out" / "metrics.prom").read_text()
+    fetched = 'biorange_strategy_fetches_total{source="stub_targets",outcome="query"} 1'
+    assert fetched in metrics
+    assert 'biorange_pipeline_step_items_total{step="components"} 1' in metrics
+    trace = json.loads((tmp_path / "out" / "trace.json").read_text())
+    steps = {e["name"] for e in trace["traceEvents"] if e.get("cat") == "pipeline"}
+    assert steps == {"components", "targets", "disease_targets"}
+    manifest = json.loads((tmp_path / "out" / "performance.json").read_text())
+    assert set(manifest["stages"]) == steps
+    assert manifest["analyzers"]["targets"]["computed"] == 1
+    assert manifest["sources"]["stub_targets"]["fetches"] == {"query": 1}
+    assert manifest["elapsed"] > 0
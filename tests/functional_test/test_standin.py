@@ -0,0 +1,66 @@
+"""使用本地替身服务离线运行远程爬虫"""
+
+import pytest
+import requests
+
+from biorange.core.network import configure_sources, get_http_client
+from biorange.core.network.standin import StandInServer
+from biorange.core.utils.inchikey_smiles_convert import (
+    PubChemSmilesResolver,
+    SmilesStore,
+)
+from biorange.workflows.network_pharmacology.script import target_from_smiles_chembal
+from biorange.workflows.network_pharmacology.script.component_tcmsp_local import (
+    TCMSPComponentLocalScraper,
+)
+
+QUERCETIN = "C1=CC(=C(C=C1C2=C(C(=O)C3=C(C=C(C=C3O2)O)O)O)O)O"
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    monkeypatch.setattr(target_from_smiles_chembal, "POLLING_INTERVAL", 0)
+    with StandInServer(job_polls=2, page_size=2) as server:
+        configure_sources(server.source_urls())
+        yield server
+    configure_sources()
+
+
+def test_chembl_search_smiles_offline(standin):
+    """验证 ChEMBL 预测 + UniProt 轮询和分页可以完整地在替身服务上运行"""
+    scraper = target_from_smiles_chembal.ChEMBLTargetScraper()
+    df = scraper.search_smiles(QUERCETIN)
+
+    assert set(df["source"]) == {"chembal"}
+    assert {"PTGS2", "PTGS1", "EGFR"} <= set(df["gene_name"])
+    assert standin.request_counts["chembl"] == 1
+    # run + 3 次状态轮询 + details + 4 页结果
+    assert standin.request_counts["uniprot"] == 9
+
+
+def test_pubchem_batch_offline(standin, tmp_path):
+    resolver = PubChemSmilesResolver(store=SmilesStore(str(tmp_path / "s.sqlite")))
+    mapping = resolver.resolve(["IQPNAANSBPBGFQ-UHFFFAOYSA-N", "NOT-A-REAL-KEY"])
+    assert mapping["NOT-A-REAL-KEY"] is None
+    assert mapping["IQPNAANSBPBGFQ-UHFFFAOYSA-N"].startswith("C1=CC")
+
+
+def test_tcmsp_herb_page_offline(standin):
+    """验证替身 TCMSP 药材页面可以被现有的解析逻辑提取"""
+    url = f"{standin.source_urls()['tcmsp']}/tcmspsearch.php?qr=大枣"
+    html = get_http_client().get(url).text
+    data = TCMSPComponentLocalScraper().extract_json_data(html)
+    assert [row["MOL_ID"] for row in data][:2] == ["MOL000004", "MOL000006"]
+
+
+def test_error_injection_and_latency():
+    with StandInServer(error_rate={"chembl": 1.0}, latency=0.05) as server:
+        response = requests.post(
+            f"{server.source_urls()['chembl']}/target-predictions",
+            json={"smiles": "CCO"},
+            timeout=5,
+        )
+        assert response.status_code == 503
+        response = requests.get(server.source_urls()["tcmsp"] + "/browse.php", timeout=5)
+        assert response.status_code == 200
+        assert "inputVarTcm" in response.text
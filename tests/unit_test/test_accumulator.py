@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from biorange.workflows.network_pharmacology.accumulator import TargetAccumulator
+
+
+def test_accumulator_matches_concat():
+    chunks = [
+        pd.DataFrame(
+            {"smiles": ["C1", "C1"], "targets": ["A", "B"], "source": ["x", "x"]}
+        ),
+        pd.DataFrame({"smiles": ["C2"], "targets": [None], "source": ["y"]}),
+        pd.DataFrame(columns=["smiles", "targets", "source"]),
+        pd.DataFrame({"source": ["z"], "smiles": ["C3"], "extra": [1]}),
+    ]
+    accumulator = TargetAccumulator()
+    for chunk in chunks:
+        accumulator.extend(chunk)
+    accumulator.append("C4", "A", "x")
+
+    frame = accumulator.to_frame()
+    expected = pd.concat(chunks, ignore_index=True)[["smiles", "targets", "source"]]
+    expected.loc[len(expected)] = ["C4", "A", "x"]
+
+    assert all(str(dtype) == "category" for dtype in frame.dtypes)
+    pd.testing.assert_frame_equal(
+        frame.astype(object).where(frame.notna(), None),
+        expected.astype(object).where(expected.notna(), None),
+    )
+    assert list(frame["source"].cat.categories) == ["x", "y", "z"]
+
+
+def test_record_views():
+    accumulator = TargetAccumulator()
+    accumulator.append("C1", "A", "x")
+    accumulator.append("C2", None, "y")
+
+    assert len(accumulator) == 2
+    assert accumulator[-1].smiles == "C2"
+    assert accumulator[1].targets is None
+    assert [record.source for record in accumulator] == ["x", "y"]
+    with pytest.raises(AttributeError):
+        accumulator[0].other = 1
+    with pytest.raises(IndexError):
+        accumulator[2]
+
+
+def test_empty_accumulator():
+    frame = TargetAccumulator().to_frame()
+    assert frame.empty
+    assert list(frame.columns) == ["smiles", "targets", "source"]
@@ -0,0 +1,66 @@
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2] / "benchmarks"
+
+
+@pytest.fixture(scope="module")
+def suite():
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "bench_suite", BENCHMARKS_DIR / "bench_suite.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        sys.path.remove(str(BENCHMARKS_DIR))
+
+
+def test_compare_flags_only_significant_slowdowns(suite):
+    baseline = {
+        "slower": {"median": 1.0},
+        "noise": {"median": 0.001},
+        "faster": {"median": 1.0},
+        "skipped": {"median": 1.0},
+    }
+    results = {
+        "slower": {"median": 1.5},
+        "noise": {"median": 0.002},  # 慢了一倍，但绝对差值很小
+        "faster": {"median": 0.5},
+        "skipped": {"skipped": "redis unavailable"},
+        "new": {"median": 3.0},
+    }
+
+    regressions = suite.compare(results, baseline, tolerance=0.25, min_delta=0.005)
+
+    assert [r["name"] for r in regressions] == ["slower"]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+
+
+def test_every_baseline_entry_is_a_registered_benchmark(suite):
+    baseline = suite.load_baseline(suite.BASELINE_PATH)
+    assert baseline
+    assert set(baseline) <= set(suite.BENCHMARKS)
+
+
+def test_suite_fails_on_regression(suite, tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        suite.BENCHMARKS, "test.sleep", (lambda options: lambda: time.sleep(0.01), 3)
+    )
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"results": {"test.sleep": {"median": 1e-6}}}), encoding="utf-8"
+    )
+    output = tmp_path / "results.json"
+
+    argv = ["--filter", "test.", "--quick", "--output", str(output)]
+    assert suite.main(argv + ["--baseline", str(baseline)]) == 1
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert results["test.sleep"]["median"] >= 0.01
@@ -0,0 +1,104 @@
+import time
+
+import pandas as pd
+import pytest
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+from biorange.workflows.network_pharmacology.deadlines import DeadlinePolicy
+
+pytest.importorskip("celery")
+
+from biorange.workflows.celery_task_executor import (  # noqa: E402
+    RESULT_KEY_PREFIX,
+    CeleryTaskExecutor,
+    create_celery_app,
+)
+
+
+class StubPredictor(ComponentTargetPredictor):
+    source = "stub"
+
+    def query(self, name, *args, **kwargs):
+        if name == "bad":
+            raise ValueError("bad smiles")
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def add(a, b):
+    return a + b
+
+
+def test_eager_executor_runs_analyzer_and_cleans_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = GeneralCacheManager(InMemoryCacheManager())
+    executor = CeleryTaskExecutor(
+        app=create_celery_app("memory://", "cache+memory://", eager=True),
+        cache_manager=cache,
+    )
+    predictor = SmilesTargetPredictor([StubPredictor()], cache, scheduler=executor)
+
+    result = predictor.execute(pd.DataFrame({"smiles": ["C1", "C2"]}))
+
+    assert sorted(result["smiles"]) == ["C1", "C2"]
+    assert not [k for k in cache.cache_manager.cache if k.startswith(RESULT_KEY_PREFIX)]
+
+    with pytest.raises(ValueError, match="bad smiles"):
+        executor.submit("stub", StubPredictor().query, "bad").result()
+
+
+def test_in_process_worker_collects_results_from_shared_cache():
+    from celery.contrib.testing.worker import start_worker
+
+    app = create_celery_app("memory://", "cache+memory://")
+    executor = CeleryTaskExecutor(
+        app=app,
+        cache_manager=GeneralCacheManager(InMemoryCacheManager()),
+        poll_interval=0.05,
+    )
+
+    with start_worker(app, perform_ping_check=False, shutdown_timeout=10):
+        futures = [executor.submit("math", add, i, 1) for i in range(5)]
+        assert [f.result(timeout=10) for f in futures] == [1, 2, 3, 4, 5]
+
+    executor.shutdown()
+
+
+class SleepyPredictor(StubPredictor):
+    source = "sleepy"
+
+    def query(self, name, *args, **kwargs):
+        if name == "slow":
+            time.sleep(2)
+        return super().query(name)
+
+
+def test_deadlines_apply_to_tasks_run_by_a_worker(tmp_path, monkeypatch):
+    from celery.contrib.testing.worker import start_worker
+
+    monkeypatch.chdir(tmp_path)
+    app = create_celery_app("memory://", "cache+memory://")
+    # 截止时间从提交时计时，broker 的轮询间隔也计入
+    app.conf.broker_transport_options = {"polling_interval": 0.05}
+    cache = GeneralCacheManager(InMemoryCacheManager())
+    executor = CeleryTaskExecutor(app=app, cache_manager=cache, poll_interval=0.05)
+    predictor = SmilesTargetPredictor(
+        [SleepyPredictor()],
+        cache,
+        scheduler=executor,
+        deadlines={"sleepy": DeadlinePolicy(hard=1.0)},
+    )
+
+    # worker 串行执行，"fast" 先提交、先完成，"slow" 超过硬截止
+    with start_worker(app, perform_ping_check=False, shutdown_timeout=10):
+        results = dict(predictor.execute_stream(["fast", "slow"]))
+
+    assert list(results["fast"]["smiles"]) == ["fast"]
+    assert results["slow"].empty
+    assert [(m.item, m.source) for m in predictor.missing] == [("slow", "sleepy")]
+    assert "hard deadline" in predictor.missing[0].reason
+    executor.shutdown()
@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.network.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    get_circuit_breaker_registry,
+)
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """验证连续失败达到阈值后熔断器打开并直接拒绝调用"""
+    breaker = CircuitBreaker("ebi", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker("ebi", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_open_allows_single_trial():
+    """验证冷却期结束后只放行一次试探调用，成功后关闭"""
+    breaker = CircuitBreaker("ebi", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+
+    breaker.before_call()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_open_failure_reopens():
+    breaker = CircuitBreaker("ebi", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.trips == 2
+
+
+def test_registry_summary():
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.get("uniprot").record_failure()
+    registry.get("pubchem")
+    summary = {item["source"]: item for item in registry.summary()}
+    assert summary["uniprot"]["state"] == "open"
+    assert summary["pubchem"]["state"] == "closed"
+
+
+class FailingPredictor(ComponentTargetPredictor):
+    source = "failing_source"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def query(self, name, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("service down")
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_fetch_fails_fast_when_source_is_open(tmp_path, monkeypatch):
+    """验证数据源熔断后 fetch 直接返回空结果，不再调用远程查询"""
+    monkeypatch.chdir(tmp_path)
+    get_circuit_breaker_registry().configure(failure_threshold=2, recovery_timeout=60)
+    strategy = FailingPredictor()
+
+    for smiles in ["C", "CC", "CCC", "CCCC"]:
+        result = strategy.fetch(smiles)
+        assert isinstance(result, pd.DataFrame)
+        assert list(result.columns) == ["smiles", "targets", "source"]
+        assert result.empty
+
+    assert strategy.calls == 2
+    assert not (tmp_path / "results").exists()
+    get_circuit_breaker_registry().configure(failure_threshold=5, recovery_timeout=60)
+
+
+class FlakyPredictor(ComponentTargetPredictor):
+    source = "flaky_source"
+
+    def __init__(self):
+        super().__init__()
+        self.down = True
+        self.calls = 0
+
+    def query(self, name, *args, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("service down")
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["flaky"]})
+
+    def normalize(self, raw_data):
+        return self.schema.conform(raw_data)
+
+
+def test_failed_query_is_missing_and_not_cached(tmp_path, monkeypatch):
+    """验证查询失败的项记为缺失且不写缓存，数据源恢复后下次运行重新查询"""
+    monkeypatch.chdir(tmp_path)
+    strategy = FlakyPredictor()
+    scheduler = TaskScheduler(max_workers=2)
+    predictor = SmilesTargetPredictor(
+        [strategy], GeneralCacheManager(InMemoryCacheManager()), scheduler
+    )
+
+    first = dict(predictor.execute_stream(["C1"]))
+    assert first["C1"].empty
+    assert predictor.has_missing("C1")
+    assert predictor.missing[0].reason.startswith("error: ConnectionError")
+
+    strategy.down = False
+    predictor.clear_missing()
+    second = dict(predictor.execute_stream(["C1"]))
+
+    assert strategy.calls == 2
+    assert list(second["C1"]["targets"]) == ["T"]
+    assert not predictor.has_missing("C1")
+    scheduler.shutdown()
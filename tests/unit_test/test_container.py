@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+from biorange.cli.container import Container
+from biorange.core.cache.cache_manager import InMemoryCacheManager
+from biorange.core.config.config_model import Settings
+from biorange.workflows.network_pharmacology.registry import create_strategy
+
+
+def test_container_builds_dependencies_on_first_use():
+    settings = Settings()
+    settings.pipeline.cache.cache_type = "memory"
+    settings.pipeline.strategies = {"targets": ["stitch"]}
+    container = Container(settings)
+
+    assert "cache_manager" not in vars(container)
+    predictor = container.target_predictor
+
+    assert isinstance(container.cache_manager.cache_manager, InMemoryCacheManager)
+    assert [s.source for s in predictor.strategies] == ["stitch"]
+    assert container.target_predictor is predictor
+    assert container.component_finder.strategies == []
+
+
+def test_unused_sources_are_not_loaded():
+    settings = Settings()
+    settings.pipeline.cache.cache_type = "memory"
+    settings.pipeline.strategies = {"targets": ["stitch"]}
+    Container(settings).analyzers
+
+    scrapers = ("disease_genecards", "disease_omim", "disease_ttd")
+    assert [m for m in sys.modules if m.endswith(scrapers)] == []
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown strategy 'nope'"):
+        create_strategy("nope")
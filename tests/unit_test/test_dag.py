@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from biorange.workflows.network_pharmacology.dag import PipelineGraph
+
+
+def slow_range(n, delay):
+    for i in range(n):
+        time.sleep(delay)
+        yield i
+
+
+def test_independent_nodes_run_concurrently():
+    graph = PipelineGraph()
+    graph.add_node("a", lambda: slow_range(1, 0.3))
+    graph.add_node("b", lambda: slow_range(1, 0.3))
+
+    start = time.perf_counter()
+    graph.run()
+
+    assert time.perf_counter() - start < 0.5
+
+
+def test_downstream_starts_before_upstream_finishes():
+    """验证下游在上游产出第一项后立即开始处理"""
+    upstream_done = threading.Event()
+    seen_early = []
+
+    def upstream():
+        yield from slow_range(3, 0.1)
+        upstream_done.set()
+
+    def downstream(items):
+        for item in items:
+            seen_early.append(not upstream_done.is_set())
+            yield item * 10
+
+    outputs = []
+    graph = PipelineGraph(channel_size=1)
+    graph.add_node("up", upstream)
+    graph.add_node("down", downstream, ["up"], on_output=outputs.append)
+    nodes = graph.run()
+
+    assert outputs == [0, 10, 20]
+    assert seen_early[0] is True
+    assert nodes["down"].items == 3
+    assert nodes["up"].elapsed >= 0.3
+
+
+def test_failure_propagates_without_deadlock():
+    def failing(items):
+        next(iter(items))
+        raise RuntimeError("boom")
+
+    graph = PipelineGraph(channel_size=1)
+    graph.add_node("up", lambda: range(100))
+    graph.add_node("down", failing, ["up"])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run()
+
+
+def test_unknown_upstream_is_rejected():
+    graph = PipelineGraph()
+    with pytest.raises(ValueError):
+        graph.add_node("down", lambda items: items, ["missing"])
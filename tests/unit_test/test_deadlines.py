@@ -0,0 +1,161 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+import pytest
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+from biorange.workflows.network_pharmacology.deadlines import (
+    DeadlineCall,
+    DeadlinePolicy,
+    LatencyRecorder,
+)
+from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+
+
+class SlowPredictor(ComponentTargetPredictor):
+    """第一次调用耗时 `first_delay` 秒，之后的调用立即返回"""
+
+    source = "slow"
+
+    def __init__(self, first_delay):
+        super().__init__()
+        self.first_delay = first_delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def query(self, name, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(self.first_delay)
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["slow"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def make_predictor(strategy, policy, cache):
+    return SmilesTargetPredictor(
+        [strategy],
+        cache,
+        scheduler=TaskScheduler(max_workers=4),
+        deadlines={"slow": policy},
+    )
+
+
+def test_hard_deadline_records_missing_result(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = GeneralCacheManager(InMemoryCacheManager())
+    predictor = make_predictor(SlowPredictor(1.0), DeadlinePolicy(hard=0.1), cache)
+
+    start = time.monotonic()
+    (item, result), = predictor.execute_stream(["C1"])
+
+    assert time.monotonic() - start < 0.8
+    assert result.empty
+    assert [(m.item, m.source) for m in predictor.missing] == [("C1", "slow")]
+    assert "hard deadline" in predictor.missing[0].reason
+    assert cache.get("targets_C1") is None
+    predictor.scheduler.shutdown()
+
+
+def test_soft_deadline_hedges_and_first_result_wins(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = GeneralCacheManager(InMemoryCacheManager())
+    strategy = SlowPredictor(1.0)
+    predictor = make_predictor(
+        strategy, DeadlinePolicy(soft=0.1, hard=2.0, hedge=True), cache
+    )
+
+    start = time.monotonic()
+    (item, result), = predictor.execute_stream(["C1"])
+
+    assert time.monotonic() - start < 0.8
+    assert list(result["smiles"]) == ["C1"]
+    assert strategy.calls == 2
+    assert predictor.missing == []
+    assert predictor.latency.summary()["count"] == 1
+    predictor.scheduler.shutdown()
+
+
+class ManualWatcher:
+    """不计时的计时器，测试中手动触发到期回调"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def schedule(self, delay, callback):
+        self.callbacks.append(callback)
+
+
+def start_hedged_call(**kwargs):
+    """返回 (调用, 主请求和对冲请求的 Future 列表)，对冲请求已经发出"""
+    attempts = []
+
+    def submit(on_start):
+        attempts.append(Future())
+        if on_start is not None:
+            on_start()
+        return attempts[-1]
+
+    watcher = ManualWatcher()
+    call = DeadlineCall(
+        submit=submit,
+        policy=DeadlinePolicy(soft=1.0, hedge=True),
+        fallback=lambda: None,
+        on_missing=lambda reason: None,
+        watcher=watcher,
+        **kwargs,
+    )
+    watcher.callbacks[0]()  # 软截止到期
+    assert call.hedged and len(attempts) == 2
+    return call, attempts
+
+
+def test_failed_primary_waits_for_the_hedge():
+    call, (primary, hedge) = start_hedged_call()
+
+    primary.set_exception(RuntimeError("primary"))
+    assert not call.future.done()
+
+    hedge.set_result("hedged")
+    assert call.future.result() == "hedged"
+
+
+def test_failed_result_waits_for_the_other_attempt():
+    call, (primary, hedge) = start_hedged_call(
+        is_failure=lambda result: result == "error"
+    )
+
+    hedge.set_result("error")
+    assert not call.future.done()
+
+    primary.set_result("ok")
+    assert call.future.result() == "ok"
+
+
+def test_failure_settles_once_every_attempt_failed():
+    call, (primary, hedge) = start_hedged_call()
+
+    primary.set_exception(RuntimeError("primary"))
+    hedge.set_exception(RuntimeError("hedge"))
+
+    with pytest.raises(RuntimeError, match="hedge"):
+        call.future.result()
+
+
+def test_latency_percentiles():
+    recorder = LatencyRecorder()
+    for value in range(1, 101):
+        recorder.record(value / 100)
+
+    summary = recorder.summary()
+    assert summary["count"] == 100
+    assert summary["p50"] == 0.5
+    assert summary["p99"] == 0.99
+    assert summary["max"] == 1.0
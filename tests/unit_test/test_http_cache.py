@@ -0,0 +1,107 @@
+import pytest
+
+from biorange.core.network import (
+    HttpClient,
+    HttpResponseCache,
+    configure_sources,
+    get_http_client,
+)
+from biorange.core.network.standin import StandInServer
+from biorange.workflows.network_pharmacology.script import target_from_smiles_chembal
+
+
+@pytest.fixture
+def standin():
+    with StandInServer() as server:
+        yield server
+
+
+def test_get_is_served_from_disk(standin, tmp_path):
+    """验证 GET 响应写入磁盘缓存，第二次请求不访问网络"""
+    client = HttpClient(cache=HttpResponseCache(str(tmp_path)))
+    url = f"{standin.source_urls()['tcmsp']}/tcmspsearch.php?qr=大枣"
+
+    first = client.get(url)
+    second = HttpClient(cache=HttpResponseCache(str(tmp_path))).get(url)
+
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.text == first.text
+    assert standin.request_counts["tcmsp"] == 1
+
+
+def test_stale_entry_is_revalidated(standin, tmp_path):
+    """验证过期条目使用条件请求重新验证，304 时仍返回缓存内容"""
+    client = HttpClient(cache=HttpResponseCache(str(tmp_path), max_age=0))
+    url = f"{standin.source_urls()['tcmsp']}/browse.php"
+
+    client.get(url)
+    revalidated = client.get(url)
+
+    assert revalidated.status_code == 200
+    assert revalidated.from_cache is True
+    assert "inputVarTcm" in revalidated.text
+    assert standin.request_counts["tcmsp"] == 2
+
+
+def test_post_is_cached_only_on_request_and_keyed_by_body(standin, tmp_path):
+    client = HttpClient(cache=HttpResponseCache(str(tmp_path)))
+    url = f"{standin.source_urls()['chembl']}/target-predictions"
+
+    client.post(url, json={"smiles": "CCO"})
+    client.post(url, json={"smiles": "CCO"})
+    assert standin.request_counts["chembl"] == 2
+
+    client.post(url, json={"smiles": "CCO"}, cache=True)
+    client.post(url, json={"smiles": "CCO"}, cache=True)
+    client.post(url, json={"smiles": "CCN"}, cache=True)
+    assert standin.request_counts["chembl"] == 4
+
+
+def test_reprocessing_chembl_resubmits_only_the_uniprot_job(
+    standin, tmp_path, monkeypatch
+):
+    """验证缓存命中后 ChEMBL 不再访问网络；UniProt 映射任务会过期，每次重新提交"""
+    monkeypatch.setattr(target_from_smiles_chembal, "POLLING_INTERVAL", 0)
+    configure_sources(standin.source_urls())
+    get_http_client().configure_cache(cache_dir=str(tmp_path))
+    try:
+        smiles = "C1=CC(=C(C=C1C2=C(C(=O)C3=C(C=C(C=C3O2)O)O)O)O)O"
+        first = target_from_smiles_chembal.ChEMBLTargetScraper().search_smiles(smiles)
+        counts = dict(standin.request_counts)
+        second = target_from_smiles_chembal.ChEMBLTargetScraper().search_smiles(smiles)
+    finally:
+        get_http_client().configure_cache(enabled=False)
+        configure_sources()
+
+    assert standin.request_counts["chembl"] == counts["chembl"]
+    assert standin.request_counts["uniprot"] > counts["uniprot"]
+    assert second.equals(first)
+
+
+def test_corrupt_entry_is_a_miss(standin, tmp_path):
+    """验证响应体无法解压的缓存条目按未命中处理，重新请求并覆盖"""
+    cache = HttpResponseCache(str(tmp_path))
+    client = HttpClient(cache=cache)
+    url = f"{standin.source_urls()['tcmsp']}/browse.php"
+    client.get(url)
+    key = cache.make_key("GET", url)
+    entry = cache.get(key)
+    entry["content"] = b"not zlib"
+    cache._write(key, entry)
+
+    response = client.get(url)
+
+    assert response.from_cache is False
+    assert "inputVarTcm" in response.text
+    assert standin.request_counts["tcmsp"] == 2
+    assert client.get(url).from_cache is True
+
+
+def test_relative_cache_dir_is_resolved_when_configured(tmp_path, monkeypatch):
+    """验证相对缓存目录在配置时解析，之后切换工作目录不改变缓存位置"""
+    monkeypatch.chdir(tmp_path)
+    get_http_client().configure_cache(cache_dir="./.cache/http")
+    monkeypatch.chdir(tmp_path.parent)
+
+    assert get_http_client().cache.cache_dir == (tmp_path / ".cache/http").resolve()
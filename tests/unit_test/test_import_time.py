@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ["pandas", "pyfiglet", "redis", "requests", "playwright", "bs4", "pydantic"]
+
+
+def run_import(module, cwd):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        f"import {module}; elapsed = time.perf_counter() - start; "
+        "import json; print(json.dumps([elapsed, sorted(sys.modules)]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout, json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_import_is_lazy_and_side_effect_free(tmp_path):
+    stdout, (elapsed, modules) = run_import("biorange.cli.main", tmp_path)
+
+    assert elapsed < 0.5
+    assert [m for m in HEAVY if m in modules] == []
+    assert stdout.count("\n") == 1  # 只有测试自己的输出，没有启动画面
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_strategy_import_defers_scrapers(tmp_path):
+    _, (_, modules) = run_import(
+        "biorange.workflows.network_pharmacology.strategy", tmp_path
+    )
+
+    assert [m for m in ("playwright", "bs4", "requests", "redis") if m in modules] == []
+    assert list(tmp_path.iterdir()) == []
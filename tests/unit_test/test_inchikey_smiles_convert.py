@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+import requests
+
+from biorange.core.utils.inchikey_smiles_convert import (
+    PubChemSmilesResolver,
+    SmilesStore,
+    fill_missing_smiles,
+    process_csv,
+)
+
+KNOWN = {"AAA-KEY": "CCO", "BBB-KEY": "C1=CC=CC=C1"}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """模拟 PubChem 批量接口，记录每次 POST 的 InChIKey"""
+
+    def __init__(self):
+        self.batches = []
+
+    def post(self, url, data=None, timeout=None):
+        keys = data["inchikey"].split(",")
+        self.batches.append(keys)
+        if "DOWN-KEY" in keys:
+            raise requests.ConnectionError("connection reset")
+        if "BAD-KEY" in keys:
+            # 批内有格式错误的 InChIKey 时 PubChem 整批返回 400
+            return FakeResponse(400)
+        found = [
+            {"CID": i, "InChIKey": key, "ConnectivitySMILES": KNOWN[key]}
+            for i, key in enumerate(keys)
+            if key in KNOWN
+        ]
+        if not found:
+            return FakeResponse(404)
+        return FakeResponse(200, {"PropertyTable": {"Properties": found}})
+
+
+def make_resolver(tmp_path, chunk_size=2):
+    resolver = PubChemSmilesResolver(
+        store=SmilesStore(str(tmp_path / "smiles.sqlite")), chunk_size=chunk_size
+    )
+    resolver.client = FakeClient()
+    return resolver
+
+
+def test_resolve_batches_and_persists(tmp_path):
+    """验证按块批量查询，并将结果（包括未找到的）持久化"""
+    resolver = make_resolver(tmp_path)
+    result = resolver.resolve(["AAA-KEY", "BBB-KEY", "CCC-KEY", "AAA-KEY"])
+
+    assert result == {"AAA-KEY": "CCO", "BBB-KEY": "C1=CC=CC=C1", "CCC-KEY": None}
+    assert resolver.client.batches == [["AAA-KEY", "BBB-KEY"], ["CCC-KEY"]]
+
+    # 新的解析器复用同一个持久化映射，不再发起请求
+    again = make_resolver(tmp_path)
+    assert again.resolve(["AAA-KEY", "CCC-KEY"]) == {"AAA-KEY": "CCO", "CCC-KEY": None}
+    assert again.client.batches == []
+
+
+def test_fill_missing_smiles_only_updates_missing_rows(tmp_path):
+    df = pd.DataFrame(
+        {
+            "inchikey": ["AAA-KEY", "BBB-KEY", "ZZZ-KEY"],
+            "smiles": [None, "", "O"],
+        }
+    )
+    fill_missing_smiles(df, make_resolver(tmp_path))
+    assert df["smiles"].tolist() == ["CCO", "C1=CC=CC=C1", "O"]
+
+
+def test_bad_request_splits_the_chunk(tmp_path):
+    """验证整批 400 时二分查询，只有格式错误的 InChIKey 记为查不到"""
+    resolver = make_resolver(tmp_path, chunk_size=4)
+    result = resolver.resolve(["AAA-KEY", "BAD-KEY", "BBB-KEY", "CCC-KEY"])
+
+    assert result == {
+        "AAA-KEY": "CCO",
+        "BAD-KEY": None,
+        "BBB-KEY": "C1=CC=CC=C1",
+        "CCC-KEY": None,
+    }
+    assert resolver.client.batches[1:] == [
+        ["AAA-KEY", "BAD-KEY"],
+        ["AAA-KEY"],
+        ["BAD-KEY"],
+        ["BBB-KEY", "CCC-KEY"],
+    ]
+
+
+def test_request_error_skips_the_chunk(tmp_path):
+    """验证网络错误不中断解析，失败的一批不写入持久化映射"""
+    resolver = make_resolver(tmp_path)
+    result = resolver.resolve(["DOWN-KEY", "AAA-KEY", "BBB-KEY"])
+
+    assert result == {"BBB-KEY": "C1=CC=CC=C1"}
+    assert resolver.store.get_many(["DOWN-KEY", "AAA-KEY"]) == {}
+
+
+def test_process_csv_max_workers_is_deprecated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"inchikey": ["AAA-KEY"], "smiles": ["CCO"]}).to_csv(
+        "in.csv", index=False
+    )
+    with pytest.warns(DeprecationWarning, match="max_workers"):
+        process_csv("in.csv", "out.csv", 8)
+    assert pd.read_csv("out.csv")["smiles"].tolist() == ["CCO"]
@@ -0,0 +1,111 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pandas.testing as pdt
+
+from biorange.workflows.network_pharmacology.abstract import (
+    ComponentTargetPredictor,
+    DrugComponentFinder,
+)
+from biorange.workflows.network_pharmacology.store import (
+    IntermediateStore,
+    get_intermediate_store,
+    make_key,
+)
+
+
+class CountingComponents(DrugComponentFinder):
+    source = "stub"
+    store_fields = ("version",)
+
+    def __init__(self, version="v1"):
+        super().__init__()
+        self.version = version
+        self.calls = 0
+
+    def query(self, name, *args, **kwargs):
+        self.calls += 1
+        return pd.DataFrame(
+            {
+                "component_name": [name],
+                "smiles": [name],
+                "oral_bioavailability": [30.5],
+            }
+        )
+
+    def normalize(self, raw_data):
+        return self.schema.conform(raw_data)
+
+
+class OtherComponents(CountingComponents):
+    pass
+
+
+def test_store_round_trips_types_and_reloads_manifest(tmp_path):
+    store = IntermediateStore(tmp_path)
+    data = CountingComponents().schema.conform(
+        pd.DataFrame({"component_name": ["a", None], "drug_likeness": [0.1, None]})
+    )
+    key = make_key("strategy", {"p": 1}, "C/C=C\\C[C@@H](N)#O")
+
+    store.put(key, data, {"item": "x"})
+    reloaded = IntermediateStore(tmp_path)
+
+    assert key in reloaded
+    pdt.assert_frame_equal(reloaded.get(key), data)
+    assert reloaded.get(make_key("strategy", {"p": 2}, "C/C=C\\C[C@@H](N)#O")) is None
+
+
+def test_fetch_uses_store_and_key_covers_identity_and_params(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategy = CountingComponents()
+
+    first = strategy.fetch("C#N")
+    second = strategy.fetch("C#N")
+
+    assert strategy.calls == 1
+    pdt.assert_frame_equal(first, second)
+    assert len(get_intermediate_store()) == 1
+
+    assert strategy.store_key("C#N") != CountingComponents("v2").store_key("C#N")
+    assert strategy.store_key("C#N") != OtherComponents().store_key("C#N")
+
+
+def test_missing_payload_is_a_miss(tmp_path):
+    store = IntermediateStore(tmp_path)
+    store.put("abc", pd.DataFrame({"a": [1]}))
+    for payload in tmp_path.glob("ab/*"):
+        payload.unlink()
+
+    assert store.get("abc") is None
+    assert "abc" not in store
+
+
+def test_store_key_changes_with_schema(tmp_path):
+    class Targets(ComponentTargetPredictor):
+        def query(self, name, *args, **kwargs):
+            return pd.DataFrame()
+
+    class Wider(Targets):
+        schema = Targets.schema.__class__(
+            "targets", {**Targets.schema.columns, "score": "float"}
+        )
+
+    assert Targets().store_key("CCO") != Wider().store_key("CCO")
+
+
+def put_many(root, worker, count):
+    store = IntermediateStore(root)
+    for i in range(count):
+        store.put(make_key("s", {}, f"{worker}-{i}"), pd.DataFrame({"a": [i]}))
+
+
+def test_manifest_appends_from_several_processes_stay_whole(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=3, mp_context=context) as pool:
+        list(pool.map(put_many, [tmp_path] * 3, range(3), [200] * 3))
+
+    lines = (tmp_path / IntermediateStore.MANIFEST).read_text().splitlines()
+    assert len(lines) == 600
+    assert len(IntermediateStore(tmp_path)) == 600
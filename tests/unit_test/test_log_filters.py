@@ -0,0 +1,81 @@
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.logger import LogManager
+from biorange.core.logger.filters import RateLimitFilter, SamplingFilter
+from biorange.core.logger.logging_config import LocalQueueHandler
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+
+
+def make_record(name, msg, level=logging.INFO, args=()):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_every_nth_per_template():
+    sampler = SamplingFilter(every=3, loggers=["biorange.workflows"])
+    name = "biorange.workflows.analyzers"
+
+    kept = [sampler.filter(make_record(name, "Cache hit %s")) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampler.filter(make_record(name, "Querying %s"))
+    assert sampler.filter(make_record("other", "Cache hit %s"))
+    assert sampler.filter(make_record(name, "Cache hit %s", logging.WARNING))
+    assert sampler.suppressed == 4
+
+
+def test_rate_limit_filter_reports_suppressed_count():
+    limiter = RateLimitFilter(rate=0.001, burst=2)
+
+    kept = [limiter.filter(make_record("x", "item %s", args=(i,))) for i in range(5)]
+    assert kept == [True, True, False, False, False]
+
+    limiter._buckets[("x", "item %s")][0] = 1  # 补充一个令牌
+    record = make_record("x", "item %s", args=(5,))
+    assert limiter.filter(record)
+    assert record.getMessage() == "item 5 (3 similar messages suppressed)"
+
+
+def test_queue_handler_defers_formatting_to_listener():
+    records = queue.SimpleQueue()
+    seen = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            seen.append(self.format(record))
+
+    listener = QueueListener(records, Collect(), respect_handler_level=True)
+    listener.start()
+    logger = logging.getLogger("test_log_filters.queue")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(LocalQueueHandler(records))
+    logger.info("value %s", 42)
+    listener.stop()
+
+    assert seen == ["value 42"]
+
+
+def test_default_config_runs_handlers_in_background():
+    manager = LogManager()
+
+    assert manager.listeners
+    handlers = {type(h).__name__ for h in manager.listeners[0].handlers}
+    assert handlers == {"StreamHandler", "LazyTimedRotatingFileHandler"}
+    assert "per_item_rate_limit" in manager.filters
+
+
+def test_analyzer_item_logs_fall_under_the_configured_rate_limit():
+    limiter = LogManager().filters["per_item_rate_limit"]
+    predictor = SmilesTargetPredictor([], GeneralCacheManager(InMemoryCacheManager()))
+    name = predictor.logger.name
+
+    kept = [
+        limiter.filter(make_record(name, "Querying %s for: %s", logging.DEBUG))
+        for _ in range(100)
+    ]
+
+    assert name.startswith("biorange.workflows.network_pharmacology.")
+    assert kept[0] and sum(kept) < 50
@@ -0,0 +1,72 @@
+import json
+import time
+
+import pytest
+
+from biorange.cli.dependence import Telemetry
+from biorange.core.config.config_model import TelemetrySettings
+from biorange.core.telemetry import get_tracer
+from biorange.core.telemetry.profiling import SamplingProfiler, profile_call
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler_collects_collapsed_stacks():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_wait(0.1)
+    profiler.stop()
+
+    stacks = profiler.collapsed()
+    assert profiler.samples > 0
+    assert any(
+        stack.startswith("MainThread;") and "busy_wait" in stack for stack in stacks
+    )
+
+
+def test_profile_call_writes_reports(tmp_path):
+    def workload():
+        with get_tracer().span("components", "pipeline"):
+            data = [bytearray(1024) for _ in range(200)]
+            busy_wait(0.05)
+        return data
+
+    summary = profile_call(workload, tmp_path, interval=0.001, top=5)
+
+    collapsed = (tmp_path / "profile.collapsed").read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    assert "Peak traced memory" in (tmp_path / "allocations.txt").read_text()
+    stages = json.loads((tmp_path / "stages.json").read_text())["stages"]
+    assert stages[0]["cat"] == "pipeline" and stages[0]["name"] == "components"
+    assert summary["peak_memory"] > 200 * 1024
+
+
+def test_profile_call_writes_reports_when_call_fails(tmp_path):
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        profile_call(failing, tmp_path)
+    assert (tmp_path / "stages.json").exists()
+
+
+def test_profile_call_traces_runs_configured_without_tracing(tmp_path):
+    def run_without_trace():
+        with Telemetry(TelemetrySettings(trace=False)):
+            with get_tracer().span("targets", "pipeline"):
+                busy_wait(0.01)
+
+    tracer = get_tracer()
+    tracer.enabled = False
+    try:
+        profile_call(run_without_trace, tmp_path)
+        assert not tracer.enabled and not tracer.pinned
+    finally:
+        tracer.enabled = True
+
+    stages = json.loads((tmp_path / "stages.json").read_text())["stages"]
+    assert [(s["cat"], s["name"]) for s in stages] == [("pipeline", "targets")]
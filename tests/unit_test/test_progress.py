@@ -0,0 +1,112 @@
+import io
+import logging
+from types import SimpleNamespace
+
+import pandas as pd
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+from biorange.workflows.network_pharmacology.progress import (
+    ProgressDisplay,
+    StepProgress,
+)
+from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class StubScheduler:
+    def in_flight(self):
+        return {"chembl": 2}
+
+    def queue_depths(self):
+        return {"chembl": 5, "stitch": 0}
+
+
+def make_analyzer(**counts):
+    progress = StepProgress()
+    progress.started = 0.0
+    progress.last_completed = 0.0
+    vars(progress).update(counts)
+    strategies = [SimpleNamespace(source_name=name) for name in ("chembl", "stitch")]
+    return SimpleNamespace(
+        cache_prefix="targets",
+        progress=progress,
+        strategies=strategies,
+        scheduler=StubScheduler(),
+    )
+
+
+def test_render_shows_throughput_eta_and_sources():
+    analyzer = make_analyzer(seen=10, completed=3, cache_hits=1)
+    display = ProgressDisplay([analyzer], stream=Terminal(), stall_after=60)
+
+    line = display.render(now=1.5)[0]
+
+    assert "3/10+" in line
+    assert "2.0 items/s" in line
+    assert "ETA 0:00:03" in line
+    assert "cache 33%" in line
+    assert line.endswith("chembl 2+5q  stitch 0")
+
+
+def test_render_marks_stalled_and_finished_steps():
+    stalled = make_analyzer(seen=4, completed=2, input_done=True)
+    display = ProgressDisplay([stalled], stream=Terminal(), stall_after=30)
+    assert "stalled 45s" in display.render(now=45.0)[0]
+
+    finished = make_analyzer(seen=2, completed=2, input_done=True, last_completed=75.0)
+    display = ProgressDisplay([finished], stream=io.StringIO())
+    assert display.render(now=80.0)[0].endswith("done in 0:01:15")
+    # 非终端输出时完成的步骤只报告一次
+    assert display.render(now=90.0) == [""]
+
+
+class StubPredictor(ComponentTargetPredictor):
+    source = "stub"
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["stub"]})
+
+
+def test_stream_updates_progress(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scheduler = TaskScheduler(max_workers=2)
+    predictor = SmilesTargetPredictor(
+        [StubPredictor()], GeneralCacheManager(InMemoryCacheManager()), scheduler
+    )
+    stream = Terminal()
+
+    with ProgressDisplay([predictor], stream=stream, interval=0.01):
+        list(predictor.execute_stream(["a", "b", "a"]))
+        list(predictor.execute_stream(["a", "c"]))
+
+    progress = predictor.progress
+    assert (progress.seen, progress.completed, progress.cache_hits) == (4, 4, 1)
+    assert progress.input_done
+    assert stream.getvalue().splitlines()[-1].endswith("done in 0:00:00")
+    scheduler.shutdown()
+
+
+def test_console_logs_are_written_above_the_progress_lines():
+    stream = Terminal()
+    handler = logging.StreamHandler(stream)
+    analyzer = make_analyzer(seen=10, completed=3)
+    display = ProgressDisplay(
+        [analyzer], stream=stream, interval=60, log_handlers=[handler]
+    )
+
+    with display:
+        display._draw(display.render(now=1.0))
+        drawn = stream.getvalue()
+        handler.handle(logging.makeLogRecord({"msg": "Matches found"}))
+        assert handler.stream is not stream
+
+    assert handler.stream is stream
+    written = stream.getvalue()[len(drawn) :]
+    # 清除进度行，写出日志，再重绘进度行
+    assert written.startswith("\x1b[1F\x1b[JMatches found\n\x1b[2Ktargets")
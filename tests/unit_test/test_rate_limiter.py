@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from biorange.core.network import HttpClient
+from biorange.core.network.rate_limiter import (
+    AIMDController,
+    RateLimiterRegistry,
+    TokenBucket,
+)
+from biorange.core.network.standin import StandInServer
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    """验证令牌桶允许突发请求，之后按速率限流"""
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert all(bucket.try_acquire() == 0.0 for _ in range(3))
+    assert bucket.try_acquire() > 0.0
+
+
+def test_token_bucket_acquire_waits_for_refill():
+    """验证 acquire 会等待令牌补充"""
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - start >= 0.015
+
+
+def test_token_bucket_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+def test_aimd_grows_when_healthy():
+    """验证延迟健康时并发上限加性增长"""
+    controller = AIMDController(initial=2, max_limit=4, latency_target=1.0)
+    for _ in range(20):
+        controller.record(latency=0.1, status=200)
+    assert controller.limit > 2
+    assert controller.limit <= 4
+
+
+def test_aimd_backs_off_on_throttle():
+    """验证遇到 429/503 时并发上限乘性减小"""
+    controller = AIMDController(initial=8, min_limit=1, max_limit=8)
+    controller.record(latency=0.1, status=429)
+    assert controller.limit == 4
+    controller.record(latency=0.1, status=503)
+    assert controller.limit == 2
+    for _ in range(5):
+        controller.record(latency=0.1, status=503)
+    assert controller.limit == 1
+
+
+def test_aimd_does_not_grow_when_slow():
+    controller = AIMDController(initial=2, latency_target=0.5)
+    controller.record(latency=2.0, status=200)
+    assert controller.limit == 2
+
+
+def test_registry_shares_limiter_per_host():
+    """验证同一主机共享同一个限流器，且支持按主机覆盖参数"""
+    registry = RateLimiterRegistry(overrides={"slow.example.org": {"rate": 1.0}})
+    first = registry.for_url("https://fast.example.org/a")
+    second = registry.for_url("https://fast.example.org/b?x=1")
+    slow = registry.for_url("https://slow.example.org/")
+
+    assert first is second
+    assert first is not slow
+    assert slow.bucket.rate == 1.0
+    assert first.bucket.rate == RateLimiterRegistry.DEFAULTS["rate"]
+
+
+def test_http_503_reaches_limiter():
+    """验证 503 不被适配器吞掉：每次都让并发上限减半，并由客户端重新排队发送"""
+    registry = RateLimiterRegistry(
+        defaults={"initial_concurrency": 8, "max_concurrency": 8}
+    )
+    client = HttpClient(registry=registry, throttle_retries=2, throttle_backoff=0)
+
+    with StandInServer(error_rate=1.0, error_status=503) as server:
+        url = f"{server.source_urls()['tcmsp']}/browse.php"
+        response = client.get(url)
+        requests_sent = server.request_counts["tcmsp"]
+
+    assert response.status_code == 503
+    assert requests_sent == 3
+    assert registry.for_url(url).concurrency.limit == 1
@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from biorange.core.cache.cache_manager import InMemoryCacheManager, GeneralCacheManager
+from biorange.core.telemetry import get_metrics_registry, get_tracer
+from biorange.workflows.network_pharmacology.abstract import ComponentTargetPredictor
+from biorange.workflows.network_pharmacology.analyzers import SmilesTargetPredictor
+from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+
+
+class ConcurrencyProbe:
+    """记录同时运行的任务数的峰值"""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value, delay=0.02):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(delay)
+        with self.lock:
+            self.current -= 1
+        return value
+
+
+def test_source_limit_is_respected():
+    scheduler = TaskScheduler(max_workers=8, source_limits={"slow": 2})
+    probe = ConcurrencyProbe()
+    futures = [scheduler.submit("slow", probe, i) for i in range(10)]
+
+    assert [f.result() for f in futures] == list(range(10))
+    assert probe.peak == 2
+    scheduler.shutdown()
+
+
+def test_global_cap_is_respected():
+    scheduler = TaskScheduler(max_workers=3)
+    probe = ConcurrencyProbe()
+    futures = [
+        scheduler.submit(source, probe, i)
+        for i in range(4)
+        for source in ("a", "b", "c")
+    ]
+    for future in futures:
+        future.result()
+    assert probe.peak == 3
+    assert scheduler.queue_depths() == {"a": 0, "b": 0, "c": 0}
+    scheduler.shutdown()
+
+
+def test_exceptions_propagate_and_release_slot():
+    scheduler = TaskScheduler(max_workers=2, source_limits={"x": 1})
+
+    def boom():
+        raise RuntimeError("boom")
+
+    failed = scheduler.submit("x", boom)
+    ok = scheduler.submit("x", lambda: 42)
+    with pytest.raises(RuntimeError):
+        failed.result()
+    assert ok.result() == 42
+    scheduler.shutdown()
+
+
+class StubPredictor(ComponentTargetPredictor):
+    def __init__(self, source, probe):
+        super().__init__()
+        self.source = source
+        self.probe = probe
+
+    def query(self, name, *args, **kwargs):
+        self.probe(None)
+        return pd.DataFrame(
+            {"smiles": [name], "targets": [f"{self.source}_T"], "source": [self.source]}
+        )
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_target_predictor_uses_shared_scheduler(tmp_path, monkeypatch):
+    """验证靶点预测的所有任务都通过共享调度器，线程数受全局上限约束"""
+    monkeypatch.chdir(tmp_path)
+    probe = ConcurrencyProbe()
+    scheduler = TaskScheduler(max_workers=4, source_limits={"a": 1})
+    predictor = SmilesTargetPredictor(
+        [StubPredictor("a", probe), StubPredictor("b", probe)],
+        GeneralCacheManager(InMemoryCacheManager()),
+        scheduler=scheduler,
+    )
+    components = pd.DataFrame({"smiles": [f"C{i}" for i in range(6)] + [None]})
+
+    result = predictor.execute(components)
+
+    assert len(result) == 12
+    assert set(result["source"]) == {"a", "b"}
+    assert probe.peak <= 4
+    scheduler.shutdown()
+
+
+def square_all(values):
+    return [(value * value, os.getpid()) for value in values]
+
+
+def test_batched_tasks_run_in_process_pool():
+    scheduler = TaskScheduler(process_workers=2, chunk_size=3)
+    futures = [scheduler.submit_batched("cpu", square_all, i) for i in range(7)]
+    scheduler.flush()
+
+    results = [future.result(timeout=30) for future in futures]
+    assert [value for value, _ in results] == [i * i for i in range(7)]
+    assert os.getpid() not in {pid for _, pid in results}
+    scheduler.shutdown()
+
+
+def log_all(values):
+    logger = logging.getLogger("biorange.tests.worker")
+    for value in values:
+        logger.warning("worker %s saw %s", os.getpid(), value)
+    return values
+
+
+def test_worker_logs_are_handled_in_parent(caplog):
+    scheduler = TaskScheduler(process_workers=1, chunk_size=2)
+    futures = [scheduler.submit_batched("cpu", log_all, i) for i in range(2)]
+    scheduler.flush()
+    assert [future.result(timeout=30) for future in futures] == [0, 1]
+    scheduler.shutdown()
+
+    # 记录由父进程的后台线程转交，稍后才到达
+    deadline = time.monotonic() + 10
+    while "saw 1" not in caplog.text and time.monotonic() < deadline:
+        time.sleep(0.05)
+    messages = [r.getMessage() for r in caplog.records if r.name.endswith("worker")]
+    assert [m.rsplit(" ", 1)[-1] for m in messages] == ["0", "1"]
+    assert str(os.getpid()) not in messages[0]
+
+
+class CpuPredictor(ComponentTargetPredictor):
+    source = "cpu"
+    cpu_bound = True
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["cpu"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_cpu_bound_strategy_is_batched(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    get_metrics_registry().reset()
+    get_tracer().reset()
+    scheduler = TaskScheduler(max_workers=2, process_workers=2, chunk_size=4)
+    predictor = SmilesTargetPredictor(
+        [CpuPredictor()],
+        GeneralCacheManager(InMemoryCacheManager()),
+        scheduler=scheduler,
+        max_in_flight=3,
+    )
+    components = pd.DataFrame({"smiles": [f"C{i}" for i in range(10)]})
+
+    result = predictor.execute(components)
+
+    assert sorted(result["smiles"]) == sorted(components["smiles"])
+    # worker 中的指标和区间随每批结果回到本进程
+    fetches = get_metrics_registry().get("biorange_strategy_fetches")
+    assert fetches.value(source="cpu", outcome="query") == 10
+    assert {e["pid"] for e in get_tracer().events("cpu")} - {os.getpid()}
+    scheduler.shutdown()
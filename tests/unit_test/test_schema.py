@@ -0,0 +1,81 @@
+import pandas as pd
+
+from biorange.workflows.network_pharmacology import schema
+from biorange.workflows.network_pharmacology.abstract import BaseDataFetcher
+from biorange.workflows.network_pharmacology.schema import (
+    COMPONENTS,
+    TARGETS,
+    StepSchema,
+)
+from biorange.workflows.network_pharmacology.strategy import CheMBLTargetPredictor
+
+
+def test_conform_selects_fills_and_casts():
+    raw = pd.DataFrame(
+        {"smiles": ["C1", "C2"], "oral_bioavailability": ["35.2", "bad"], "x": [1, 2]}
+    )
+    components = COMPONENTS.conform(raw)
+
+    assert list(components.columns) == COMPONENTS.column_names
+    assert components["oral_bioavailability"].dtype == "float64"
+    assert components["oral_bioavailability"].isna().tolist() == [False, True]
+    assert components["inchikey"].isna().all()
+    assert str(components["smiles"].dtype).startswith("string")
+
+
+def test_conform_warns_once_per_dropped_column(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(
+        schema.logger, "warning", lambda msg, *args: warnings.append(msg % args)
+    )
+    step = StepSchema("demo", {"a": "float"})
+
+    step.conform(pd.DataFrame({"a": [1], "b": [2]}))
+    step.conform(pd.DataFrame({"a": [1], "b": [2], "c": [3]}))
+
+    assert warnings == [
+        "Dropping columns not in the demo schema: b",
+        "Dropping columns not in the demo schema: c",
+    ]
+
+
+def test_concat_keeps_categories_and_dedups():
+    first = TARGETS.conform(
+        pd.DataFrame({"smiles": ["C1"], "targets": ["A"], "source": ["x"]})
+    )
+    second = TARGETS.conform(
+        pd.DataFrame(
+            {"smiles": ["C1", "C2"], "targets": ["A", "B"], "source": ["x", "y"]}
+        )
+    )
+
+    merged = BaseDataFetcher.merge_results([first, second], TARGETS)
+
+    assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in merged.dtypes)
+    assert merged.astype(str).values.tolist() == [["C1", "A", "x"], ["C2", "B", "y"]]
+
+
+def test_merge_results_without_schema_stays_static():
+    first = pd.DataFrame({"smiles": ["C1"], "targets": ["A"]})
+    second = pd.DataFrame({"smiles": ["C1", "C2"], "targets": ["A", "B"]})
+
+    merged = BaseDataFetcher.merge_results([first, second])
+
+    assert merged.values.tolist() == [["C1", "A"], ["C2", "B"]]
+    assert merged["targets"].dtype == object
+
+
+def test_strategy_normalize_enforces_schema():
+    raw = pd.DataFrame(
+        {
+            "smiles": ["C1"],
+            "gene_name": ["PTGS1"],
+            "source": ["ChEMBL"],
+            "organism": ["x"],
+        }
+    )
+    targets = CheMBLTargetPredictor().normalize(raw)
+
+    assert list(targets.columns) == ["smiles", "targets", "source"]
+    assert isinstance(targets["targets"].dtype, pd.CategoricalDtype)
+    assert CheMBLTargetPredictor().normalize(pd.DataFrame()).empty
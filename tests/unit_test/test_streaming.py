@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pandas as pd
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.workflows.network_pharmacology.abstract import (
+    ComponentTargetPredictor,
+    DrugComponentFinder,
+)
+from biorange.workflows.network_pharmacology.analyzers import (
+    ComponentFinder,
+    SmilesTargetPredictor,
+)
+from biorange.workflows.network_pharmacology.scheduler import TaskScheduler
+from biorange.workflows.network_pharmacology.writers import IncrementalCsvWriter
+
+
+class DelayedPredictor(ComponentTargetPredictor):
+    source = "stub"
+
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.started = []
+        self.lock = threading.Lock()
+
+    def query(self, name, *args, **kwargs):
+        with self.lock:
+            self.started.append(name)
+        time.sleep(self.delays.get(name, 0))
+        return pd.DataFrame({"smiles": [name], "targets": ["T"], "source": ["stub"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def make_predictor(strategy, scheduler):
+    return SmilesTargetPredictor(
+        [strategy], GeneralCacheManager(InMemoryCacheManager()), scheduler=scheduler
+    )
+
+
+def test_stream_yields_in_completion_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scheduler = TaskScheduler(max_workers=4)
+    predictor = make_predictor(DelayedPredictor({"slow": 0.3}), scheduler)
+
+    order = [item for item, _ in predictor.execute_stream(["slow", "fast", "fast"])]
+
+    assert order == ["fast", "slow"]
+    scheduler.shutdown()
+
+
+def test_stream_bounds_in_flight_items(tmp_path, monkeypatch):
+    """验证在途项达到上限后，输入不会被继续消费"""
+    monkeypatch.chdir(tmp_path)
+    scheduler = TaskScheduler(max_workers=8)
+    strategy = DelayedPredictor({})
+    predictor = make_predictor(strategy, scheduler)
+    consumed = []
+
+    def items():
+        for i in range(10):
+            consumed.append(i)
+            yield f"C{i}"
+
+    stream = predictor.execute_stream(items(), max_in_flight=2)
+    next(stream)
+    assert len(consumed) <= 3
+
+    assert len(list(stream)) == 9
+    assert len(strategy.started) == 10
+    scheduler.shutdown()
+
+
+def test_stream_uses_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scheduler = TaskScheduler(max_workers=2)
+    strategy = DelayedPredictor({})
+    predictor = make_predictor(strategy, scheduler)
+
+    list(predictor.execute_stream(["C1"]))
+    (item, cached), = predictor.execute_stream(["C1"])
+
+    assert item == "C1"
+    assert list(cached["smiles"]) == ["C1"]
+    assert strategy.started == ["C1"]
+    scheduler.shutdown()
+
+
+def test_incremental_writer_appends_with_single_header(tmp_path):
+    path = tmp_path / "out" / "targets_.csv"
+    writer = IncrementalCsvWriter(path)
+    writer.write(pd.DataFrame({"a": [1], "b": ["x"]}))
+    writer.write(pd.DataFrame())
+    writer.write(pd.DataFrame({"b": ["y"], "a": [2]}))
+
+    assert writer.rows_written == 2
+    assert pd.read_csv(path).to_dict("list") == {"a": [1, 2], "b": ["x", "y"]}
+
+    resumed = IncrementalCsvWriter(path, append=True)
+    resumed.write(pd.DataFrame({"a": [3], "b": ["z"]}))
+    assert list(pd.read_csv(path)["a"]) == [1, 2, 3]
+
+    IncrementalCsvWriter(path)
+    assert path.read_text() == ""
+
+
+class DelayedComponents(DrugComponentFinder):
+    source = "herbs"
+
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+
+    def query(self, name, *args, **kwargs):
+        time.sleep(self.delays[name])
+        return pd.DataFrame({"component_name": [name], "smiles": [f"C_{name}"]})
+
+    def normalize(self, raw_data):
+        return raw_data
+
+
+def test_component_finder_fans_out_drugs_and_keeps_input_order(tmp_path, monkeypatch):
+    """验证多味药并发查询，合并结果保持输入顺序"""
+    monkeypatch.chdir(tmp_path)
+    scheduler = TaskScheduler(max_workers=8, source_limits={"herbs": 4})
+    delays = {"A": 0.3, "B": 0.1, "C": 0.2, "D": 0.1}
+    finder = ComponentFinder(
+        [DelayedComponents(delays)],
+        GeneralCacheManager(InMemoryCacheManager()),
+        scheduler=scheduler,
+    )
+
+    start = time.perf_counter()
+    result = finder.execute(list(delays))
+
+    assert time.perf_counter() - start < 0.6
+    assert list(result["component_name"]) == ["A", "B", "C", "D"]
+    scheduler.shutdown()
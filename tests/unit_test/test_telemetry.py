@@ -0,0 +1,214 @@
+import json
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from biorange.core.cache.cache_manager import GeneralCacheManager, InMemoryCacheManager
+from biorange.core.telemetry import (
+    MetricsRegistry,
+    Tracer,
+    get_metrics_registry,
+    get_tracer,
+    serve_metrics,
+)
+from biorange.core.telemetry.manifest import build_manifest, compare_manifests
+from biorange.workflows.network_pharmacology.abstract import DrugComponentFinder
+from biorange.workflows.network_pharmacology.store import configure_intermediate_store
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("jobs", "Jobs done", ("source",)).inc(2, source='a"b')
+    registry.gauge("depth", "Queue depth").set(3)
+    histogram = registry.histogram("latency", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    text = registry.to_prometheus()
+
+    assert "# TYPE jobs counter" in text
+    assert 'jobs_total{source="a\\"b"} 2' in text
+    assert "depth 3" in text
+    assert 'latency_bucket{le="0.1"} 1' in text
+    assert 'latency_bucket{le="1"} 2' in text
+    assert 'latency_bucket{le="+Inf"} 2' in text
+    assert "latency_count 2" in text
+
+
+def test_registry_returns_existing_metric_and_resets_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls", "Calls", ("source",))
+    assert registry.counter("calls", "Calls", ("source",)) is counter
+    counter.inc(source="x")
+    registry.reset()
+    assert counter.value(source="x") == 0
+
+
+def test_gauge_function_is_read_at_export():
+    registry = MetricsRegistry()
+    depths = {("chembl",): 4}
+    registry.gauge("queued", "Queued", ("source",)).set_function(lambda: depths)
+    depths[("chembl",)] = 7
+    assert 'queued{source="chembl"} 7' in registry.to_prometheus()
+
+
+def test_serve_metrics_endpoint():
+    registry = MetricsRegistry()
+    registry.counter("hits", "Hits").inc()
+    server = serve_metrics(0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "hits_total 1" in body
+
+
+def test_chrome_trace_export(tmp_path):
+    tracer = Tracer()
+    with tracer.span("fetch", "chembl", item="CCO"):
+        pass
+    tracer.async_span("item", "targets", 1.0, 2.0)
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+
+    complete = [e for e in events if e["ph"] == "X"]
+    assert complete[0]["name"] == "fetch"
+    assert complete[0]["args"] == {"item": "CCO"}
+    assert [e["ph"] for e in events if e.get("cat") == "targets"] == ["b", "e"]
+    assert any(e["name"] == "thread_name" for e in events)
+
+
+def test_tracer_caps_events():
+    tracer = Tracer(max_events=1)
+    for _ in range(3):
+        with tracer.span("step"):
+            pass
+    assert len(tracer.events()) == 1
+    assert tracer.dropped == 2
+
+
+def test_registry_merges_counters_and_histograms_from_another_process():
+    worker = MetricsRegistry()
+    worker.counter("jobs", "Jobs done", ("source",)).inc(2, source="a")
+    worker.histogram("latency", "Latency", buckets=(0.1, 1.0)).observe(0.5)
+    worker.gauge("depth", "Queue depth", ("source",)).set(3, source="a")
+    parent = MetricsRegistry()
+    parent.counter("jobs", "Jobs done", ("source",)).inc(1, source="a")
+    parent.gauge("depth", "Queue depth", ("source",)).set(5, source="a")
+
+    parent.merge(worker.collect())
+
+    assert parent.get("jobs").value(source="a") == 3
+    assert parent.get("latency").summary() == {"count": 1, "sum": 0.5}
+    assert parent.get("latency").buckets == (0.1, 1.0, float("inf"))
+    # 仪表不累加，以 worker 报告的值为准
+    assert parent.get("depth").value(source="a") == 3
+
+
+def test_tracer_merge_aligns_worker_events():
+    parent = Tracer()
+    worker = Tracer()
+    worker.complete("fetch", "cpu", worker._origin, worker._origin + 0.001)
+    exported = worker.export()
+    exported["origin_time"] = parent._origin_time + 2.0
+    exported["threads"] = {(-1, 7): "MainThread"}
+
+    parent.merge(exported)
+
+    assert parent.events("cpu")[0]["ts"] == 2e6
+    events = parent.to_chrome_trace()["traceEvents"]
+    names = [e["args"]["name"] for e in events if e["ph"] == "M"]
+    assert "biorange worker -1" in names
+
+
+class CountingFinder(DrugComponentFinder):
+    source = "telemetry_stub"
+
+    def query(self, name, *args, **kwargs):
+        return pd.DataFrame({"component_name": [name, name], "smiles": ["C", "CC"]})
+
+
+def test_fetch_records_outcomes_rows_and_spans(tmp_path):
+    configure_intermediate_store(str(tmp_path / "store"))
+    registry = get_metrics_registry()
+    registry.reset()
+    get_tracer().reset()
+    finder = CountingFinder()
+
+    finder.fetch("herb")
+    finder.fetch("herb")
+
+    fetches = registry.get("biorange_strategy_fetches")
+    assert fetches.value(source="telemetry_stub", outcome="query") == 1
+    assert fetches.value(source="telemetry_stub", outcome="store") == 1
+    assert registry.get("biorange_strategy_rows").value(source="telemetry_stub") == 4
+    spans = get_tracer().events(cat="telemetry_stub")
+    assert [span["args"]["item"] for span in spans] == ["herb", "herb"]
+
+
+def test_cache_manager_counts_hits_and_misses():
+    registry = get_metrics_registry()
+    registry.reset()
+    cache = GeneralCacheManager(InMemoryCacheManager())
+
+    cache.get("key")
+    cache.save("key", 1)
+    cache.get("key")
+
+    requests = registry.get("biorange_cache_requests")
+    labels = {"backend": "InMemoryCacheManager", "op": "get"}
+    assert requests.value(result="hit", **labels) == 1
+    assert requests.value(result="miss", **labels) == 1
+
+
+def test_histogram_quantile_interpolates_within_buckets():
+    histogram = MetricsRegistry().histogram("latency", "Latency", buckets=(1.0, 2.0))
+    assert histogram.quantile(0.5) == 0
+    for value in (0.5, 1.5, 1.5, 1.5, 10.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.2) == 1.0
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(0.99) == 2.0  # +Inf 桶取最大的有限上界
+
+
+def test_manifest_from_registry_and_comparison():
+    registry = MetricsRegistry()
+    registry.gauge("biorange_pipeline_step_seconds", "", ("step",)).set(
+        2.0, step="targets"
+    )
+    fetches = registry.counter("biorange_strategy_fetches", "", ("source", "outcome"))
+    fetches.inc(3, source="chembl", outcome="query")
+    registry.histogram(
+        "biorange_strategy_query_seconds", "", ("source",), buckets=(1.0,)
+    ).observe(0.5, source="chembl")
+    requests = registry.counter(
+        "biorange_cache_requests", "", ("backend", "op", "result")
+    )
+    requests.inc(3, backend="memory", op="get", result="hit")
+    requests.inc(1, backend="memory", op="get", result="miss")
+    breakers = [{"source": "chembl", "state": "open", "trips": 1, "rejected": 4}]
+
+    before = build_manifest(registry, breakers, elapsed=3.0)
+
+    assert before["stages"]["targets"]["seconds"] == 2.0
+    assert before["sources"]["chembl"]["fetches"] == {"query": 3}
+    assert before["sources"]["chembl"]["latency"]["count"] == 1
+    assert before["cache"]["memory"]["get"]["hit_rate"] == 0.75
+    assert before["breakers"]["chembl"]["trips"] == 1
+    assert before["memory"]["peak_rss"] > 0
+
+    after = json.loads(json.dumps(before))
+    after["elapsed"] = 5.0
+    after["stages"]["targets"]["seconds"] = 4.5
+    rows = {row["metric"]: row for row in compare_manifests(before, after)}
+    assert rows["stages.targets.seconds"]["delta"] == pytest.approx(2.5)
+    assert rows["sources.chembl.fetches.query"]["kind"] == "count"
+    ordered = [row["metric"] for row in compare_manifests(before, after)]
+    assert ordered[:2] == ["stages.targets.seconds", "elapsed"]